@@ -1,3 +1,8 @@
+import os
+
+# The session services are created on import and need a database URL
+os.environ.setdefault("POSTGRES_CONNECTION_STRING", "sqlite:///:memory:")
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -51,3 +56,16 @@ def client(db_session):
     """Creates a FastAPI TestClient with database session fixture."""
     with TestClient(app) as test_client:
         yield test_client
+
+
+@pytest.fixture
+def fake_redis():
+    """Replaces the Redis singleton with an in-memory server for the test."""
+    import fakeredis.aioredis
+
+    from src.config import redis as redis_config
+
+    previous = redis_config._redis_client
+    redis_config._redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    yield redis_config._redis_client
+    redis_config._redis_client = previous
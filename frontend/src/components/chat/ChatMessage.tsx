@@ -87,7 +87,9 @@ const ChatMessageComponent = ({
         typeof messageContent.author === "string" &&
         messageContent.author?.endsWith("- Task executor");
 
-    const inlineDataParts = parts.filter(part => part.inline_data);
+    const inlineDataParts = parts.filter(
+        part => part.inline_data || part.file_data?.url || part.fileData?.url
+    );
     const hasInlineData = inlineDataParts.length > 0;
 
     const copyToClipboard = () => {
@@ -2,6 +2,7 @@ import { useState, useEffect, memo } from "react";
 import { formatFileSize, isImageFile } from "@/lib/file-utils";
 import { File, FileText, Download, Image } from "lucide-react";
 import type { ChatPart } from "@/types/chat";
+import { downloadSessionFile } from "@/services/sessionService";
 
 interface InlineDataAttachmentsProps {
     parts: ChatPart[];
@@ -15,6 +16,8 @@ interface ProcessedFile {
     data: string;
     size: number;
     preview_url?: string;
+    // Large attachments and artifacts are downloaded on demand
+    url?: string;
 }
 
 const InlineDataAttachmentsComponent = ({ parts, className = "" }: InlineDataAttachmentsProps) => {
@@ -24,7 +27,9 @@ const InlineDataAttachmentsComponent = ({ parts, className = "" }: InlineDataAtt
     useEffect(() => {
         if (isProcessed) return;
 
-        const validParts = parts.filter(part => part.inline_data && part.inline_data.data);
+        const validParts = parts.filter(
+            part => part.inline_data?.data || part.inline_data?.url || part.file_data?.url || part.fileData?.url
+        );
 
         if (validParts.length === 0) {
             setIsProcessed(true);
@@ -32,7 +37,20 @@ const InlineDataAttachmentsComponent = ({ parts, className = "" }: InlineDataAtt
         }
 
         const files = validParts.map((part, index) => {
-            const { mime_type, data } = part.inline_data!;
+            const fileReference = part.file_data?.url ? part.file_data : part.fileData;
+            if (!part.inline_data && fileReference?.url) {
+                const fileData: ProcessedFile = {
+                    filename: fileReference.filename || fileReference.fileId || `file_${index + 1}`,
+                    content_type: fileReference.mimeType || fileReference.mime_type || "application/octet-stream",
+                    size: 0,
+                    data: "",
+                    url: fileReference.url,
+                };
+                return fileData;
+            }
+
+            const { mime_type, url, size } = part.inline_data!;
+            const data = part.inline_data!.data || "";
             const extension = mime_type.split('/')[1] || 'file';
 
             let filename = '';
@@ -58,9 +76,10 @@ const InlineDataAttachmentsComponent = ({ parts, className = "" }: InlineDataAtt
             const fileData: ProcessedFile = {
                 filename,
                 content_type: mime_type,
-                size: data.length,
+                size: size ?? data.length,
                 data,
-                preview_url
+                preview_url,
+                url,
             };
 
             return fileData;
@@ -72,18 +91,25 @@ const InlineDataAttachmentsComponent = ({ parts, className = "" }: InlineDataAtt
 
     if (processedFiles.length === 0) return null;
 
-    const downloadFile = (file: ProcessedFile) => {
+    const downloadFile = async (file: ProcessedFile) => {
         try {
             const link = document.createElement("a");
-            const dataUrl = file.data.startsWith('data:')
-                ? file.data
-                : `data:${file.content_type};base64,${file.data}`;
+            let objectUrl: string | undefined;
+            if (file.url) {
+                const response = await downloadSessionFile(file.url);
+                objectUrl = URL.createObjectURL(response.data);
+                link.href = objectUrl;
+            } else {
+                link.href = file.data.startsWith('data:')
+                    ? file.data
+                    : `data:${file.content_type};base64,${file.data}`;
+            }
 
-            link.href = dataUrl;
             link.download = file.filename;
             document.body.appendChild(link);
             link.click();
             document.body.removeChild(link);
+            if (objectUrl) URL.revokeObjectURL(objectUrl);
         } catch (error) {
             console.error(`Error downloading file ${file.filename}:`, error);
         }
@@ -106,7 +132,7 @@ const InlineDataAttachmentsComponent = ({ parts, className = "" }: InlineDataAtt
                         key={index}
                         className="flex flex-col bg-[#0b0b11] rounded-lg overflow-hidden border-2 border-[#1a1b26] hover:border-[#6272a4] hover:scale-[1.02] transition-all shadow-neu-sm"
                     >
-                        {isImageFile(file.content_type) && (
+                        {isImageFile(file.content_type) && !file.url && (
                             <div className="w-full max-w-[200px] h-[120px] bg-[#050101] flex items-center justify-center border-b-2 border-[#1a1b26]">
                                 <img
                                     src={getFileUrl(file)}
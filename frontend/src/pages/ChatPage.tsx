@@ -44,6 +44,9 @@ import { useParams, useNavigate } from 'react-router-dom';
 import { AgentMessageGrouper } from '@/lib/agentMessageGrouper';
 import type { GroupedAgentMessage } from '@/components/chat/AgentExecutionView';
 
+// Messages loaded per request, older pages are loaded when scrolling to the top
+const MESSAGES_PAGE_SIZE = 100;
+
 interface FunctionMessageContent {
     title: string;
     content: string;
@@ -73,6 +76,11 @@ const ChatPage: React.FC = () => {
     const messagesContainerRef = useRef<HTMLDivElement>(null);
     const [isDeleteDialogOpen, setIsDeleteDialogOpen] = useState(false);
     const messageGrouperRef = useRef(new AgentMessageGrouper());
+    // Cursor of the oldest loaded message, null when the whole history is loaded
+    const [olderMessagesCursor, setOlderMessagesCursor] = useState<string | null>(null);
+    const [isLoadingOlder, setIsLoadingOlder] = useState(false);
+    // Set while older messages are prepended, so the view is not scrolled to the bottom
+    const preserveScrollRef = useRef(false);
 
     // Initial agent selection from route
     useEffect(() => {
@@ -110,6 +118,7 @@ const ChatPage: React.FC = () => {
     }, [clientId]);
 
     useEffect(() => {
+        setOlderMessagesCursor(null);
         if (!selectedSession) {
             setMessages([]);
             return;
@@ -118,13 +127,20 @@ const ChatPage: React.FC = () => {
         const loadMessages = async () => {
             try {
                 setIsLoading(true);
-                const response = await getSessionMessages(selectedSession);
+                const response = await getSessionMessages(selectedSession, {
+                    limit: MESSAGES_PAGE_SIZE,
+                });
 
                 // Agrupar mensagens históricas que contêm steps
                 const { groupHistoricalMessages } = await import('@/lib/groupHistoricalMessages');
                 const groupedMessages = groupHistoricalMessages(response.data);
 
                 setMessages(groupedMessages);
+                setOlderMessagesCursor(
+                    response.data.length >= MESSAGES_PAGE_SIZE
+                        ? response.headers["x-before-cursor"] ?? null
+                        : null
+                );
 
                 const agentId = selectedSession.split("_")[1];
                 setCurrentAgentId(agentId);
@@ -141,11 +157,63 @@ const ChatPage: React.FC = () => {
     }, [selectedSession]);
 
     useEffect(() => {
+        if (preserveScrollRef.current) {
+            preserveScrollRef.current = false;
+            return;
+        }
         if (messages.length > 0) {
             setTimeout(scrollToBottom, 100);
         }
     }, [messages]);
 
+    const loadOlderMessages = useCallback(async () => {
+        if (!selectedSession || !olderMessagesCursor || isLoadingOlder) return;
+
+        const container = messagesContainerRef.current;
+        const previousScrollHeight = container?.scrollHeight ?? 0;
+        setIsLoadingOlder(true);
+        try {
+            const response = await getSessionMessages(selectedSession, {
+                before: olderMessagesCursor,
+                limit: MESSAGES_PAGE_SIZE,
+            });
+
+            const { groupHistoricalMessages } = await import('@/lib/groupHistoricalMessages');
+            const olderMessages = groupHistoricalMessages(response.data);
+
+            preserveScrollRef.current = true;
+            setMessages((prev) => [...olderMessages, ...prev]);
+            setOlderMessagesCursor(
+                response.data.length >= MESSAGES_PAGE_SIZE
+                    ? response.headers["x-before-cursor"] ?? null
+                    : null
+            );
+
+            // Keep the messages that were on screen in place
+            requestAnimationFrame(() => {
+                if (container) {
+                    container.scrollTop += container.scrollHeight - previousScrollHeight;
+                }
+            });
+        } catch (error) {
+            console.error("Error loading older messages:", error);
+        } finally {
+            setIsLoadingOlder(false);
+        }
+    }, [selectedSession, olderMessagesCursor, isLoadingOlder]);
+
+    // Older messages are loaded when the user scrolls up near the top
+    const lastScrollTopRef = useRef(0);
+    const handleMessagesScroll = useCallback(() => {
+        const container = messagesContainerRef.current;
+        if (!container) return;
+        const scrollingUp = container.scrollTop < lastScrollTopRef.current;
+        lastScrollTopRef.current = container.scrollTop;
+        if (scrollingUp && container.scrollTop < 100) {
+            loadOlderMessages();
+        }
+    }, [loadOlderMessages]);
+
     const filteredAgents = useMemo(() => {
         return agents.filter(
             (agent) =>
@@ -806,6 +874,7 @@ const ChatPage: React.FC = () => {
 
                         <div
                             ref={messagesContainerRef}
+                            onScroll={handleMessagesScroll}
                             className="flex-1 overflow-y-auto p-6 bg-[#050101] scroll-smooth custom-scrollbar"
                         >
                             {isLoading ? (
@@ -829,6 +898,11 @@ const ChatPage: React.FC = () => {
                                 </div>
                             ) : (
                                 <div className="space-y-6 w-full max-w-4xl mx-auto pb-4">
+                                    {isLoadingOlder && (
+                                        <div className="flex justify-center">
+                                            <Loader2 className="h-5 w-5 text-[#bd93f9] animate-spin" />
+                                        </div>
+                                    )}
                                     {messages.map((message) => {
                                         // Skip GroupedAgentMessage - handled by ChatMessageComponent
                                         const isGrouped = 'executionSteps' in message;
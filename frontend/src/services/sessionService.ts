@@ -21,8 +21,19 @@ export const generateExternalId = () => {
 export const listSessions = (clientId: string) =>
     api.get<ChatSession[]>(`/api/v1/sessions/client/${clientId}`);
 
-export const getSessionMessages = (sessionId: string) =>
-    api.get<ChatMessage[]>(`/api/v1/sessions/${sessionId}/messages`);
+export interface SessionMessagesPage {
+    before?: string;
+    after?: string;
+    limit?: number;
+}
+
+// The previous and next pages start from the X-Before-Cursor and X-After-Cursor headers
+export const getSessionMessages = (sessionId: string, page?: SessionMessagesPage) =>
+    api.get<ChatMessage[]>(`/api/v1/sessions/${sessionId}/messages`, { params: page });
+
+// Artifacts and large attachments of messages are sent as URLs, fetched with the user's token
+export const downloadSessionFile = (url: string) =>
+    api.get<Blob>(url, { responseType: "blob" });
 
 export const createSession = (clientId: string, agentId: string) => {
     const externalId = generateExternalId();
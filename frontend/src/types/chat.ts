@@ -18,13 +18,16 @@ export interface ChatPart {
     functionResponse?: any;
     function_response?: any;
     inline_data?: {
-        data: string;
+        data: string | null;
         mime_type: string;
         metadata?: {
             filename?: string;
             [key: string]: any;
         };
         fileId?: string;
+        // Set instead of data for large attachments
+        url?: string;
+        size?: number;
     };
     videoMetadata?: any;
     thought?: any;
@@ -33,6 +36,13 @@ export interface ChatPart {
     file_data?: {
         filename?: string;
         fileId?: string;
+        url?: string;
+        [key: string]: any;
+    };
+    fileData?: {
+        fileId?: string;
+        mimeType?: string;
+        url?: string;
         [key: string]: any;
     };
 }
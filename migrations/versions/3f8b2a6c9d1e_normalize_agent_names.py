@@ -0,0 +1,35 @@
+"""normalize agent names
+
+Revision ID: 3f8b2a6c9d1e
+Revises: e1a7c3d9f2b4
+Create Date: 2026-10-17 11:02:17.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8b2a6c9d1e'
+down_revision: Union[str, None] = 'e1a7c3d9f2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Names are now normalized when agents are written instead of on every read
+    op.execute(
+        """
+        UPDATE agents
+        SET name = regexp_replace(name, '[^[:alnum:]_]', '_', 'g')
+        WHERE name ~ '[^[:alnum:]_]'
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The original names are not kept, so there is nothing to restore
+    pass
@@ -0,0 +1,38 @@
+"""add session events keyset index
+
+Revision ID: 7c2e9d4a1b6f
+Revises: 3f8b2a6c9d1e
+Create Date: 2026-10-17 16:24:09.731458
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e9d4a1b6f'
+down_revision: Union[str, None] = '3f8b2a6c9d1e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The events table belongs to the ADK session service, which creates it on
+    # first use, so it may not exist yet
+    if "events" not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    # Session messages are paginated by (timestamp, id) within a session
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_events_session_timestamp_id
+        ON events (app_name, user_id, session_id, timestamp, id)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_events_session_timestamp_id")
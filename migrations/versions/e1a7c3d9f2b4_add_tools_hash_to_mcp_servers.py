@@ -0,0 +1,28 @@
+"""add tools_hash to mcp_servers
+
+Revision ID: e1a7c3d9f2b4
+Revises: b5c144fc5e04
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a7c3d9f2b4'
+down_revision: Union[str, None] = 'b5c144fc5e04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('mcp_servers', sa.Column('tools_hash', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('mcp_servers', 'tools_hash')
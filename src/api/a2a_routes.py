@@ -19,6 +19,7 @@ Features:
 - API key authentication
 """
 
+import asyncio
 import base64
 import json
 import logging
@@ -26,16 +27,17 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-import httpx
 from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import text
 from sse_starlette.sse import EventSourceResponse
 from starlette.responses import JSONResponse
 
-from src.config.database import get_db
+from src.config.database import SessionLocal, get_db
 from src.config.settings import settings
 from src.schemas.chat import FileData
+from src.services.a2a_push_notifier import push_notification_dispatcher
+from src.services.a2a_task_store import TaskCanceledError, a2a_task_store
 from src.services.adk.agent_runner import run_agent, run_agent_stream
 from src.services.agent_service import get_agent
 from src.services.service_providers import (
@@ -43,6 +45,13 @@ from src.services.service_providers import (
     memory_service,
     session_service,
 )
+from src.services.session_service import (
+    decode_event_cursor,
+    encode_event_cursor,
+    get_session_record,
+    list_session_events,
+)
+from src.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -234,89 +243,106 @@ def clean_message_content(content: str, role: str) -> str:
     return content
 
 
-def extract_conversation_history(agent_id: str, external_id: str) -> list[dict[str, Any]]:
-    """Extract conversation history from session using the same logic as /sessions/{session_id}/messages."""
-    logger.info(
-        f"🔍 extract_conversation_history called with agent_id={agent_id}, external_id={external_id}"
-    )
-
-    try:
-        from src.services.session_service import get_session_by_id, get_session_events
-
-        # Get session ID in the correct format (same as working endpoint)
-        session_id = f"{external_id}_{agent_id}"
-        logger.info(f"📋 Constructed session_id: {session_id}")
+# Recent history of each session read by this worker, with the position of the
+# last event read, so later messages only read the events added since then.
+# Entries are dropped when the session row is deleted or created again, by any worker
+_history_cursors = TTLCache(
+    max_entries=settings.A2A_HISTORY_CURSOR_CACHE_MAX_ENTRIES,
+    ttl=settings.A2A_HISTORY_CURSOR_CACHE_TTL,
+)
 
-        # First, verify session exists (same as working endpoint)
-        logger.info("🔍 Verifying session exists...")
-        session = get_session_by_id(session_service, session_id)
-        if not session:
-            logger.warning(f"⚠️ Session not found: {session_id}")
-            return []
 
-        logger.info(f"✅ Session found: {session_id}")
+def _event_history_entries(event: dict[str, Any]) -> list[dict[str, Any]]:
+    """Convert a stored session event into A2A history entries, one per text part."""
+    content = event.get("content") or {}
+    role = "user" if event.get("author") == "user" else "agent"
+    timestamp = event.get("timestamp")
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.timestamp()
 
-        # Get events using same method as working endpoint
-        logger.info("🔍 Getting events for session...")
-        events = get_session_events(session_service, session_id)
-        logger.info(f"📋 get_session_events returned {len(events) if events else 0} events")
+    entries = []
+    for part in content.get("parts") or []:
+        if isinstance(part, dict) and part.get("text"):
+            entries.append(
+                {
+                    "role": role,
+                    # Clean the content to remove JSON artifacts
+                    "content": clean_message_content(part["text"], role),
+                    "messageId": event.get("id"),
+                    "timestamp": timestamp,
+                    "author": event.get("author"),
+                    "invocation_id": event.get("invocation_id"),
+                }
+            )
+    return entries
 
-        history = []
 
-        # Process events exactly like the working /messages endpoint
-        for i, event in enumerate(events):
-            logger.info(
-                f"🔍 Processing event {i}: id={getattr(event, 'id', 'NO_ID')}, author={getattr(event, 'author', 'NO_AUTHOR')}"
-            )
+def extract_conversation_history(
+    agent_id: str, external_id: str, db: Session, limit: int | None = None
+) -> list[dict[str, Any]]:
+    """
+    Extract the most recent conversation history of a session.
 
-            # Convert event to dict like in working endpoint
-            event_dict = event.model_dump() if hasattr(event, "model_dump") else event.__dict__
+    At most ``limit`` messages are returned, A2A_HISTORY_WINDOW by default; a
+    ``limit`` of 0 reads the whole history. Windows that fit the per-session
+    cursor only read the events added since the previous call.
+    """
+    session_id = f"{external_id}_{agent_id}"
+    window = settings.A2A_HISTORY_WINDOW
+    if limit is None:
+        limit = window
 
-            # Check if event has content with parts (same logic as working endpoint)
-            if event_dict.get("content") and event_dict["content"].get("parts"):
-                logger.info(
-                    f"📝 Event {i} has content with {len(event_dict['content']['parts'])} parts"
-                )
+    try:
+        if limit <= 0 or limit > window:
+            events = list_session_events(db, session_id, limit=limit if limit > 0 else None)
+            history = [entry for event in events for entry in _event_history_entries(event)]
+            return history[-limit:] if limit > 0 else history
+
+        session = get_session_record(db, session_id)
+        if session is None:
+            # Deleted, possibly by another worker
+            _history_cursors.pop(session_id)
+            return []
 
-                for j, part in enumerate(event_dict["content"]["parts"]):
-                    logger.info(f"📝 Processing part {j}: {part}")
-
-                    # Extract text content (same as working endpoint checks for text)
-                    if isinstance(part, dict) and part.get("text"):
-                        role = "user" if event_dict.get("author") == "user" else "agent"
-                        text_content = part["text"]
-
-                        # Clean the content to remove JSON artifacts
-                        cleaned_content = clean_message_content(text_content, role)
-                        logger.info(f"📝 Cleaned content for {role}: {cleaned_content[:50]}...")
-
-                        # Create A2A compatible history entry
-                        history_entry = {
-                            "role": role,
-                            "content": cleaned_content,
-                            "messageId": event_dict.get("id"),
-                            "timestamp": event_dict.get("timestamp"),
-                            "author": event_dict.get("author"),
-                            "invocation_id": event_dict.get("invocation_id"),
-                        }
+        cached = _history_cursors.get(session_id)
+        if cached is not None and cached["created"] != session["create_time"]:
+            # The session was deleted and created again with the same id
+            cached = None
 
-                        history.append(history_entry)
-                        logger.info(f"✅ Added history entry {len(history)}: {role}")
-                    else:
-                        logger.info(f"📝 Part {j} has no text content: {part}")
-            else:
-                logger.warning(f"⚠️ Event {i} has no content or parts")
+        if cached is None:
+            # The window counts messages, the events without text are read as well
+            events = list_session_events(db, session_id, limit=window)
+            history = []
+        else:
+            events = list_session_events(db, session_id, after=cached["cursor"])
+            history = cached["history"]
+
+        if events:
+            history = history + [
+                entry for event in events for entry in _event_history_entries(event)
+            ]
+            history = history[-window:]
+            cursor = (events[-1]["timestamp"], events[-1]["id"])
+        elif cached is not None:
+            cursor = cached["cursor"]
+        else:
+            return history
 
-        logger.info(
-            f"📚 extract_conversation_history extracted {len(history)} messages using working logic"
+        # Also refreshes the entry TTL
+        _history_cursors.set(
+            session_id,
+            {
+                "cursor": cursor,
+                "history": history,
+                "created": session["create_time"],
+            },
         )
-        return history
+
+        logger.debug(f"📚 Read {len(events)} new events of session {session_id}")
+        return history[-limit:]
 
     except Exception as e:
         logger.error(f"❌ Error extracting conversation history: {e}")
-        import traceback
-
-        logger.error(f"Full traceback: {traceback.format_exc()}")
         return []
 
 
@@ -350,30 +376,25 @@ def combine_histories(
     request_history: list[dict[str, Any]], session_history: list[dict[str, Any]]
 ) -> list[dict[str, Any]]:
     """Combine request history with session history, avoiding duplicates."""
-    combined = []
-
     # Add session history first
-    for msg in session_history:
-        combined.append(msg)
+    combined = list(session_history)
+    seen_ids = {msg["messageId"] for msg in combined if msg.get("messageId")}
+    seen_contents = {(msg["role"], msg["content"]) for msg in combined}
 
     # Add request history, avoiding duplicates based on messageId or content
     for req_msg in request_history:
-        # Check if this message already exists in combined history
-        is_duplicate = False
-        for existing_msg in combined:
-            if (
-                req_msg.get("messageId") and req_msg["messageId"] == existing_msg.get("messageId")
-            ) or (
-                req_msg["content"] == existing_msg["content"]
-                and req_msg["role"] == existing_msg["role"]
-            ):
-                is_duplicate = True
-                break
+        message_id = req_msg.get("messageId")
+        if (message_id and message_id in seen_ids) or (
+            req_msg["role"],
+            req_msg["content"],
+        ) in seen_contents:
+            continue
+
+        combined.append(req_msg)
+        if message_id:
+            seen_ids.add(message_id)
+        seen_contents.add((req_msg["role"], req_msg["content"]))
 
-        if not is_duplicate:
-            combined.append(req_msg)
-
-    # Sort by timestamp if available, otherwise maintain order
     return combined
 
 
@@ -589,37 +610,128 @@ async def handle_message_send(
     logger.info(f"📝 Extracted text: {text}")
     logger.info(f"📎 Extracted files: {len(files)}")
 
-    # Generate IDs
-    task_id = str(uuid.uuid4())
     context_id = message.get("messageId", str(uuid.uuid4()))
 
+    non_blocking = configuration.get("blocking") is False
     try:
-        # Extract conversation history for context
-        logger.info(
-            f"🔍 Attempting to extract conversation history for agent {agent_id}, context {context_id}"
+        # Record the task, so its status can be read from any worker
+        task = await a2a_task_store.create(
+            str(agent_id), context_id, message, push_notification_config
+        )
+        recorded = True
+    except Exception as e:
+        logger.error(f"❌ Could not record task: {e}")
+        # Blocking requests still run, only tasks/get and tasks/resubscribe are unavailable
+        task, recorded = {"id": str(uuid.uuid4())}, False
+
+    if non_blocking and not recorded:
+        return JSONResponse(
+            content={
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {
+                    "code": -32603,
+                    "message": "Internal error",
+                    "data": {"error": "Task store unavailable for non-blocking requests"},
+                },
+            }
+        )
+
+    # Non-blocking requests get the submitted task, the run continues in the background
+    if non_blocking:
+        background_task = asyncio.create_task(
+            run_message_task_in_background(
+                agent_id, task["id"], context_id, params, text, files, message
+            )
+        )
+        _background_tasks.add(background_task)
+        background_task.add_done_callback(_background_tasks.discard)
+        return JSONResponse(content={"jsonrpc": "2.0", "id": request_id, "result": task})
+
+    try:
+        run = execute_message_task(
+            agent_id,
+            task["id"],
+            context_id,
+            params,
+            text,
+            files,
+            message,
+            db,
+            recorded=recorded,
+            push_notification_config=push_notification_config,
+        )
+        # Recorded tasks can be canceled through tasks/cancel while the client waits
+        if recorded:
+            task_response = await a2a_task_store.run_until_canceled(task["id"], run)
+        else:
+            task_response = await run
+        return JSONResponse(content={"jsonrpc": "2.0", "id": request_id, "result": task_response})
+
+    except TaskCanceledError:
+        logger.info(f"🛑 Task {task['id']} canceled")
+        canceled_task = await a2a_task_store.get(task["id"])
+        return JSONResponse(content={"jsonrpc": "2.0", "id": request_id, "result": canceled_task})
+
+    except Exception as e:
+        logger.error(f"❌ Agent execution error: {e}")
+        return JSONResponse(
+            content={
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {
+                    "code": -32603,
+                    "message": "Agent execution failed",
+                    "data": {"error": str(e)},
+                },
+            }
         )
-        conversation_history = extract_conversation_history(str(agent_id), context_id)
-        logger.info(f"📚 Session history extracted: {len(conversation_history)} messages")
 
-        # Extract history from params
-        logger.info("🔍 Attempting to extract history from request params")
-        request_history = extract_history_from_params(params)
-        logger.info(f"📝 Request history extracted: {len(request_history)} messages")
 
-        # Combine histories
-        logger.info("🔗 Combining histories...")
-        combined_history = combine_histories(request_history, conversation_history)
-        logger.info(f"📖 Combined history has {len(combined_history)} total messages")
+# Runs of non-blocking message/send requests, referenced until they finish
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def execute_message_task(
+    agent_id: uuid.UUID,
+    task_id: str,
+    context_id: str,
+    params: dict[str, Any],
+    text: str,
+    files: list[FileData],
+    message: dict[str, Any],
+    db: Session,
+    recorded: bool = True,
+    push_notification_config: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Run the agent for a message/send task, recording its progress in the task store."""
+    if recorded:
+        working_task = await a2a_task_store.update(task_id, "working")
+        # Intermediate states are coalesced by the dispatcher when the webhook lags behind
+        push_config = await a2a_task_store.get_push_config(task_id)
+        if working_task is not None and push_config:
+            await notify_task_update(working_task, push_config)
 
-        # Log detailed combined history for debugging
-        for i, msg in enumerate(combined_history):
-            logger.info(f"  History[{i}]: {msg['role']} - {msg['content'][:50]}...")
+    try:
+        # The session history is only needed for the history of the Task response,
+        # the ADK runner loads its own context. A2A historyLength caps it, 0 skips it
+        history_length = (params.get("configuration") or {}).get("historyLength")
+        if not isinstance(history_length, int) or history_length < 0:
+            history_length = None
+        if history_length == 0:
+            combined_history = []
+        else:
+            conversation_history = extract_conversation_history(
+                str(agent_id), context_id, db, limit=history_length
+            )
+            request_history = extract_history_from_params(params)
+            combined_history = combine_histories(request_history, conversation_history)
+            if history_length:
+                combined_history = combined_history[-history_length:]
+            logger.info(f"📖 Combined history has {len(combined_history)} messages")
 
         # Execute agent with files - the ADK runner will handle session history automatically
         logger.info(f"🤖 Executing agent {agent_id} with message: {text} and {len(files)} files")
-        logger.info(
-            f"📚 ADK will provide session context automatically ({len(combined_history)} previous messages available)"
-        )
 
         result = await run_agent(
             agent_id=str(agent_id),
@@ -631,59 +743,104 @@ async def handle_message_send(
             db=db,
             files=files if files else None,
         )
+    except Exception as e:
+        if recorded:
+            failed_task = await a2a_task_store.update(
+                task_id,
+                "failed",
+                message={"role": "agent", "parts": [{"type": "text", "text": str(e)}]},
+            )
+            push_config = await a2a_task_store.get_push_config(task_id)
+            if failed_task is not None and push_config:
+                await notify_task_update(failed_task, push_config)
+        raise
 
-        final_response = result.get("final_response", "No response")
-        logger.info(f"✅ Agent response: {final_response}")
+    final_response = result.get("final_response", "No response")
+    logger.info(f"✅ Agent response: {final_response}")
 
-        # Log what we're about to send to create_task_response
-        logger.info(
-            f"🏗️ Creating task response with {len(combined_history) if combined_history else 0} history messages"
-        )
+    # Log what we're about to send to create_task_response
+    logger.info(
+        f"🏗️ Creating task response with {len(combined_history) if combined_history else 0} history messages"
+    )
 
-        # Create current user message object for history
-        current_user_message = {
-            "content": text,
-            "messageId": message.get("messageId"),
-            "timestamp": None,  # Could add current timestamp
-        }
+    # Create current user message object for history
+    current_user_message = {
+        "content": text,
+        "messageId": message.get("messageId"),
+        "timestamp": None,  # Could add current timestamp
+    }
 
-        # Create A2A compliant response with history
-        task_response = create_task_response(
+    # Create A2A compliant response with history
+    task_response = create_task_response(
+        task_id,
+        context_id,
+        final_response,
+        combined_history if combined_history else None,
+        current_user_message,
+    )
+
+    logger.info(
+        f"📦 Task response created with {len(task_response.get('artifacts', []))} artifacts"
+    )
+
+    if recorded:
+        recorded_task = await a2a_task_store.update(
             task_id,
-            context_id,
-            final_response,
-            combined_history if combined_history else None,
-            current_user_message,
+            "completed",
+            artifacts=task_response["artifacts"],
+            history=task_response.get("history"),
         )
+        if recorded_task is None:
+            # Canceled while the agent was running
+            recorded_task = await a2a_task_store.get(task_id)
+            if recorded_task is not None:
+                task_response["status"] = recorded_task["status"]
 
-        logger.info(
-            f"📦 Task response created with {len(task_response.get('artifacts', []))} artifacts"
-        )
+        # The config may have been set through tasks/pushNotificationConfig/set meanwhile
+        push_notification_config = await a2a_task_store.get_push_config(task_id)
 
-        # Handle push notification if configured
-        if push_notification_config:
-            try:
-                await send_push_notification(task_response, push_notification_config)
-                logger.info("🔔 Push notification sent successfully")
-            except Exception as e:
-                logger.error(f"❌ Push notification failed: {e}")
-                # Continue execution - push notification failure shouldn't break the response
+    # Handle push notification if configured
+    if push_notification_config:
+        await notify_task_update(task_response, push_notification_config)
 
-        return JSONResponse(content={"jsonrpc": "2.0", "id": request_id, "result": task_response})
+    return task_response
 
+
+async def notify_task_update(task: dict[str, Any], push_notification_config: dict[str, Any]):
+    """Queue a push notification, without letting a bad config fail the task."""
+    try:
+        await send_push_notification(task, push_notification_config)
+        logger.info("🔔 Push notification queued")
     except Exception as e:
-        logger.error(f"❌ Agent execution error: {e}")
-        return JSONResponse(
-            content={
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {
-                    "code": -32603,
-                    "message": "Agent execution failed",
-                    "data": {"error": str(e)},
-                },
-            }
+        logger.error(f"❌ Push notification failed: {e}")
+        # Continue execution - push notification failure shouldn't break the response
+
+
+async def run_message_task_in_background(
+    agent_id: uuid.UUID,
+    task_id: str,
+    context_id: str,
+    params: dict[str, Any],
+    text: str,
+    files: list[FileData],
+    message: dict[str, Any],
+):
+    """Run a non-blocking message/send task, stopping it if the task is canceled."""
+    # The request's database session is closed once the response is sent
+    db = SessionLocal()
+    try:
+        await a2a_task_store.run_until_canceled(
+            task_id,
+            execute_message_task(
+                agent_id, task_id, context_id, params, text, files, message, db
+            ),
         )
+    except TaskCanceledError:
+        logger.info(f"🛑 Task {task_id} canceled")
+    except Exception as e:
+        logger.error(f"❌ Background task {task_id} failed: {e}")
+    finally:
+        db.close()
 
 
 async def handle_message_stream(
@@ -723,17 +880,9 @@ async def handle_message_stream(
     if not text and files:
         text = "Analyze the provided files"
 
-    # Extract and combine conversation history
-    conversation_history = extract_conversation_history(str(agent_id), context_id)
-    request_history = extract_history_from_params(params)
-    combined_history = combine_histories(request_history, conversation_history)
-
     async def stream_generator():
         try:
             logger.info(f"🌊 Starting stream for: {text} with {len(files)} files")
-            logger.info(
-                f"📚 ADK will provide session context automatically ({len(combined_history)} previous messages available)"
-            )
 
             # Stream agent execution - ADK handles session history automatically
             async for chunk in run_agent_stream(
@@ -825,7 +974,7 @@ async def get_agent_card(
         "capabilities": {
             "streaming": True,
             "pushNotifications": True,  # Now supporting push notifications
-            "stateTransitionHistory": False,
+            "stateTransitionHistory": True,
         },
         "securitySchemes": {
             "apiKey": {
@@ -957,7 +1106,7 @@ async def list_agent_sessions(
 
         if session:
             # Extract conversation history
-            history = extract_conversation_history(str(agent_id), external_id)
+            history = extract_conversation_history(str(agent_id), external_id, db, limit=0)
 
             sessions.append(
                 {
@@ -983,8 +1132,15 @@ async def get_session_history(
     x_api_key: str = Header(None, alias="x-api-key"),
     db: Session = Depends(get_db),
     limit: int = 50,
+    before: str | None = None,
+    after: str | None = None,
 ):
-    """Get conversation history for a specific session (A2A extension)."""
+    """
+    Get conversation history for a specific session (A2A extension).
+
+    The last ``limit`` events are read, or the page of events before or after a
+    cursor; ``beforeCursor`` and ``afterCursor`` continue from the returned page.
+    """
 
     logger.info(f"📚 Getting history for session {session_id}")
 
@@ -1003,15 +1159,35 @@ async def get_session_history(
         else:
             external_id = session_id
 
-        # Extract conversation history
-        history = extract_conversation_history(str(agent_id), external_id)
-
-        # Limit results
-        if limit > 0:
-            history = history[-limit:]
+        events = list_session_events(
+            db,
+            f"{external_id}_{agent_id}",
+            after=decode_event_cursor(after) if after else None,
+            before=decode_event_cursor(before) if before else None,
+            limit=limit if limit > 0 else None,
+        )
+        history = [entry for event in events for entry in _event_history_entries(event)]
 
-        return JSONResponse({"sessionId": session_id, "history": history, "total": len(history)})
+        return JSONResponse(
+            {
+                "sessionId": session_id,
+                "history": history,
+                "total": len(history),
+                "beforeCursor": (
+                    encode_event_cursor((events[0]["timestamp"], events[0]["id"]))
+                    if events
+                    else None
+                ),
+                "afterCursor": (
+                    encode_event_cursor((events[-1]["timestamp"], events[-1]["id"]))
+                    if events
+                    else None
+                ),
+            }
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Error getting session history: {e}")
         raise HTTPException(status_code=500, detail=f"Error getting session history: {str(e)}")
@@ -1066,13 +1242,9 @@ async def get_conversation_history(
                 }
             )
 
-        # Extract conversation history using session_service
-        history = extract_conversation_history(str(agent_id), context_id)
-
-        # Limit history if requested
+        # Extract conversation history, limited if requested
         limit = params.get("limit", 50)
-        if limit > 0:
-            history = history[-limit:]
+        history = extract_conversation_history(str(agent_id), context_id, db, limit=limit)
 
         # Format as A2A Task response with history artifacts
         task_id = str(uuid.uuid4())
@@ -1164,7 +1336,7 @@ async def get_conversation_history(
 async def send_push_notification(
     task_response: dict[str, Any], push_notification_config: dict[str, Any]
 ):
-    """Send push notification according to A2A specification section 9.5.
+    """Queue a push notification according to A2A specification section 9.5.
 
     A2A spec PushNotificationConfig object:
     - url: The absolute HTTPS webhook URL where the A2A Server should POST task updates
@@ -1174,154 +1346,25 @@ async def send_push_notification(
     Alternative formats supported for compatibility:
     - webhookUrl instead of url
     - webhookAuthenticationInfo instead of authentication
-    """
-    # Support both official spec format and common variations
-    webhook_url = push_notification_config.get("url") or push_notification_config.get("webhookUrl")
-    webhook_token = push_notification_config.get("token")
-
-    # Support both official and alternative authentication field names
-    authentication = push_notification_config.get("authentication") or push_notification_config.get(
-        "webhookAuthenticationInfo"
-    )
-
-    if not webhook_url:
-        raise ValueError("pushNotificationConfig.url (or webhookUrl) is required")
-
-    # Validate HTTPS requirement (A2A spec: url MUST be HTTPS for security to prevent SSRF)
-    if not webhook_url.startswith("https://"):
-        raise ValueError("pushNotificationConfig.url MUST use HTTPS to prevent SSRF attacks")
-
-    logger.info(f"🔔 Sending push notification to: {webhook_url}")
-
-    # Prepare headers according to A2A spec section 9.5
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": f"A2A-Server/{getattr(settings, 'API_VERSION', '1.0.0')}",
-    }
-
-    # Add client token if provided (A2A spec: server SHOULD include in X-A2A-Notification-Token header)
-    if webhook_token:
-        headers["X-A2A-Notification-Token"] = webhook_token
-        logger.info("🔑 Added client token to notification headers")
-
-    # Handle authentication according to A2A spec PushNotificationAuthenticationInfo
-    if authentication:
-        auth_type = authentication.get("type")
-
-        # Handle "none" type (no authentication)
-        if auth_type == "none":
-            logger.info("🔓 No authentication required for webhook")
-
-        # Handle schemes-based authentication (official A2A spec format)
-        elif "schemes" in authentication:
-            auth_schemes = authentication.get("schemes", [])
-            auth_credentials = authentication.get("credentials")
-
-            for scheme in auth_schemes:
-                if scheme.lower() == "bearer":
-                    # Bearer token authentication
-                    if auth_credentials:
-                        headers["Authorization"] = f"Bearer {auth_credentials}"
-                        logger.info("🔐 Added Bearer authentication")
-                    else:
-                        logger.warning("⚠️ Bearer scheme specified but no credentials provided")
-
-                elif scheme.lower() == "apikey":
-                    # API Key authentication
-                    if auth_credentials:
-                        try:
-                            # A2A spec example: JSON like {"in": "header", "name": "X-Client-Webhook-Key", "value": "actual_key"}
-                            if isinstance(auth_credentials, str):
-                                cred_data = json.loads(auth_credentials)
-                            else:
-                                cred_data = auth_credentials
-
-                            if cred_data.get("in") == "header":
-                                header_name = cred_data.get("name", "X-API-Key")
-                                header_value = cred_data.get("value")
-                                if header_value:
-                                    headers[header_name] = header_value
-                                    logger.info(
-                                        f"🔐 Added API Key authentication to header: {header_name}"
-                                    )
-                        except (json.JSONDecodeError, TypeError):
-                            # Fallback: treat credentials as direct API key value
-                            headers["X-API-Key"] = str(auth_credentials)
-                            logger.info("🔐 Added API Key authentication (fallback)")
-                    else:
-                        logger.warning("⚠️ ApiKey scheme specified but no credentials provided")
-
-                else:
-                    logger.warning(f"⚠️ Unsupported authentication scheme: {scheme}")
-
-        # Handle basic authentication types
-        elif auth_type == "bearer":
-            token = authentication.get("token") or authentication.get("credentials")
-            if token:
-                headers["Authorization"] = f"Bearer {token}"
-                logger.info("🔐 Added Bearer authentication (alternative format)")
-
-        elif auth_type == "apikey":
-            api_key = (
-                authentication.get("apiKey")
-                or authentication.get("key")
-                or authentication.get("credentials")
-            )
-            header_name = authentication.get("headerName", "X-API-Key")
-            if api_key:
-                headers[header_name] = api_key
-                logger.info(f"🔐 Added API Key authentication to header: {header_name}")
-
-        else:
-            logger.warning(f"⚠️ Unsupported authentication type: {auth_type}")
 
+    Delivery happens in the background (see ``PushNotificationDispatcher``), so a
+    slow webhook does not delay the A2A response.
+    """
     # According to A2A spec section 9.5, the notification payload should contain
     # sufficient information for client to identify Task ID and new state
     # The spec suggests sending the full Task object as JSON payload
-    notification_payload = task_response
-
-    try:
-        # Use 30 second timeout as recommended for webhook calls
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            logger.info(f"📤 Sending POST request to webhook with {len(headers)} headers")
-
-            response = await client.post(webhook_url, headers=headers, json=notification_payload)
-
-            # Log the response according to A2A spec recommendations
-            if response.status_code == 200:
-                logger.info(f"✅ Push notification sent successfully to {webhook_url}")
-            elif 200 <= response.status_code < 300:
-                logger.info(
-                    f"✅ Push notification accepted with status {response.status_code} from {webhook_url}"
-                )
-            else:
-                logger.warning(
-                    f"⚠️ Push notification received non-success response: {response.status_code} from {webhook_url}"
-                )
-                try:
-                    response_text = response.text[:200]  # Log first 200 chars of response
-                    logger.warning(f"Response body: {response_text}")
-                except:
-                    pass
-
-            # Don't raise exception for non-200 status codes per A2A spec
-            # The webhook might have its own status handling, and notification
-            # delivery is best-effort
+    push_notification_dispatcher.enqueue(task_response, push_notification_config)
 
-    except httpx.TimeoutException:
-        logger.error(f"❌ Push notification timeout (30s) to {webhook_url}")
-        raise Exception(f"Push notification timeout to {webhook_url}")
 
-    except httpx.RequestError as e:
-        logger.error(f"❌ Push notification request error to {webhook_url}: {e}")
-        raise Exception(f"Push notification request error: {e}")
-
-    except Exception as e:
-        logger.error(f"❌ Push notification unexpected error to {webhook_url}: {e}")
-        raise Exception(f"Push notification error: {e}")
+# Task management functions (A2A spec section 7.3-7.7)
+async def get_agent_task(agent_id: uuid.UUID, task_id: str) -> dict[str, Any] | None:
+    """Get a recorded task, or None when it does not exist or belongs to another agent."""
+    task = await a2a_task_store.get(task_id)
+    if task is None or task.get("metadata", {}).get("agentId") != str(agent_id):
+        return None
+    return task
 
 
-# Task management functions (A2A spec section 7.3-7.7)
 async def handle_tasks_get(
     agent_id: uuid.UUID, params: dict[str, Any], request_id: str, db: Session
 ) -> JSONResponse:
@@ -1329,7 +1372,7 @@ async def handle_tasks_get(
     logger.info(f"🔍 Processing tasks/get for agent {agent_id}")
 
     try:
-        task_id = params.get("taskId")
+        task_id = params.get("id") or params.get("taskId")
         if not task_id:
             return JSONResponse(
                 content={
@@ -1343,18 +1386,26 @@ async def handle_tasks_get(
                 }
             )
 
-        # In our implementation, tasks are ephemeral and complete immediately
-        # For A2A compliance, we return a completed task with minimal info
-        task_response = {
-            "id": task_id,
-            "status": {
-                "state": "completed",
-                "timestamp": datetime.now().isoformat() + "Z",
-            },
-            "kind": "task",
-        }
+        task = await get_agent_task(agent_id, task_id)
+        if task is None:
+            return JSONResponse(
+                content={
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {
+                        "code": -32001,
+                        "message": "Task not found",
+                        "data": {"taskId": task_id},
+                    },
+                }
+            )
 
-        return JSONResponse(content={"jsonrpc": "2.0", "id": request_id, "result": task_response})
+        # A2A spec: historyLength limits the number of history messages returned
+        history_length = params.get("historyLength")
+        if isinstance(history_length, int) and history_length >= 0:
+            task["history"] = task.get("history", [])[-history_length:] if history_length else []
+
+        return JSONResponse(content={"jsonrpc": "2.0", "id": request_id, "result": task})
 
     except Exception as e:
         logger.error(f"❌ tasks/get error: {e}")
@@ -1378,7 +1429,7 @@ async def handle_tasks_cancel(
     logger.info(f"🛑 Processing tasks/cancel for agent {agent_id}")
 
     try:
-        task_id = params.get("taskId")
+        task_id = params.get("id") or params.get("taskId")
         if not task_id:
             return JSONResponse(
                 content={
@@ -1392,18 +1443,36 @@ async def handle_tasks_cancel(
                 }
             )
 
-        # In our implementation, tasks complete immediately, so cancellation is not needed
-        # Return success for A2A compliance
-        return JSONResponse(
-            content={
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "success": True,
-                    "message": f"Task {task_id} cancellation requested",
-                },
-            }
-        )
+        task = await get_agent_task(agent_id, task_id)
+        if task is not None:
+            task = await a2a_task_store.cancel(task_id)
+        if task is None:
+            return JSONResponse(
+                content={
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {
+                        "code": -32001,
+                        "message": "Task not found",
+                        "data": {"taskId": task_id},
+                    },
+                }
+            )
+
+        if task["status"]["state"] != "canceled":
+            return JSONResponse(
+                content={
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {
+                        "code": -32002,
+                        "message": "Task cannot be canceled",
+                        "data": {"taskId": task_id, "state": task["status"]["state"]},
+                    },
+                }
+            )
+
+        return JSONResponse(content={"jsonrpc": "2.0", "id": request_id, "result": task})
 
     except Exception as e:
         logger.error(f"❌ tasks/cancel error: {e}")
@@ -1421,7 +1490,6 @@ async def handle_tasks_cancel(
 
 
 # Task push notification config management (A2A spec section 7.5-7.6)
-task_push_configs = {}  # In-memory storage for demo - use database in production
 
 
 async def handle_tasks_push_notification_config_set(
@@ -1431,7 +1499,7 @@ async def handle_tasks_push_notification_config_set(
     logger.info(f"🔔 Processing tasks/pushNotificationConfig/set for agent {agent_id}")
 
     try:
-        task_id = params.get("taskId")
+        task_id = params.get("id") or params.get("taskId")
         push_config = params.get("pushNotificationConfig")
 
         if not task_id:
@@ -1475,8 +1543,21 @@ async def handle_tasks_push_notification_config_set(
                 }
             )
 
-        # Store the config (in production, save to database)
-        task_push_configs[task_id] = push_config
+        if await get_agent_task(agent_id, task_id) is None:
+            return JSONResponse(
+                content={
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {
+                        "code": -32001,
+                        "message": "Task not found",
+                        "data": {"taskId": task_id},
+                    },
+                }
+            )
+
+        # Store the config, shared by every worker
+        await a2a_task_store.set_push_config(task_id, push_config)
         logger.info(f"✅ Push notification config stored for task {task_id}")
 
         return JSONResponse(
@@ -1509,7 +1590,7 @@ async def handle_tasks_push_notification_config_get(
     logger.info(f"🔍 Processing tasks/pushNotificationConfig/get for agent {agent_id}")
 
     try:
-        task_id = params.get("taskId")
+        task_id = params.get("id") or params.get("taskId")
         if not task_id:
             return JSONResponse(
                 content={
@@ -1523,8 +1604,9 @@ async def handle_tasks_push_notification_config_get(
                 }
             )
 
-        # Retrieve the config (in production, get from database)
-        push_config = task_push_configs.get(task_id)
+        push_config = None
+        if await get_agent_task(agent_id, task_id) is not None:
+            push_config = await a2a_task_store.get_push_config(task_id)
 
         if push_config:
             return JSONResponse(
@@ -1567,12 +1649,17 @@ async def handle_tasks_push_notification_config_get(
 
 async def handle_tasks_resubscribe(
     agent_id: uuid.UUID, params: dict[str, Any], request_id: str, db: Session
-) -> JSONResponse:
-    """Handle tasks/resubscribe according to A2A spec section 7.7."""
+) -> JSONResponse | EventSourceResponse:
+    """
+    Handle tasks/resubscribe according to A2A spec section 7.7.
+
+    Streams the current status of the task and then its updates, from
+    whichever worker runs it, until it reaches a final state.
+    """
     logger.info(f"🔄 Processing tasks/resubscribe for agent {agent_id}")
 
     try:
-        task_id = params.get("taskId")
+        task_id = params.get("id") or params.get("taskId")
         push_config = params.get("pushNotificationConfig")
 
         if not task_id:
@@ -1588,38 +1675,56 @@ async def handle_tasks_resubscribe(
                 }
             )
 
+        if await get_agent_task(agent_id, task_id) is None:
+            return JSONResponse(
+                content={
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {
+                        "code": -32001,
+                        "message": "Task not found",
+                        "data": {"taskId": task_id},
+                    },
+                }
+            )
+
         # Update push notification config if provided
         if push_config:
-            task_push_configs[task_id] = push_config
+            await a2a_task_store.set_push_config(task_id, push_config)
             logger.info(f"✅ Push notification config updated for task {task_id}")
 
-        # In our implementation, tasks complete immediately
-        # Return success for A2A compliance
+    except Exception as e:
+        logger.error(f"❌ tasks/resubscribe error: {e}")
         return JSONResponse(
             content={
                 "jsonrpc": "2.0",
                 "id": request_id,
-                "result": {
-                    "success": True,
-                    "taskId": task_id,
-                    "message": "Resubscription successful",
+                "error": {
+                    "code": -32603,
+                    "message": "Internal error",
+                    "data": {"error": str(e)},
                 },
             }
         )
 
-    except Exception as e:
-        logger.error(f"❌ tasks/resubscribe error: {e}")
-        return JSONResponse(
-            content={
+    async def update_generator():
+        try:
+            async for event in a2a_task_store.stream(task_id):
+                yield {"data": json.dumps({"jsonrpc": "2.0", "id": request_id, "result": event})}
+        except Exception as e:
+            logger.error(f"❌ tasks/resubscribe streaming error: {e}")
+            error_event = {
                 "jsonrpc": "2.0",
                 "id": request_id,
                 "error": {
                     "code": -32603,
-                    "message": "Internal error",
+                    "message": "Streaming failed",
                     "data": {"error": str(e)},
                 },
             }
-        )
+            yield {"data": json.dumps(error_event)}
+
+    return EventSourceResponse(update_generator())
 
 
 async def handle_agent_authenticated_extended_card(
@@ -1657,7 +1762,7 @@ async def handle_agent_authenticated_extended_card(
             "capabilities": {
                 "streaming": True,
                 "pushNotifications": True,
-                "stateTransitionHistory": False,
+                "stateTransitionHistory": True,
                 "multiTurnConversations": True,
                 "fileProcessing": True,
             },
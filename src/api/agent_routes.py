@@ -518,7 +518,7 @@ async def update_agent(
     try:
         await verify_role("editor", payload)
         # Get the current agent
-        db_agent = agent_service.get_agent(db, agent_id)
+        db_agent = agent_service.get_agent_for_update(db, agent_id)
         if db_agent is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
 
@@ -558,7 +558,7 @@ async def update_agent_workflow(
     try:
         await verify_role("editor", payload)
         # Get the current agent
-        db_agent = agent_service.get_agent(db, agent_id)
+        db_agent = agent_service.get_agent_for_update(db, agent_id)
         if db_agent is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
 
@@ -15,18 +15,24 @@ from sqlalchemy.orm import Session
 
 from src.config.database import get_db
 from src.config.settings import settings
-from src.core.exceptions import AgentNotFoundError
+from src.core.exceptions import AgentNotFoundError, InvalidRequestError, ResourceNotFoundError
 from src.core.jwt_middleware import (
     get_jwt_token,
     get_jwt_token_ws,
     verify_user_client,
 )
-from src.schemas.chat import ChatRequest, ChatResponse, ErrorResponse, FileData
+from src.schemas.chat import (
+    ChatRequest,
+    ChatResponse,
+    ErrorResponse,
+    FileData,
+    WorkflowResumeRequest,
+)
 from src.services import (
     agent_service,
 )
+from src.services.adk.agent_runner import resume_workflow, run_agent_stream
 from src.services.adk.agent_runner import run_agent as run_agent_adk
-from src.services.adk.agent_runner import run_agent_stream
 from src.services.crewai.agent_runner import run_agent as run_agent_crewai
 from src.services.service_providers import (
     artifacts_service,
@@ -302,3 +308,50 @@ async def chat(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
+
+
+@router.post(
+    "/{agent_id}/{external_id}/resume",
+    response_model=ChatResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def resume_workflow_run(
+    request: WorkflowResumeRequest,
+    agent_id: str,
+    external_id: str,
+    _=Depends(get_agent_by_api_key),
+    db: Session = Depends(get_db),
+):
+    """Resume a failed or interrupted workflow run from its last completed node"""
+    if settings.AI_ENGINE != "adk":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Workflow runs can only be resumed with the adk engine",
+        )
+
+    try:
+        final_response = await resume_workflow(
+            agent_id,
+            external_id,
+            request.invocation_id,
+            session_service,
+            artifacts_service,
+            memory_service,
+            db,
+        )
+
+        return {
+            "response": final_response["final_response"],
+            "message_history": final_response["message_history"],
+            "status": "success",
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    except (AgentNotFoundError, InvalidRequestError, ResourceNotFoundError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
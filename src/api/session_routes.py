@@ -1,12 +1,15 @@
 import base64
 import logging
 import uuid
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from google.adk.sessions import Session as Adk_Session
 from sqlalchemy.orm import Session
 
 from src.config.database import get_db
+from src.config.settings import settings
 from src.core.jwt_middleware import (
     get_jwt_token,
     verify_user_client,
@@ -16,15 +19,23 @@ from src.services import (
 )
 from src.services.service_providers import artifacts_service, session_service
 from src.services.session_service import (
+    decode_event_cursor,
     delete_session,
+    encode_event_cursor,
     get_session_by_id,
-    get_session_events,
+    get_session_event,
+    get_session_record,
     get_sessions_by_agent,
     get_sessions_by_client,
+    list_session_events,
 )
 
 logger = logging.getLogger(__name__)
 
+ARTIFACT_CHUNK_SIZE = 64 * 1024
+# Larger inline data is replaced by a download URL in messages
+INLINE_DATA_MAX_SIZE = 256 * 1024
+
 router = APIRouter(
     prefix="/sessions",
     tags=["sessions"],
@@ -84,180 +95,185 @@ async def get_session(
     return session
 
 
+def _artifact_url(session_id: str, filename: str, version: int | None = None) -> str:
+    url = f"{settings.API_URL}/api/v1/sessions/{session_id}/artifacts/{quote(filename)}"
+    return url if version is None else f"{url}?version={version}"
+
+
+def _part_url(session_id: str, event_id: str, index: int) -> str:
+    url = f"{settings.API_URL}/api/v1/sessions/{session_id}/events/{quote(event_id)}"
+    return f"{url}/parts/{index}"
+
+
+def _inline_data_base64(inline_data: dict) -> str | None:
+    """Return the data of a stored inline data part, base64 encoded."""
+    # Inline data is stored base64 encoded, as a single item list
+    data = inline_data.get("data")
+    if isinstance(data, list):
+        data = data[0] if data else None
+    return data
+
+
+def _event_to_message(session_id: str, event: dict) -> dict:
+    """Convert a stored event into a message, with references to its artifacts."""
+    event["timestamp"] = event["timestamp"].timestamp()
+
+    content = event.get("content") or {}
+    for index, part in enumerate(content.get("parts") or []):
+        if not isinstance(part, dict):
+            continue
+
+        inline_data = part.get("inline_data")
+        if inline_data:
+            data = _inline_data_base64(inline_data)
+            size = len(data) * 3 // 4 if data else 0
+            if size > INLINE_DATA_MAX_SIZE:
+                inline_data["data"] = None
+                inline_data["size"] = size
+                inline_data["url"] = _part_url(session_id, event["id"], index)
+            else:
+                inline_data["data"] = data
+
+        # File parts reference an artifact of the session by its file id
+        file_data = part.get("file_data") or part.get("fileData")
+        if file_data and file_data.get("fileId"):
+            file_data["url"] = _artifact_url(session_id, file_data["fileId"])
+
+    # Artifacts are downloaded separately instead of being inlined
+    artifact_delta = (event.get("actions") or {}).get("artifact_delta") or {}
+    if artifact_delta:
+        event["artifacts"] = {
+            filename: {"version": version, "url": _artifact_url(session_id, filename, version)}
+            for filename, version in artifact_delta.items()
+        }
+    return event
+
+
+async def _get_authorized_session(session_id: str, db: Session, payload: dict) -> dict:
+    """Return the session record, checking that the user has access to its agent."""
+    session = get_session_record(db, session_id)
+    if not session:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+
+    # Verify if the session's agent belongs to the user's client
+    agent_id = uuid.UUID(session["app_name"]) if session["app_name"] else None
+    if agent_id:
+        agent = agent_service.get_agent(db, agent_id)
+        if agent:
+            await verify_user_client(payload, db, agent.client_id)
+    return session
+
+
 @router.get(
     "/{session_id}/messages",
 )
 async def get_agent_messages(
     session_id: str,
+    response: Response,
+    before: str | None = None,
+    after: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """
-    Gets messages from a session with embedded artifacts.
-
-    This function loads all messages from a session and processes any references
-    to artifacts, loading them and converting them to base64 for direct use in the frontend.
+    Gets a page of messages from a session.
+
+    Messages are paginated by their (timestamp, id): without cursors the most
+    recent ``limit`` messages are returned, ``before`` pages back to older
+    messages and ``after`` forward to newer ones. The cursors of the first and
+    last message of the page are returned in the X-Before-Cursor and
+    X-After-Cursor headers. Artifacts and file parts are returned as
+    references to /sessions/{session_id}/artifacts/{filename}, and inline data
+    larger than INLINE_DATA_MAX_SIZE as a reference to
+    /sessions/{session_id}/events/{event_id}/parts/{index}.
     """
-    # Get the session
-    session = get_session_by_id(session_service, session_id)
-    if not session:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+    await _get_authorized_session(session_id, db, payload)
+
+    events = list_session_events(
+        db,
+        session_id,
+        after=decode_event_cursor(after) if after else None,
+        before=decode_event_cursor(before) if before else None,
+        limit=limit,
+        detailed=True,
+    )
+    if events:
+        response.headers["X-Before-Cursor"] = encode_event_cursor(
+            (events[0]["timestamp"], events[0]["id"])
+        )
+        response.headers["X-After-Cursor"] = encode_event_cursor(
+            (events[-1]["timestamp"], events[-1]["id"])
+        )
 
-    # Verify if the session's agent belongs to the user's client
-    agent_id = uuid.UUID(session.app_name) if session.app_name else None
-    if agent_id:
-        agent = agent_service.get_agent(db, agent_id)
-        if agent:
-            await verify_user_client(payload, db, agent.client_id)
+    return [_event_to_message(session_id, event) for event in events]
 
-    # Parse session ID para obter app_name e user_id
-    parts = session_id.split("_")
-    if len(parts) != 2:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid session ID format"
-        )
 
-    user_id, app_name = parts[0], parts[1]
-
-    events = get_session_events(session_service, session_id)
-
-    processed_events = []
-    for event in events:
-        event_dict = event.model_dump()
-
-        def process_dict(d):
-            if isinstance(d, dict):
-                for key, value in list(d.items()):
-                    if isinstance(value, bytes):
-                        try:
-                            d[key] = base64.b64encode(value).decode("utf-8")
-                            logger.debug(f"Converted bytes field to base64: {key}")
-                        except Exception as e:
-                            logger.error(f"Error encoding bytes to base64: {str(e)}")
-                            d[key] = None
-                    elif isinstance(value, dict):
-                        process_dict(value)
-                    elif isinstance(value, list):
-                        for item in value:
-                            if isinstance(item, (dict, list)):
-                                process_dict(item)
-            elif isinstance(d, list):
-                for i, item in enumerate(d):
-                    if isinstance(item, bytes):
-                        try:
-                            d[i] = base64.b64encode(item).decode("utf-8")
-                        except Exception as e:
-                            logger.error(f"Error encoding bytes to base64 in list: {str(e)}")
-                            d[i] = None
-                    elif isinstance(item, (dict, list)):
-                        process_dict(item)
-            return d
-
-        # Process all event dictionary
-        event_dict = process_dict(event_dict)
-
-        # Process the content parts specifically
-        if event_dict.get("content") and event_dict["content"].get("parts"):
-            for part in event_dict["content"]["parts"]:
-                # Process inlineData if present
-                if part and part.get("inlineData") and part["inlineData"].get("data"):
-                    # Check if it's already a string or if it's bytes
-                    if isinstance(part["inlineData"]["data"], bytes):
-                        # Convert bytes to base64 string
-                        part["inlineData"]["data"] = base64.b64encode(
-                            part["inlineData"]["data"]
-                        ).decode("utf-8")
-                        logger.debug(
-                            f"Converted binary data to base64 in message {event_dict.get('id')}"
-                        )
-
-                # Process fileData if present (reference to an artifact)
-                if part and part.get("fileData") and part["fileData"].get("fileId"):
-                    try:
-                        # Extract the file name from the fileId
-                        file_id = part["fileData"]["fileId"]
-
-                        # Load the artifact from the artifacts service
-                        artifact = artifacts_service.load_artifact(
-                            app_name=app_name,
-                            user_id=user_id,
-                            session_id=session_id,
-                            filename=file_id,
-                        )
-
-                        if artifact and hasattr(artifact, "inline_data"):
-                            # Extract the data and MIME type
-                            file_bytes = artifact.inline_data.data
-                            mime_type = artifact.inline_data.mime_type
-
-                            # Add inlineData with the artifact data
-                            if not part.get("inlineData"):
-                                part["inlineData"] = {}
-
-                            # Ensure we're sending a base64 string, not bytes
-                            if isinstance(file_bytes, bytes):
-                                try:
-                                    part["inlineData"]["data"] = base64.b64encode(
-                                        file_bytes
-                                    ).decode("utf-8")
-                                except Exception as e:
-                                    logger.error(f"Error encoding artifact to base64: {str(e)}")
-                                    part["inlineData"]["data"] = None
-                            else:
-                                part["inlineData"]["data"] = str(file_bytes)
-
-                            part["inlineData"]["mimeType"] = mime_type
-
-                            logger.debug(
-                                f"Loaded artifact {file_id} for message {event_dict.get('id')}"
-                            )
-                    except Exception as e:
-                        logger.error(f"Error loading artifact: {str(e)}")
-                        # Don't interrupt the flow if an artifact fails
-
-        # Check artifact_delta in actions
-        if event_dict.get("actions") and event_dict["actions"].get("artifact_delta"):
-            artifact_deltas = event_dict["actions"]["artifact_delta"]
-            for filename, version in artifact_deltas.items():
-                try:
-                    # Load the artifact
-                    artifact = artifacts_service.load_artifact(
-                        app_name=app_name,
-                        user_id=user_id,
-                        session_id=session_id,
-                        filename=filename,
-                        version=version,
-                    )
-
-                    if artifact and hasattr(artifact, "inline_data"):
-                        # If the event doesn't have an artifacts section, create it
-                        if "artifacts" not in event_dict:
-                            event_dict["artifacts"] = {}
-
-                        # Add the artifact to the event's artifacts list
-                        file_bytes = artifact.inline_data.data
-                        mime_type = artifact.inline_data.mime_type
-
-                        # Ensure the bytes are converted to base64
-                        event_dict["artifacts"][filename] = {
-                            "data": (
-                                base64.b64encode(file_bytes).decode("utf-8")
-                                if isinstance(file_bytes, bytes)
-                                else str(file_bytes)
-                            ),
-                            "mimeType": mime_type,
-                            "version": version,
-                        }
-
-                        logger.debug(
-                            f"Added artifact {filename} (v{version}) to message {event_dict.get('id')}"
-                        )
-                except Exception as e:
-                    logger.error(f"Error processing artifact_delta {filename}: {str(e)}")
-
-        processed_events.append(event_dict)
-
-    return processed_events
+@router.get("/{session_id}/artifacts/{filename}")
+async def download_artifact(
+    session_id: str,
+    filename: str,
+    version: int | None = None,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(get_jwt_token),
+):
+    """Streams an artifact of a session, the latest version unless ``version`` is given."""
+    session = await _get_authorized_session(session_id, db, payload)
+
+    artifact = artifacts_service.load_artifact(
+        app_name=session["app_name"],
+        user_id=session["user_id"],
+        session_id=session_id,
+        filename=filename,
+        version=version,
+    )
+    if not artifact or not getattr(artifact, "inline_data", None):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found")
+
+    data = artifact.inline_data.data or b""
+    if isinstance(data, str):
+        data = base64.b64decode(data)
+    return _stream_bytes(data, artifact.inline_data.mime_type, filename)
+
+
+@router.get("/{session_id}/events/{event_id}/parts/{index}")
+async def download_event_part(
+    session_id: str,
+    event_id: str,
+    index: int,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(get_jwt_token),
+):
+    """Streams the inline data of a message part, sent by reference in large messages."""
+    await _get_authorized_session(session_id, db, payload)
+
+    event = get_session_event(db, session_id, event_id)
+    parts = ((event or {}).get("content") or {}).get("parts") or []
+    part = parts[index] if 0 <= index < len(parts) else None
+    inline_data = part.get("inline_data") if isinstance(part, dict) else None
+    data = _inline_data_base64(inline_data) if inline_data else None
+    if not data:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Part not found")
+
+    data = base64.b64decode(data)
+    mime_type = inline_data.get("mime_type")
+    extension = (mime_type or "").partition("/")[2] or "bin"
+    return _stream_bytes(data, mime_type, f"{event_id}_{index}.{extension}")
+
+
+def _stream_bytes(data: bytes, mime_type: str | None, filename: str) -> StreamingResponse:
+    def chunks():
+        for start in range(0, len(data), ARTIFACT_CHUNK_SIZE):
+            yield data[start : start + ARTIFACT_CHUNK_SIZE]
+
+    return StreamingResponse(
+        chunks(),
+        media_type=mime_type or "application/octet-stream",
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+            "Content-Length": str(len(data)),
+        },
+    )
 
 
 @router.delete(
@@ -16,6 +16,7 @@ from src.schemas.schemas import (
 from src.services import (
     tool_service,
 )
+from src.services.adk.http_tool_cache import http_tool_cache
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,16 @@ async def read_tools(
     return tool_service.get_tools(db, skip, limit)
 
 
+@router.get("/http-cache/stats")
+async def read_http_tool_cache_stats(
+    payload: dict = Depends(get_jwt_token),
+):
+    # Only administrators can view cache statistics of this worker
+    await verify_admin(payload)
+
+    return http_tool_cache.stats()
+
+
 @router.get("/{tool_id}", response_model=Tool)
 async def read_tool(
     tool_id: uuid.UUID,
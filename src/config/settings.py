@@ -45,6 +45,105 @@ class Settings(BaseSettings):
     # Tool cache TTL in seconds (1 hour)
     TOOLS_CACHE_TTL: int = int(os.getenv("TOOLS_CACHE_TTL", 3600))
 
+    # Built agent tree cache (per worker)
+    AGENT_CACHE_ENABLED: bool = os.getenv("AGENT_CACHE_ENABLED", "true").lower() == "true"
+    AGENT_CACHE_MAX_ENTRIES: int = int(os.getenv("AGENT_CACHE_MAX_ENTRIES", 128))
+    AGENT_CACHE_TTL: int = int(os.getenv("AGENT_CACHE_TTL", 300))
+
+    # Agent row cache used by get_agent (per worker, TTL in seconds, 0 disables)
+    AGENT_ROW_CACHE_MAX_ENTRIES: int = int(os.getenv("AGENT_ROW_CACHE_MAX_ENTRIES", 1024))
+    AGENT_ROW_CACHE_TTL: int = int(os.getenv("AGENT_ROW_CACHE_TTL", 30))
+
+    # Decrypted provider API key cache (per worker, TTL in seconds, 0 disables)
+    API_KEY_CACHE_MAX_ENTRIES: int = int(os.getenv("API_KEY_CACHE_MAX_ENTRIES", 256))
+    API_KEY_CACHE_TTL: int = int(os.getenv("API_KEY_CACHE_TTL", 60))
+
+    # Shared HTTP client used by HTTP tools (per worker, times in seconds)
+    HTTP_CLIENT_HTTP2: bool = os.getenv("HTTP_CLIENT_HTTP2", "true").lower() == "true"
+    HTTP_CLIENT_MAX_CONNECTIONS: int = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", 100))
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = int(
+        os.getenv("HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS", 20)
+    )
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY", 30))
+    HTTP_CLIENT_MAX_PER_HOST: int = int(os.getenv("HTTP_CLIENT_MAX_PER_HOST", 10))
+
+    # In-process fallback for the HTTP tool response cache when Redis is down
+    HTTP_TOOL_CACHE_LOCAL_MAX_ENTRIES: int = int(os.getenv("HTTP_TOOL_CACHE_LOCAL_MAX_ENTRIES", 512))
+
+    # Compiled workflow graphs, keyed by a hash of the flow (per worker, TTL in seconds, 0 disables)
+    WORKFLOW_GRAPH_CACHE_MAX_ENTRIES: int = int(os.getenv("WORKFLOW_GRAPH_CACHE_MAX_ENTRIES", 128))
+    WORKFLOW_GRAPH_CACHE_TTL: int = int(os.getenv("WORKFLOW_GRAPH_CACHE_TTL", 3600))
+    # Parallel workflow branches run at once, a flow can override it with "max_concurrency"
+    WORKFLOW_MAX_CONCURRENCY: int = int(os.getenv("WORKFLOW_MAX_CONCURRENCY", 4))
+    # Delays from this length are scheduled in Redis instead of waited in process (in seconds)
+    WORKFLOW_DURABLE_DELAY_MIN_SECONDS: int = int(
+        os.getenv("WORKFLOW_DURABLE_DELAY_MIN_SECONDS", 60)
+    )
+    WORKFLOW_DELAY_POLL_INTERVAL: float = float(os.getenv("WORKFLOW_DELAY_POLL_INTERVAL", 5))
+    WORKFLOW_DELAY_LEASE: int = int(os.getenv("WORKFLOW_DELAY_LEASE", 3600))
+    # Save workflow steps in Postgres so failed runs can be resumed
+    WORKFLOW_CHECKPOINT_ENABLED: bool = (
+        os.getenv("WORKFLOW_CHECKPOINT_ENABLED", "true").lower() == "true"
+    )
+    WORKFLOW_CHECKPOINT_POOL_SIZE: int = int(os.getenv("WORKFLOW_CHECKPOINT_POOL_SIZE", 5))
+    # Checkpoints of runs that failed or were abandoned are deleted after this many seconds
+    WORKFLOW_CHECKPOINT_TTL: int = int(os.getenv("WORKFLOW_CHECKPOINT_TTL", 7 * 24 * 3600))
+    WORKFLOW_CHECKPOINT_PRUNE_INTERVAL: float = float(
+        os.getenv("WORKFLOW_CHECKPOINT_PRUNE_INTERVAL", 3600)
+    )
+
+    # Task agent tasks running at the same time, when they declare depends_on
+    TASK_MAX_CONCURRENCY: int = int(os.getenv("TASK_MAX_CONCURRENCY", 4))
+
+    # Implementations detected on A2A servers, keyed by base URL (per worker, TTL in seconds)
+    A2A_IMPLEMENTATION_CACHE_TTL: int = int(os.getenv("A2A_IMPLEMENTATION_CACHE_TTL", 600))
+    A2A_IMPLEMENTATION_CACHE_MAX_ENTRIES: int = int(
+        os.getenv("A2A_IMPLEMENTATION_CACHE_MAX_ENTRIES", 256)
+    )
+    # a2a agents whose card URL points at API_URL call the target agent in process
+    A2A_LOCAL_FAST_PATH_ENABLED: bool = (
+        os.getenv("A2A_LOCAL_FAST_PATH_ENABLED", "true").lower() == "true"
+    )
+    # A2A tasks are kept in Redis this long after their last update (in seconds)
+    A2A_TASK_TTL: int = int(os.getenv("A2A_TASK_TTL", 86400))
+    # Messages of session history read for A2A responses, and the per-worker cache
+    # of the recent history of each session (TTL in seconds)
+    A2A_HISTORY_WINDOW: int = int(os.getenv("A2A_HISTORY_WINDOW", 50))
+    A2A_HISTORY_CURSOR_CACHE_TTL: int = int(os.getenv("A2A_HISTORY_CURSOR_CACHE_TTL", 3600))
+    A2A_HISTORY_CURSOR_CACHE_MAX_ENTRIES: int = int(
+        os.getenv("A2A_HISTORY_CURSOR_CACHE_MAX_ENTRIES", 1024)
+    )
+    # Push notifications are sent by background workers, retried with exponential
+    # backoff (delays in seconds) and then kept in a Redis dead-letter list
+    A2A_PUSH_WORKERS: int = int(os.getenv("A2A_PUSH_WORKERS", 4))
+    A2A_PUSH_MAX_ATTEMPTS: int = int(os.getenv("A2A_PUSH_MAX_ATTEMPTS", 5))
+    A2A_PUSH_RETRY_BASE_DELAY: float = float(os.getenv("A2A_PUSH_RETRY_BASE_DELAY", 1))
+    A2A_PUSH_RETRY_MAX_DELAY: float = float(os.getenv("A2A_PUSH_RETRY_MAX_DELAY", 60))
+    A2A_PUSH_TIMEOUT: float = float(os.getenv("A2A_PUSH_TIMEOUT", 30))
+    A2A_PUSH_DEAD_LETTER_MAX: int = int(os.getenv("A2A_PUSH_DEAD_LETTER_MAX", 1000))
+    # Agent cards of remote A2A agents, in process and in Redis (times in seconds). Cards
+    # follow their Cache-Control header, the TTL applies when there is none
+    A2A_AGENT_CARD_CACHE_TTL: int = int(os.getenv("A2A_AGENT_CARD_CACHE_TTL", 300))
+    A2A_AGENT_CARD_NEGATIVE_TTL: int = int(os.getenv("A2A_AGENT_CARD_NEGATIVE_TTL", 30))
+    A2A_AGENT_CARD_CACHE_MAX_ENTRIES: int = int(os.getenv("A2A_AGENT_CARD_CACHE_MAX_ENTRIES", 256))
+    A2A_AGENT_CARD_FETCH_TIMEOUT: float = float(os.getenv("A2A_AGENT_CARD_FETCH_TIMEOUT", 10))
+
+    # MCP connection pool settings (per worker, times in seconds)
+    MCP_POOL_ENABLED: bool = os.getenv("MCP_POOL_ENABLED", "true").lower() == "true"
+    MCP_POOL_MAX_SESSIONS_PER_SERVER: int = int(os.getenv("MCP_POOL_MAX_SESSIONS_PER_SERVER", 4))
+    MCP_POOL_MAX_LEASES_PER_SESSION: int = int(os.getenv("MCP_POOL_MAX_LEASES_PER_SESSION", 16))
+    MCP_POOL_IDLE_TIMEOUT: int = int(os.getenv("MCP_POOL_IDLE_TIMEOUT", 300))
+    MCP_POOL_HEALTH_CHECK_INTERVAL: int = int(os.getenv("MCP_POOL_HEALTH_CHECK_INTERVAL", 60))
+    MCP_POOL_CONNECT_TIMEOUT: int = int(os.getenv("MCP_POOL_CONNECT_TIMEOUT", 30))
+    MCP_POOL_BACKOFF_MAX: int = int(os.getenv("MCP_POOL_BACKOFF_MAX", 60))
+    # Declare MCP tools from the stored catalog and connect only on invocation
+    MCP_TOOLS_FROM_CATALOG: bool = os.getenv("MCP_TOOLS_FROM_CATALOG", "true").lower() == "true"
+
+    # MCP tool build limits (seconds); slow servers are dropped from the run
+    MCP_BUILD_CONCURRENCY: int = int(os.getenv("MCP_BUILD_CONCURRENCY", 8))
+    MCP_SERVER_CONNECT_DEADLINE: float = float(os.getenv("MCP_SERVER_CONNECT_DEADLINE", 20))
+    MCP_BUILD_DEADLINE: float = float(os.getenv("MCP_BUILD_DEADLINE", 30))
+
     # JWT settings
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", secrets.token_urlsafe(32))
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
@@ -10,6 +10,15 @@ from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
 from src.config.database import Base, engine
 from src.config.settings import settings
+from src.services.a2a_push_notifier import push_notification_dispatcher
+from src.services.a2a_task_store import a2a_task_store
+from src.services.adk.mcp_pool import mcp_connection_pool
+from src.services.adk.workflow_checkpointer import (
+    close_workflow_checkpointer,
+    start_checkpoint_pruning,
+)
+from src.services.adk.workflow_scheduler import workflow_delay_scheduler
+from src.utils.http_client import close_http_client
 from src.utils.logger import setup_logger
 from src.utils.otel import init_otel
 
@@ -58,6 +67,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination cursors of /sessions/{session_id}/messages
+    expose_headers=["X-Before-Cursor", "X-After-Cursor"],
 )
 
 # Static files configuration
@@ -109,6 +120,23 @@ init_otel()
 FastAPIInstrumentor.instrument_app(app)
 
 
+@app.on_event("startup")
+async def start_workflow_scheduler():
+    workflow_delay_scheduler.start()
+    start_checkpoint_pruning()
+
+
+@app.on_event("shutdown")
+async def close_pooled_connections():
+    await a2a_task_store.fail_running()
+    await workflow_delay_scheduler.stop()
+    await push_notification_dispatcher.close()
+    await mcp_connection_pool.close()
+    await close_http_client()
+    await close_workflow_checkpointer()
+    await a2a_task_store.close()
+
+
 @app.get("/")
 def read_root():
     return {
@@ -171,6 +171,8 @@ class MCPServer(Base):
     config_json = Column(JSON, nullable=False, default={})
     environments = Column(JSON, nullable=False, default={})
     tools = Column(JSON, nullable=False, default=[])
+    # Hash of the config_json the stored tools were discovered with
+    tools_hash = Column(String, nullable=True)
     type = Column(String, nullable=False, default="official")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -1,11 +1,49 @@
 """Repository for Agent operations."""
 
-from typing import List, Optional
+from typing import Any, Optional
+
+from sqlalchemy import text
 from sqlalchemy.orm import Session
+
 from src.models.models import Agent
 from src.repositories.base import BaseRepository
 
 
+def _json_array(path: str) -> str:
+    """Expressão SQL do array em config no caminho informado, ou um array vazio."""
+    value = f"parent.config::jsonb #> '{{{path}}}'"
+    return f"CASE WHEN jsonb_typeof({value}) = 'array' THEN {value} ELSE '[]'::jsonb END"
+
+
+# Percorre os ids referenciados em config: sub_agents, agent_tools,
+# tasks[].agent_id e workflow.nodes[].data.agent.id. O UNION descarta ids
+# repetidos, o que também encerra a recursão em grafos com ciclos.
+_AGENT_TREE_QUERY = text(
+    f"""
+    WITH RECURSIVE tree(id) AS (
+        SELECT id FROM agents WHERE id = :root_id
+        UNION
+        SELECT child.id
+        FROM tree
+        JOIN agents parent ON parent.id = tree.id
+        CROSS JOIN LATERAL (
+            SELECT jsonb_array_elements_text({_json_array("sub_agents")}) AS ref
+            UNION ALL
+            SELECT jsonb_array_elements_text({_json_array("agent_tools")})
+            UNION ALL
+            SELECT task ->> 'agent_id'
+            FROM jsonb_array_elements({_json_array("tasks")}) AS task
+            UNION ALL
+            SELECT node -> 'data' -> 'agent' ->> 'id'
+            FROM jsonb_array_elements({_json_array("workflow,nodes")}) AS node
+        ) refs
+        JOIN agents child ON child.id::text = lower(refs.ref)
+    )
+    SELECT agents.* FROM agents WHERE agents.id IN (SELECT id FROM tree)
+    """
+)
+
+
 class AgentRepository(BaseRepository[Agent]):
     """Repository para operações de Agent"""
 
@@ -24,7 +62,7 @@ class AgentRepository(BaseRepository[Agent]):
         """
         return self.db.query(Agent).filter(Agent.name == name).first()
 
-    def get_by_client(self, client_id: str, skip: int = 0, limit: int = 100) -> List[Agent]:
+    def get_by_client(self, client_id: str, skip: int = 0, limit: int = 100) -> list[Agent]:
         """
         Lista agents de um cliente.
 
@@ -44,7 +82,7 @@ class AgentRepository(BaseRepository[Agent]):
             .all()
         )
 
-    def get_by_type(self, agent_type: str) -> List[Agent]:
+    def get_by_type(self, agent_type: str) -> list[Agent]:
         """
         Busca agents por tipo.
 
@@ -56,7 +94,7 @@ class AgentRepository(BaseRepository[Agent]):
         """
         return self.db.query(Agent).filter(Agent.type == agent_type).all()
 
-    def search_by_name(self, name_pattern: str, limit: int = 10) -> List[Agent]:
+    def search_by_name(self, name_pattern: str, limit: int = 10) -> list[Agent]:
         """
         Busca agents por padrão no nome.
 
@@ -80,3 +118,23 @@ class AgentRepository(BaseRepository[Agent]):
             Número de agents do cliente
         """
         return self.db.query(Agent).filter(Agent.client_id == client_id).count()
+
+    def get_tree(self, root_id: Any) -> list[Agent]:
+        """
+        Busca o agent raiz e todos os agents alcançáveis a partir dele.
+
+        Usa uma única consulta com CTE recursiva sobre as referências
+        guardadas em config, em vez de uma consulta por agent.
+
+        Args:
+            root_id: ID do agent raiz
+
+        Returns:
+            Lista com o agent raiz e seus descendentes (vazia se a raiz não existir)
+        """
+        return (
+            self.db.query(Agent)
+            .from_statement(_AGENT_TREE_QUERY)
+            .params(root_id=root_id)
+            .all()
+        )
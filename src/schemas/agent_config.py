@@ -78,6 +78,24 @@ class HTTPToolErrorHandling(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class HTTPToolCache(BaseModel):
+    """Response cache policy of an HTTP tool"""
+
+    enabled: bool = False
+    ttl: int = Field(default=300, gt=0, description="Seconds a response is reused")
+    max_entry_size: int = Field(
+        default=65536, gt=0, description="Largest response, in bytes, that is cached"
+    )
+    methods: list[str] = Field(
+        default_factory=lambda: ["GET", "HEAD"], description="HTTP methods that are cached"
+    )
+    include_headers: bool = Field(
+        default=True, description="Use the request headers in the cache key"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class HTTPTool(BaseModel):
     """Configuration of an HTTP tool"""
 
@@ -89,6 +107,7 @@ class HTTPTool(BaseModel):
     parameters: HTTPToolParameters
     description: str
     error_handling: HTTPToolErrorHandling
+    cache: HTTPToolCache | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -181,6 +200,12 @@ class AgentTask(BaseModel):
     )
     description: str = Field(..., description="Description of the task to be performed")
     expected_output: str = Field(..., description="Expected output from this task")
+    id: str | None = Field(default=None, description="Task id, referenced by depends_on")
+    depends_on: list[int | str] | None = Field(
+        default=None,
+        description="Ids or indexes of the tasks this task waits for, "
+        "by default the previous task",
+    )
 
     @validator("agent_id")
     def validate_agent_id(cls, v):
@@ -22,6 +22,14 @@ class ChatRequest(BaseModel):
     )
 
 
+class WorkflowResumeRequest(BaseModel):
+    """Model to represent a request to resume a workflow run."""
+
+    invocation_id: str = Field(
+        ..., description="Invocation ID of the failed run, as found in its session events"
+    )
+
+
 class ChatResponse(BaseModel):
     """Model to represent a chat response."""
 
@@ -177,6 +177,10 @@ class AgentBase(BaseModel):
                 for field in required_fields:
                     if field not in task:
                         raise ValueError(f"Task missing required field: {field}")
+                if task.get("depends_on") is not None and not isinstance(
+                    task["depends_on"], list
+                ):
+                    raise ValueError("depends_on must be a list of task ids or indexes")
 
             if "sub_agents" in v and v["sub_agents"] is not None:
                 if not isinstance(v["sub_agents"], list):
@@ -246,6 +250,7 @@ class ToolConfig(BaseModel):
     examples: list[str] = Field(default_factory=list)
     inputModes: list[str] = Field(default_factory=list)
     outputModes: list[str] = Field(default_factory=list)
+    inputSchema: dict[str, Any] | None = None  # noqa: N815
 
 
 # Last edited by Arley Peter on 2025-05-17
@@ -265,6 +270,7 @@ class MCPServerCreate(MCPServerBase):
 
 class MCPServer(MCPServerBase):
     id: uuid.UUID
+    tools_hash: str | None = None
     created_at: datetime
     updated_at: datetime | None = None
 
@@ -0,0 +1,350 @@
+"""
+Background delivery of A2A push notifications.
+
+Notifications are queued in process and POSTed by a few worker tasks over
+the shared HTTP client, with a concurrency limit per webhook host. Failed
+deliveries are retried with exponential backoff and jitter; an update that
+arrives while an earlier one for the same task is still waiting replaces it.
+Deliveries that keep failing are kept in a Redis dead-letter list.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import Any
+
+import httpx
+
+from src.config.redis import get_redis
+from src.config.settings import settings
+from src.utils.http_client import get_http_client, host_slot
+
+logger = logging.getLogger(__name__)
+
+DEAD_LETTER_KEY = "a2a_push:dead_letter"
+
+# Responses worth retrying, other client errors will not succeed later
+RETRYABLE_STATUS_CODES = (408, 425, 429)
+
+
+def build_push_request(push_notification_config: dict[str, Any]) -> tuple[str, dict[str, str]]:
+    """
+    Return the webhook URL and headers of a PushNotificationConfig.
+
+    Raises ValueError when the config has no HTTPS URL.
+    """
+    # Support both official spec format and common variations
+    webhook_url = push_notification_config.get("url") or push_notification_config.get("webhookUrl")
+    webhook_token = push_notification_config.get("token")
+
+    # Support both official and alternative authentication field names
+    authentication = push_notification_config.get("authentication") or push_notification_config.get(
+        "webhookAuthenticationInfo"
+    )
+
+    if not webhook_url:
+        raise ValueError("pushNotificationConfig.url (or webhookUrl) is required")
+
+    # Validate HTTPS requirement (A2A spec: url MUST be HTTPS for security to prevent SSRF)
+    if not webhook_url.startswith("https://"):
+        raise ValueError("pushNotificationConfig.url MUST use HTTPS to prevent SSRF attacks")
+
+    # Prepare headers according to A2A spec section 9.5
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": f"A2A-Server/{getattr(settings, 'API_VERSION', '1.0.0')}",
+    }
+
+    # Add client token if provided
+    # (A2A spec: server SHOULD include in X-A2A-Notification-Token header)
+    if webhook_token:
+        headers["X-A2A-Notification-Token"] = webhook_token
+        logger.info("🔑 Added client token to notification headers")
+
+    # Handle authentication according to A2A spec PushNotificationAuthenticationInfo
+    if authentication:
+        auth_type = authentication.get("type")
+
+        # Handle "none" type (no authentication)
+        if auth_type == "none":
+            logger.info("🔓 No authentication required for webhook")
+
+        # Handle schemes-based authentication (official A2A spec format)
+        elif "schemes" in authentication:
+            auth_schemes = authentication.get("schemes", [])
+            auth_credentials = authentication.get("credentials")
+
+            for scheme in auth_schemes:
+                if scheme.lower() == "bearer":
+                    # Bearer token authentication
+                    if auth_credentials:
+                        headers["Authorization"] = f"Bearer {auth_credentials}"
+                        logger.info("🔐 Added Bearer authentication")
+                    else:
+                        logger.warning("⚠️ Bearer scheme specified but no credentials provided")
+
+                elif scheme.lower() == "apikey":
+                    # API Key authentication
+                    if auth_credentials:
+                        try:
+                            # A2A spec example: JSON like {"in": "header",
+                            # "name": "X-Client-Webhook-Key", "value": "actual_key"}
+                            if isinstance(auth_credentials, str):
+                                cred_data = json.loads(auth_credentials)
+                            else:
+                                cred_data = auth_credentials
+
+                            if cred_data.get("in") == "header":
+                                header_name = cred_data.get("name", "X-API-Key")
+                                header_value = cred_data.get("value")
+                                if header_value:
+                                    headers[header_name] = header_value
+                                    logger.info(
+                                        f"🔐 Added API Key authentication to header: {header_name}"
+                                    )
+                        except (json.JSONDecodeError, TypeError):
+                            # Fallback: treat credentials as direct API key value
+                            headers["X-API-Key"] = str(auth_credentials)
+                            logger.info("🔐 Added API Key authentication (fallback)")
+                    else:
+                        logger.warning("⚠️ ApiKey scheme specified but no credentials provided")
+
+                else:
+                    logger.warning(f"⚠️ Unsupported authentication scheme: {scheme}")
+
+        # Handle basic authentication types
+        elif auth_type == "bearer":
+            token = authentication.get("token") or authentication.get("credentials")
+            if token:
+                headers["Authorization"] = f"Bearer {token}"
+                logger.info("🔐 Added Bearer authentication (alternative format)")
+
+        elif auth_type == "apikey":
+            api_key = (
+                authentication.get("apiKey")
+                or authentication.get("key")
+                or authentication.get("credentials")
+            )
+            header_name = authentication.get("headerName", "X-API-Key")
+            if api_key:
+                headers[header_name] = api_key
+                logger.info(f"🔐 Added API Key authentication to header: {header_name}")
+
+        else:
+            logger.warning(f"⚠️ Unsupported authentication type: {auth_type}")
+
+    return webhook_url, headers
+
+
+class PushNotificationDispatcher:
+    """In-process queue of push notifications, delivered by background workers."""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        timeout: float = 30.0,
+        max_pending: int = 10000,
+        dead_letter_max: int = 1000,
+    ):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.dead_letter_max = dead_letter_max
+        # Notifications waiting for a worker, by task and webhook, so a newer
+        # update replaces one that was not sent yet
+        self._pending: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
+        # Keys being delivered or waiting for a retry. Updates of a task are sent
+        # to a webhook one at a time, so they arrive in order
+        self._in_flight: set[tuple[str, str]] = set()
+        # Sequence of the last update sent per key, older retries are dropped
+        self._last_sent: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self._sequence = itertools.count(1)
+        self._ready: asyncio.Queue | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def enqueue(self, payload: dict[str, Any], push_notification_config: dict[str, Any]) -> None:
+        """Queue a notification, raising ValueError for an invalid config."""
+        url, headers = build_push_request(push_notification_config)
+        key = (str(payload.get("id") or payload.get("taskId") or id(payload)), url)
+        self._ensure_workers()
+        notification = {
+            "url": url,
+            "headers": headers,
+            "payload": payload,
+            "attempts": 0,
+            "sequence": next(self._sequence),
+        }
+
+        if key in self._pending:
+            # Coalesced, the worker picks up the latest update
+            self._pending[key] = notification
+            return
+
+        if len(self._pending) >= self.max_pending:
+            dropped_key, dropped = self._pending.popitem(last=False)
+            logger.warning(f"Push notification queue full, dropping update for {dropped_key[0]}")
+            self._dead_letter(dropped, "queue full")
+
+        self._pending[key] = notification
+        if key not in self._in_flight:
+            self._ready.put_nowait(key)
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._ready is not None and self._tasks:
+            if next(iter(self._tasks)).get_loop() is loop:
+                return
+        self._ready = asyncio.Queue()
+        self._in_flight.clear()
+        for key in self._pending:
+            self._ready.put_nowait(key)
+        self._tasks = set()
+        for _ in range(max(1, self.workers)):
+            self._spawn(self._worker())
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _release(self, key: tuple[str, str]) -> None:
+        """Let the next update of a key be sent."""
+        self._in_flight.discard(key)
+        if key in self._pending and self._ready is not None:
+            self._ready.put_nowait(key)
+
+    def _mark_sent(self, key: tuple[str, str], sequence: int) -> None:
+        self._last_sent[key] = max(sequence, self._last_sent.pop(key, 0))
+        while len(self._last_sent) > self.max_pending:
+            self._last_sent.popitem(last=False)
+
+    async def _worker(self):
+        while True:
+            key = await self._ready.get()
+            if key in self._in_flight:
+                # Queued again by _release once the current update is done
+                continue
+            notification = self._pending.pop(key, None)
+            if notification is None:
+                continue
+
+            self._in_flight.add(key)
+            retrying = False
+            try:
+                retrying = await self._deliver(key, notification)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Unexpected error delivering push notification: {e}")
+            finally:
+                if not retrying:
+                    self._release(key)
+
+    async def _deliver(self, key: tuple[str, str], notification: dict[str, Any]) -> bool:
+        """Send a notification, returning True when a retry was scheduled."""
+        url = notification["url"]
+        notification["attempts"] += 1
+        try:
+            async with host_slot(url, timeout=self.timeout):
+                response = await get_http_client().post(
+                    url,
+                    headers=notification["headers"],
+                    json=notification["payload"],
+                    timeout=self.timeout,
+                )
+            if response.status_code < 400:
+                logger.info(f"✅ Push notification delivered to {url} ({response.status_code})")
+                self._mark_sent(key, notification["sequence"])
+                return False
+            error = f"HTTP {response.status_code}"
+            retryable = (
+                response.status_code >= 500 or response.status_code in RETRYABLE_STATUS_CODES
+            )
+        except httpx.HTTPError as e:
+            error = f"{type(e).__name__}: {e}"
+            retryable = True
+
+        if not retryable or notification["attempts"] >= self.max_attempts:
+            logger.error(
+                f"❌ Push notification to {url} failed after {notification['attempts']} "
+                f"attempts: {error}"
+            )
+            self._dead_letter(notification, error)
+            return False
+
+        # Exponential backoff with full jitter
+        delay = random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (notification["attempts"] - 1))
+        )
+        logger.warning(
+            f"⚠️ Push notification to {url} failed ({error}), retrying in {delay:.1f}s"
+        )
+        self._spawn(self._retry_later(key, notification, delay))
+        return True
+
+    async def _retry_later(self, key: tuple[str, str], notification: dict[str, Any], delay: float):
+        try:
+            await asyncio.sleep(delay)
+            if key in self._pending or notification["sequence"] <= self._last_sent.get(key, 0):
+                # A newer update is queued or was sent, it carries the latest state
+                return
+            self._pending[key] = notification
+        finally:
+            self._release(key)
+
+    def _dead_letter(self, notification: dict[str, Any], error: str) -> None:
+        payload = notification["payload"]
+        # Headers are left out, they carry the webhook credentials
+        entry = {
+            "url": notification["url"],
+            "task_id": payload.get("id") or payload.get("taskId"),
+            "state": (payload.get("status") or {}).get("state"),
+            "attempts": notification["attempts"],
+            "error": error,
+            "failed_at": time.time(),
+            "payload": payload,
+        }
+
+        async def store():
+            try:
+                redis_client = await get_redis()
+                async with redis_client.pipeline(transaction=True) as pipe:
+                    pipe.lpush(DEAD_LETTER_KEY, json.dumps(entry, default=str))
+                    pipe.ltrim(DEAD_LETTER_KEY, 0, self.dead_letter_max - 1)
+                    await pipe.execute()
+            except Exception as e:
+                logger.error(f"Could not store dead push notification for {entry['url']}: {e}")
+
+        self._spawn(store())
+
+    async def close(self):
+        """Stop the workers, notifications still queued are dropped."""
+        if self._pending:
+            logger.warning(f"Dropping {len(self._pending)} queued push notifications")
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks.clear()
+        self._pending.clear()
+        self._in_flight.clear()
+        self._ready = None
+
+
+push_notification_dispatcher = PushNotificationDispatcher(
+    workers=settings.A2A_PUSH_WORKERS,
+    max_attempts=settings.A2A_PUSH_MAX_ATTEMPTS,
+    base_delay=settings.A2A_PUSH_RETRY_BASE_DELAY,
+    max_delay=settings.A2A_PUSH_RETRY_MAX_DELAY,
+    timeout=settings.A2A_PUSH_TIMEOUT,
+    dead_letter_max=settings.A2A_PUSH_DEAD_LETTER_MAX,
+)
@@ -0,0 +1,283 @@
+"""
+Persistent registry of A2A tasks.
+
+Tasks are stored in Redis with their status, the transitions between states,
+their artifacts and their history, so any worker can answer tasks/get, cancel
+a task or stream its updates. Every status change is published on a channel
+per task; each worker keeps a single pattern subscription and hands the
+updates to its local subscribers.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import AsyncIterator, Awaitable
+from datetime import datetime
+from typing import Any
+
+from redis.exceptions import WatchError
+
+from src.config.redis import get_redis
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+TASK_KEY = "a2a_task:{}"
+PUSH_CONFIG_KEY = "a2a_task_push:{}"
+CHANNEL = "a2a_task_events:{}"
+CHANNEL_PATTERN = "a2a_task_events:*"
+
+TERMINAL_STATES = ("completed", "canceled", "failed", "rejected")
+
+
+class TaskCanceledError(Exception):
+    """Raised when a running task is canceled through tasks/cancel."""
+
+
+def _timestamp() -> str:
+    return datetime.now().isoformat() + "Z"
+
+
+def status_update_event(task: dict[str, Any]) -> dict[str, Any]:
+    """Build the TaskStatusUpdateEvent of a task's current status."""
+    event = {
+        "taskId": task["id"],
+        "contextId": task.get("contextId"),
+        "kind": "status-update",
+        "status": task["status"],
+        "final": task["status"]["state"] in TERMINAL_STATES,
+    }
+    if event["final"] and task.get("artifacts"):
+        event["artifacts"] = task["artifacts"]
+    return event
+
+
+class A2ATaskStore:
+    """Redis-backed A2A task store shared by every worker."""
+
+    def __init__(self, ttl: int = 86400, poll_interval: float = 30.0):
+        self.ttl = ttl
+        # Subscribers re-read the task this often, in case an update was missed
+        self.poll_interval = poll_interval
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._listener: asyncio.Task | None = None
+        # Tasks run by this worker, failed on shutdown so they do not stay "working"
+        self._running: set[str] = set()
+
+    async def create(
+        self,
+        agent_id: str,
+        context_id: str,
+        message: dict[str, Any] | None = None,
+        push_config: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Record a new submitted task."""
+        timestamp = _timestamp()
+        task = {
+            "id": str(uuid.uuid4()),
+            "contextId": context_id,
+            "status": {"state": "submitted", "timestamp": timestamp},
+            "artifacts": [],
+            "history": [message] if message else [],
+            "kind": "task",
+            "metadata": {
+                "agentId": agent_id,
+                "transitions": [{"state": "submitted", "timestamp": timestamp}],
+            },
+        }
+
+        redis_client = await get_redis()
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.set(TASK_KEY.format(task["id"]), json.dumps(task, default=str), ex=self.ttl)
+            if push_config:
+                pipe.set(PUSH_CONFIG_KEY.format(task["id"]), json.dumps(push_config), ex=self.ttl)
+            await pipe.execute()
+        return task
+
+    async def get(self, task_id: str) -> dict[str, Any] | None:
+        redis_client = await get_redis()
+        value = await redis_client.get(TASK_KEY.format(task_id))
+        return json.loads(value) if value else None
+
+    async def update(
+        self,
+        task_id: str,
+        state: str,
+        message: dict[str, Any] | None = None,
+        artifacts: list[dict[str, Any]] | None = None,
+        history: list[dict[str, Any]] | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Record a state transition and publish it.
+
+        Returns None when the task does not exist or already reached a final
+        state, such as a task canceled while it was running.
+        """
+        key = TASK_KEY.format(task_id)
+        redis_client = await get_redis()
+        async with redis_client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    value = await pipe.get(key)
+                    if value is None:
+                        return None
+                    task = json.loads(value)
+                    if task["status"]["state"] in TERMINAL_STATES:
+                        return None
+
+                    timestamp = _timestamp()
+                    task["status"] = {"state": state, "timestamp": timestamp}
+                    if message:
+                        task["status"]["message"] = message
+                    if artifacts is not None:
+                        task["artifacts"] = artifacts
+                    if history is not None:
+                        task["history"] = history
+                    task["metadata"]["transitions"].append(
+                        {"state": state, "timestamp": timestamp}
+                    )
+
+                    pipe.multi()
+                    pipe.set(key, json.dumps(task, default=str), ex=self.ttl)
+                    pipe.publish(
+                        CHANNEL.format(task_id), json.dumps(status_update_event(task), default=str)
+                    )
+                    await pipe.execute()
+                    return task
+                except WatchError:
+                    continue
+
+    async def cancel(self, task_id: str) -> dict[str, Any] | None:
+        """
+        Cancel a task that has not finished yet.
+
+        Returns the task, unchanged when it had already finished, or None when
+        it does not exist. The worker running it stops when the update arrives.
+        """
+        task = await self.get(task_id)
+        if task is None or task["status"]["state"] in TERMINAL_STATES:
+            return task
+        return await self.update(task_id, "canceled") or await self.get(task_id)
+
+    async def set_push_config(self, task_id: str, push_config: dict[str, Any]) -> None:
+        redis_client = await get_redis()
+        await redis_client.set(
+            PUSH_CONFIG_KEY.format(task_id), json.dumps(push_config), ex=self.ttl
+        )
+
+    async def get_push_config(self, task_id: str) -> dict[str, Any] | None:
+        redis_client = await get_redis()
+        value = await redis_client.get(PUSH_CONFIG_KEY.format(task_id))
+        return json.loads(value) if value else None
+
+    async def run_until_canceled(self, task_id: str, work: Awaitable[Any]) -> Any:
+        """Run ``work``, cancelling it when the task is canceled from any worker."""
+        queue = self._subscribe(task_id)
+        work = asyncio.ensure_future(work)
+        self._running.add(task_id)
+
+        async def wait_canceled():
+            while (await queue.get())["status"]["state"] != "canceled":
+                pass
+
+        watcher = asyncio.create_task(wait_canceled())
+        try:
+            await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if work.done():
+                return work.result()
+            work.cancel()
+            raise TaskCanceledError(task_id)
+        finally:
+            watcher.cancel()
+            self._running.discard(task_id)
+            self._unsubscribe(task_id, queue)
+
+    async def stream(self, task_id: str) -> AsyncIterator[dict[str, Any]]:
+        """Yield the status of a task and then its updates, until it finishes."""
+        queue = self._subscribe(task_id)
+        try:
+            task = await self.get(task_id)
+            if task is None:
+                return
+            event = status_update_event(task)
+            yield event
+
+            while not event["final"]:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=self.poll_interval)
+                except TimeoutError:
+                    task = await self.get(task_id)
+                    if task is None:
+                        return
+                    if task["status"]["state"] not in TERMINAL_STATES:
+                        continue
+                    event = status_update_event(task)
+                yield event
+        finally:
+            self._unsubscribe(task_id, queue)
+
+    def _subscribe(self, task_id: str) -> asyncio.Queue:
+        self._ensure_listener()
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(task_id, set()).add(queue)
+        return queue
+
+    def _unsubscribe(self, task_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(task_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[task_id]
+
+    def _ensure_listener(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen())
+
+    async def _listen(self):
+        """Receive the updates of every task, on a single connection per worker."""
+        while True:
+            pubsub = None
+            try:
+                redis_client = await get_redis()
+                pubsub = redis_client.pubsub()
+                await pubsub.psubscribe(CHANNEL_PATTERN)
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    task_id = message["channel"].split(":", 1)[1]
+                    event = json.loads(message["data"])
+                    for queue in self._subscribers.get(task_id, ()):
+                        queue.put_nowait(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"A2A task update listener failed, reconnecting: {e}")
+                await asyncio.sleep(1)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    async def fail_running(self, reason: str = "Server shut down") -> None:
+        """Mark the tasks still running on this worker as failed."""
+        message = {"role": "agent", "parts": [{"type": "text", "text": reason}]}
+        for task_id in list(self._running):
+            try:
+                await self.update(task_id, "failed", message=message)
+            except Exception as e:
+                logger.warning(f"Could not mark A2A task {task_id} as failed: {e}")
+        self._running.clear()
+
+    async def close(self):
+        """Stop receiving task updates."""
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+
+a2a_task_store = A2ATaskStore(ttl=settings.A2A_TASK_TTL)
@@ -0,0 +1,208 @@
+"""
+Shared cache of the agent cards of remote A2A agents.
+
+Cards are keyed by ``agent_card_url`` and a hash of the API key they were
+fetched with, since a card may depend on the caller's credentials, and kept
+in process and in Redis, so an A2A agent that is rebuilt on every request
+does not fetch its card again.
+Expiry follows the ``Cache-Control`` header of the card response, expired
+cards are revalidated with their ``ETag``, and cards close to expiry are
+refreshed in the background. Failed fetches are remembered for a short time.
+"""
+
+import asyncio
+import hashlib
+import re
+import time
+from typing import Any
+
+import httpx
+
+from src.config.settings import settings
+from src.services.cache_service import CacheService
+from src.utils.http_client import get_http_client
+from src.utils.logger import setup_logger
+from src.utils.ttl_cache import TTLCache
+
+logger = setup_logger(__name__)
+
+KEY_PREFIX = "a2a_agent_card"
+
+_MAX_AGE = re.compile(r"(?:^|,)\s*(?:s-maxage|max-age)\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def _cache_ttl(cache_control: str | None, default_ttl: int) -> int | None:
+    """Return how long a card may be cached, or None when it must not be stored."""
+    if not cache_control:
+        return default_ttl
+    directives = cache_control.lower()
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        # Stored for its ETag, but revalidated before every use
+        return 0
+    match = _MAX_AGE.search(directives)
+    return int(match.group(1)) if match else default_ttl
+
+
+class AgentCardCache:
+    """Two-level (in-process and Redis) cache of A2A agent cards."""
+
+    def __init__(
+        self,
+        default_ttl: int = 300,
+        negative_ttl: int = 30,
+        refresh_ahead: float = 0.2,
+        max_local_entries: int = 256,
+    ):
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        # Fraction of the TTL before expiry where a background refresh starts
+        self.refresh_ahead = refresh_ahead
+        # Entries carry their own expiry, the TTLCache TTL is only an upper bound
+        self._local = TTLCache(max_entries=max_local_entries, ttl=86400)
+        self._fetches: dict[str, asyncio.Task] = {}
+        self._refreshes: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _key(agent_card_url: str, api_key: str | None) -> str:
+        """Cache key of a card, separate for every API key so cards never leak across clients."""
+        client = hashlib.sha256(api_key.encode()).hexdigest()[:32] if api_key else "anonymous"
+        return f"{KEY_PREFIX}:{client}:{agent_card_url}"
+
+    async def get(self, agent_card_url: str, api_key: str | None = None) -> dict[str, Any]:
+        """
+        Return the agent card of ``agent_card_url``.
+
+        Raises ValueError when the card cannot be fetched, also while a recent
+        failure is remembered.
+        """
+        key = self._key(agent_card_url, api_key)
+        entry = await self._get_entry(key)
+        now = time.time()
+
+        if entry is None or now >= entry["expires_at"]:
+            entry = await self._fetch_once(key, agent_card_url, api_key, entry)
+        elif entry.get("card") is not None and now >= entry["refresh_at"]:
+            self._refresh_in_background(key, agent_card_url, api_key, entry)
+
+        if entry.get("card") is None:
+            raise ValueError(f"Agent card unavailable: {entry.get('error')}")
+        return entry["card"]
+
+    async def invalidate(self, agent_card_url: str, api_key: str | None = None) -> None:
+        """Forget the card of ``agent_card_url`` fetched with ``api_key``."""
+        await self._forget(self._key(agent_card_url, api_key))
+
+    async def _forget(self, key: str) -> None:
+        self._local.pop(key)
+        await CacheService.delete(key)
+
+    async def _get_entry(self, key: str) -> dict[str, Any] | None:
+        entry = self._local.get(key)
+        if entry is None:
+            entry = await CacheService.get(key)
+            if entry is not None:
+                self._local.set(key, entry)
+        return entry
+
+    async def _store(self, key: str, entry: dict[str, Any]) -> None:
+        self._local.set(key, entry)
+        # Expired cards are kept a while longer for their ETag
+        ttl = max(1, int(entry["expires_at"] - time.time())) + self.default_ttl
+        await CacheService.set(key, entry, ttl)
+
+    async def _fetch_once(
+        self,
+        key: str,
+        agent_card_url: str,
+        api_key: str | None,
+        stale: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        """Fetch a card, sharing a fetch already running for the same URL and API key."""
+        task = self._fetches.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._fetch(key, agent_card_url, api_key, stale))
+            self._fetches[key] = task
+
+            def forget(done: asyncio.Task):
+                if self._fetches.get(key) is done:
+                    del self._fetches[key]
+
+            task.add_done_callback(forget)
+        return await asyncio.shield(task)
+
+    def _refresh_in_background(
+        self, key: str, agent_card_url: str, api_key: str | None, entry: dict[str, Any]
+    ) -> None:
+        if key in self._fetches:
+            return
+
+        async def refresh():
+            try:
+                await self._fetch_once(key, agent_card_url, api_key, entry)
+            except Exception as e:
+                logger.debug(f"Background refresh of agent card {agent_card_url} failed: {e}")
+
+        task = asyncio.create_task(refresh())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def _fetch(
+        self,
+        key: str,
+        agent_card_url: str,
+        api_key: str | None,
+        stale: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        headers = {"Accept": "application/json"}
+        if api_key:
+            headers["x-api-key"] = api_key
+        if stale and stale.get("card") is not None and stale.get("etag"):
+            headers["If-None-Match"] = stale["etag"]
+
+        now = time.time()
+        try:
+            response = await get_http_client().get(
+                agent_card_url, headers=headers, timeout=settings.A2A_AGENT_CARD_FETCH_TIMEOUT
+            )
+            if response.status_code == 304:
+                card = stale["card"]
+            else:
+                response.raise_for_status()
+                card = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Error fetching agent card {agent_card_url}: {e}")
+            # A card being refreshed stays usable until it expires
+            if stale and stale.get("card") is not None and now < stale["expires_at"]:
+                return stale
+            entry = {
+                "card": None,
+                "error": str(e),
+                "etag": None,
+                "expires_at": now + self.negative_ttl,
+                "refresh_at": now + self.negative_ttl,
+            }
+            await self._store(key, entry)
+            return entry
+
+        ttl = _cache_ttl(response.headers.get("cache-control"), self.default_ttl)
+        entry = {
+            "card": card,
+            "error": None,
+            "etag": response.headers.get("etag") or (stale or {}).get("etag"),
+            "expires_at": now + (ttl or 0),
+            "refresh_at": now + (ttl or 0) * (1 - self.refresh_ahead),
+        }
+        if ttl is None:
+            await self._forget(key)
+        else:
+            await self._store(key, entry)
+        return entry
+
+
+agent_card_cache = AgentCardCache(
+    default_ttl=settings.A2A_AGENT_CARD_CACHE_TTL,
+    negative_ttl=settings.A2A_AGENT_CARD_NEGATIVE_TTL,
+    max_local_entries=settings.A2A_AGENT_CARD_CACHE_MAX_ENTRIES,
+)
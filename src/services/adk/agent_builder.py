@@ -1,6 +1,11 @@
+import asyncio
+import functools
+import re
 import uuid
+from collections.abc import Awaitable, Callable
 from contextlib import AsyncExitStack
 from datetime import datetime
+from typing import Any
 
 import litellm
 from google.adk.agents import BaseAgent, LoopAgent, ParallelAgent, SequentialAgent
@@ -10,99 +15,315 @@ from google.adk.tools import load_memory
 from google.adk.tools.agent_tool import AgentTool
 from sqlalchemy.orm import Session
 
+from src.config.settings import settings
 from src.core.exceptions import AgentNotFoundError
 from src.schemas.agent_config import AgentTask
+from src.services.adk.agent_cache import built_agent_cache
 from src.services.adk.custom_agents.a2a_agent import A2ACustomAgent
-from src.services.adk.custom_agents.task_agent import TaskAgent
+from src.services.adk.custom_agents.task_agent import TaskAgent, resolve_task_dependencies
 from src.services.adk.custom_agents.workflow_agent import WorkflowAgent
 from src.services.adk.custom_tools import CustomToolBuilder
 from src.services.adk.mcp_service import MCPService
-from src.services.agent_service import get_agent
+from src.services.agent_service import AgentGraph, get_agent, get_agent_graph
 from src.services.apikey_service import get_decrypted_api_key
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Agent types whose built instances hold a database session or open connections
+NON_CACHEABLE_AGENT_TYPES = ("workflow", "task")
+
+# Agent endpoints of this deployment, as found in an agent card URL
+LOCAL_A2A_PATH = re.compile(r"^/api/v1/a2a(?:-sdk)?/([0-9a-fA-F-]{36})(?:/|$)")
+
+
+def _render_instruction(
+    instruction: str, role: str | None, goal: str | None, use_memory: bool
+) -> str:
+    """Render an agent prompt, substituting the date and time placeholders."""
+    now = datetime.now()
+
+    # Substitute variables in the prompt
+    formatted_prompt = instruction.format(
+        current_datetime=now.strftime("%d/%m/%Y %H:%M"),
+        current_day_of_week=now.strftime("%A"),
+        current_date_iso=now.strftime("%Y-%m-%d"),
+        current_time=now.strftime("%H:%M"),
+    )
+
+    # add role on beginning of the prompt
+    if role:
+        formatted_prompt = f"<agent_role>{role}</agent_role>\n\n{formatted_prompt}"
+
+    # add goal on beginning of the prompt
+    if goal:
+        formatted_prompt = f"<agent_goal>{goal}</agent_goal>\n\n{formatted_prompt}"
+
+    if use_memory:
+        formatted_prompt = (
+            formatted_prompt
+            + "\n\n<memory_instructions>ALWAYS use the load_memory tool to retrieve knowledge for your context</memory_instructions>\n\n"
+        )
+
+    return formatted_prompt
+
+
+def _referenced_agent_ids(agent) -> list[str]:
+    """Return the ids of every agent directly referenced by an agent's config."""
+    config = agent.config or {}
+    agent_ids = []
+
+    agent_ids.extend(str(agent_id) for agent_id in config.get("sub_agents") or [])
+    agent_ids.extend(str(agent_id) for agent_id in config.get("agent_tools") or [])
+
+    for task in config.get("tasks") or []:
+        if isinstance(task, dict) and task.get("agent_id"):
+            agent_ids.append(str(task["agent_id"]))
+
+    workflow = config.get("workflow") or {}
+    for node in workflow.get("nodes") or []:
+        node_agent = (node.get("data") or {}).get("agent") or {}
+        if isinstance(node_agent, dict) and node_agent.get("id"):
+            agent_ids.append(str(node_agent["id"]))
+
+    return agent_ids
+
+
+def _stored_api_key_id(agent) -> str | None:
+    """Return the id of the stored API key used by an agent, if any."""
+    if getattr(agent, "api_key_id", None):
+        return str(agent.api_key_id)
+
+    config_api_key = (agent.config or {}).get("api_key")
+    try:
+        return str(uuid.UUID(config_api_key))
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def _row_version(row) -> str:
+    """Return the version of a stored row, changing on every edit or deactivation."""
+    if row is None:
+        return ""
+    version = row.updated_at or row.created_at
+    version = version.isoformat() if version else ""
+    if getattr(row, "is_active", True) is False:
+        version += ":inactive"
+    return version
+
 
 class AgentBuilder:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, agent_graph: AgentGraph | None = None):
         self.db = db
         self.custom_tool_builder = CustomToolBuilder()
-        self.mcp_service = MCPService()
+        # Agents, API keys and MCP servers preloaded for the whole tree
+        self.agent_graph = agent_graph or AgentGraph()
+        # Per-build memoization, so an agent referenced from several places has
+        # its tools built only once
+        self._tool_builds: dict[str, asyncio.Future] = {}
+        self._agent_tool_builds: dict[str, asyncio.Future] = {}
+
+    def _preload_agent_graph(self, root_agent) -> None:
+        """Load the agent tree with its API keys and MCP servers in bulk."""
+        if str(root_agent.id) in self.agent_graph.agents:
+            return
+
+        graph = get_agent_graph(self.db, root_agent.id)
+        self.agent_graph.agents.update(graph.agents)
+        self.agent_graph.api_keys.update(graph.api_keys)
+        self.agent_graph.mcp_servers.update(graph.mcp_servers)
+        logger.debug(f"Preloaded {len(graph.agents)} agents for {root_agent.name}")
+
+    def _load_agent(self, agent_id) -> Any:
+        """Get an agent by id, at most once per build."""
+        agent_id = str(agent_id)
+        agent = self.agent_graph.agents.get(agent_id)
+        if agent is None:
+            agent = get_agent(self.db, agent_id)
+            if agent is None:
+                logger.error(f"Sub-agent not found: {agent_id}")
+                raise AgentNotFoundError(agent_id)
+            self.agent_graph.agents[agent_id] = agent
+        return agent
+
+    def _check_agent_cycles(self, root_agent) -> None:
+        """Fail fast when sub_agents or agent_tools reference each other in a loop."""
+        self.agent_graph.agents.setdefault(str(root_agent.id), root_agent)
+        visited = set()
+        path = []
+
+        def visit(agent):
+            agent_id = str(agent.id)
+            if agent_id in path:
+                cycle = path[path.index(agent_id) :] + [agent_id]
+                names = " -> ".join(self.agent_graph.agents[cycle_id].name for cycle_id in cycle)
+                raise ValueError(f"Agent {root_agent.name} has a cycle in its sub-agents: {names}")
+            if agent_id in visited:
+                return
+
+            path.append(agent_id)
+            config = agent.config or {}
+            for child_id in (config.get("sub_agents") or []) + (config.get("agent_tools") or []):
+                visit(self._load_agent(child_id))
+            path.pop()
+            visited.add(agent_id)
+
+        visit(root_agent)
+
+    @staticmethod
+    async def _memoized(
+        memo: dict[str, asyncio.Future], key: str, build: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, bool]:
+        """
+        Run a build once per key, sharing its result with concurrent callers.
+
+        Returns the result and whether this call performed the build, so that
+        only one caller takes ownership of the resources it opened.
+        """
+        future = memo.get(key)
+        if future is not None:
+            return await asyncio.shield(future), False
+
+        future = asyncio.get_running_loop().create_future()
+        memo[key] = future
+        try:
+            result = await build()
+        except BaseException as e:
+            memo.pop(key, None)
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else is waiting
+            future.exception()
+            raise
+        future.set_result(result)
+        return result, True
+
+    @staticmethod
+    async def _combine_exit_stacks(
+        exit_stacks: list[AsyncExitStack | None],
+    ) -> AsyncExitStack | None:
+        """Merge exit stacks into one, or None when there is nothing to close."""
+        exit_stacks = [exit_stack for exit_stack in exit_stacks if exit_stack]
+        if not exit_stacks:
+            return None
+
+        combined_exit_stack = AsyncExitStack()
+        for exit_stack in exit_stacks:
+            await combined_exit_stack.enter_async_context(exit_stack)
+        return combined_exit_stack
+
+    async def _gather_builds(
+        self, builds: list[Callable[[], Awaitable[tuple[Any, AsyncExitStack | None]]]]
+    ) -> list[tuple[Any, AsyncExitStack | None]]:
+        """
+        Run builds that return (result, exit_stack), keeping their order.
+
+        Builds run concurrently when MCP sessions come from the connection pool.
+        Unpooled sessions must be closed by the task that opened them, so the
+        builds then run one after another. On failure, the exit stacks of the
+        builds that succeeded are closed before the error is raised.
+        """
+        if settings.MCP_POOL_ENABLED:
+            outcomes = await asyncio.gather(*(build() for build in builds), return_exceptions=True)
+        else:
+            outcomes = []
+            for build in builds:
+                try:
+                    outcomes.append(await build())
+                except Exception as e:
+                    outcomes.append(e)
+                    break
 
-    async def _agent_tools_builder(self, agent) -> list[AgentTool]:
+        errors = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+        if errors:
+            for outcome in outcomes:
+                if not isinstance(outcome, BaseException) and outcome[1]:
+                    await outcome[1].aclose()
+            raise errors[0]
+
+        return outcomes
+
+    async def _agent_tools_builder(self, agent) -> tuple[list[AgentTool], AsyncExitStack | None]:
         """Build the tools for an agent."""
         agent_tools_ids = agent.config.get("agent_tools")
-        agent_tools = []
-        if agent_tools_ids and isinstance(agent_tools_ids, list):
-            for agent_tool_id in agent_tools_ids:
-                sub_agent = get_agent(self.db, agent_tool_id)
-                llm_agent, _ = await self.build_llm_agent(sub_agent)
-                if llm_agent:
-                    agent_tools.append(AgentTool(agent=llm_agent))
-        return agent_tools
+        if not agent_tools_ids or not isinstance(agent_tools_ids, list):
+            return [], None
+
+        async def build_agent_tool(agent_tool_id):
+            async def build():
+                return await self.build_llm_agent(self._load_agent(agent_tool_id))
+
+            # AgentTool does not take ownership of the agent, so it can be shared
+            (llm_agent, exit_stack), built = await self._memoized(
+                self._agent_tool_builds, str(agent_tool_id), build
+            )
+            return llm_agent, exit_stack if built else None
+
+        results = await self._gather_builds(
+            [functools.partial(build_agent_tool, agent_tool_id) for agent_tool_id in agent_tools_ids]
+        )
+        agent_tools = [AgentTool(agent=llm_agent) for llm_agent, _ in results if llm_agent]
+        return agent_tools, await self._combine_exit_stacks([stack for _, stack in results])
+
+    async def _build_agent_tools(self, agent) -> tuple[list[Any], AsyncExitStack | None]:
+        """Build the custom, MCP and agent tools of an agent."""
+
+        async def build_mcp_tools():
+            if agent.config.get("mcp_servers") or agent.config.get("custom_mcp_servers"):
+                # A service per call, build_tools keeps its results on the instance
+                return await MCPService(self.agent_graph.mcp_servers).build_tools(
+                    agent.config, self.db
+                )
+            return [], None
+
+        custom_tools = self.custom_tool_builder.build_tools(agent.config)
+        (mcp_tools, mcp_exit_stack), (agent_tools, agent_tools_exit_stack) = (
+            await self._gather_builds([build_mcp_tools, functools.partial(self._agent_tools_builder, agent)])
+        )
+
+        exit_stack = await self._combine_exit_stacks([mcp_exit_stack, agent_tools_exit_stack])
+        return custom_tools + mcp_tools + agent_tools, exit_stack
 
     async def _create_llm_agent(
         self, agent, enabled_tools: list[str] = []
     ) -> tuple[LlmAgent, AsyncExitStack | None]:
         """Create an LLM agent from the agent data."""
-        # Get custom tools from the configuration
-        custom_tools = []
-        custom_tools = self.custom_tool_builder.build_tools(agent.config)
-
-        # Get MCP tools from the configuration
-        mcp_tools = []
-        mcp_exit_stack = None
-        if agent.config.get("mcp_servers") or agent.config.get("custom_mcp_servers"):
-            mcp_tools, mcp_exit_stack = await self.mcp_service.build_tools(agent.config, self.db)
-
-        # Get agent tools
-        agent_tools = await self._agent_tools_builder(agent)
-
-        # Combine all tools
-        all_tools = custom_tools + mcp_tools + agent_tools
+        # Tools are built once per agent, later references reuse them
+        (all_tools, mcp_exit_stack), built = await self._memoized(
+            self._tool_builds, str(agent.id), functools.partial(self._build_agent_tools, agent)
+        )
+        all_tools = list(all_tools)
+        if not built:
+            mcp_exit_stack = None
 
         if enabled_tools:
             all_tools = [tool for tool in all_tools if tool.name in enabled_tools]
             logger.info(f"Enabled tools enabled. Total tools: {len(all_tools)}")
 
-        now = datetime.now()
-        current_datetime = now.strftime("%d/%m/%Y %H:%M")
-        current_day_of_week = now.strftime("%A")
-        current_date_iso = now.strftime("%Y-%m-%d")
-        current_time = now.strftime("%H:%M")
+        # Check if load_memory is enabled
+        use_memory = bool(agent.config.get("load_memory"))
+        if use_memory:
+            all_tools.append(load_memory)
 
-        # Substitute variables in the prompt
+        # The prompt is rendered on every run so that date placeholders stay
+        # current even when the built agent is served from the cache
         instruction = agent.instruction or ""
-        formatted_prompt = instruction.format(
-            current_datetime=current_datetime,
-            current_day_of_week=current_day_of_week,
-            current_date_iso=current_date_iso,
-            current_time=current_time,
-        )
-
-        # add role on beginning of the prompt
-        if agent.role:
-            formatted_prompt = f"<agent_role>{agent.role}</agent_role>\n\n{formatted_prompt}"
+        role = agent.role
+        goal = agent.goal
 
-        # add goal on beginning of the prompt
-        if agent.goal:
-            formatted_prompt = f"<agent_goal>{agent.goal}</agent_goal>\n\n{formatted_prompt}"
+        def instruction_provider(_context=None) -> str:
+            return _render_instruction(instruction, role, goal, use_memory)
 
-        # Check if load_memory is enabled
-        if agent.config.get("load_memory"):
-            all_tools.append(load_memory)
-            formatted_prompt = (
-                formatted_prompt
-                + "\n\n<memory_instructions>ALWAYS use the load_memory tool to retrieve knowledge for your context</memory_instructions>\n\n"
-            )
+        # Render once now so that invalid prompts fail at build time
+        instruction_provider()
 
         # Get API key from api_key_id
         api_key = None
 
         # Get API key from api_key_id
         if hasattr(agent, "api_key_id") and agent.api_key_id:
-            decrypted_key = get_decrypted_api_key(self.db, agent.api_key_id)
+            decrypted_key = get_decrypted_api_key(
+                self.db, agent.api_key_id, self.agent_graph.api_keys.get(str(agent.api_key_id))
+            )
             if decrypted_key:
                 logger.debug(f"Using stored API key for agent {agent.name}")
                 api_key = decrypted_key
@@ -124,7 +345,9 @@ class AgentBuilder:
 
                 if is_valid_uuid:
                     # It IS a UUID, so it MUST exist in DB
-                    decrypted_key = get_decrypted_api_key(self.db, key_id)
+                    decrypted_key = get_decrypted_api_key(
+                        self.db, key_id, self.agent_graph.api_keys.get(str(key_id))
+                    )
                     if decrypted_key:
                         logger.debug("Config API key is a valid reference")
                         api_key = decrypted_key
@@ -160,48 +383,48 @@ class AgentBuilder:
             LlmAgent(
                 name=agent.name,
                 model=LiteLlm(model=agent.model, api_key=api_key),
-                instruction=formatted_prompt,
+                instruction=instruction_provider,
                 description=agent.description,
                 tools=all_tools,
             ),
             mcp_exit_stack,
         )
 
-    async def _get_sub_agents(
-        self, sub_agent_ids: list[str]
-    ) -> list[tuple[LlmAgent, AsyncExitStack | None]]:
-        """Get and create LLM sub-agents."""
-        sub_agents = []
-        for sub_agent_id in sub_agent_ids:
-            sub_agent_id_str = str(sub_agent_id)
-
-            agent = get_agent(self.db, sub_agent_id_str)
+    async def _build_sub_agent(self, sub_agent_id) -> tuple[BaseAgent, AsyncExitStack | None]:
+        """Create a single sub-agent of any type."""
+        agent = self._load_agent(sub_agent_id)
+
+        logger.debug(f"Sub-agent found: {agent.name} (type: {agent.type})")
+
+        if agent.type == "llm":
+            sub_agent, exit_stack = await self._create_llm_agent(agent)
+        elif agent.type == "a2a":
+            sub_agent, exit_stack = await self.build_a2a_agent(agent)
+        elif agent.type == "workflow":
+            sub_agent, exit_stack = await self.build_workflow_agent(agent)
+        elif agent.type == "task":
+            sub_agent, exit_stack = await self.build_task_agent(agent)
+        elif agent.type == "sequential":
+            sub_agent, exit_stack = await self.build_composite_agent(agent)
+        elif agent.type == "parallel":
+            sub_agent, exit_stack = await self.build_composite_agent(agent)
+        elif agent.type == "loop":
+            sub_agent, exit_stack = await self.build_composite_agent(agent)
+        else:
+            raise ValueError(f"Invalid agent type: {agent.type}")
 
-            if agent is None:
-                logger.error(f"Sub-agent not found: {sub_agent_id_str}")
-                raise AgentNotFoundError(f"Agent with ID {sub_agent_id_str} not found")
-
-            logger.debug(f"Sub-agent found: {agent.name} (type: {agent.type})")
-
-            if agent.type == "llm":
-                sub_agent, exit_stack = await self._create_llm_agent(agent)
-            elif agent.type == "a2a":
-                sub_agent, exit_stack = await self.build_a2a_agent(agent)
-            elif agent.type == "workflow":
-                sub_agent, exit_stack = await self.build_workflow_agent(agent)
-            elif agent.type == "task":
-                sub_agent, exit_stack = await self.build_task_agent(agent)
-            elif agent.type == "sequential":
-                sub_agent, exit_stack = await self.build_composite_agent(agent)
-            elif agent.type == "parallel":
-                sub_agent, exit_stack = await self.build_composite_agent(agent)
-            elif agent.type == "loop":
-                sub_agent, exit_stack = await self.build_composite_agent(agent)
-            else:
-                raise ValueError(f"Invalid agent type: {agent.type}")
+        logger.debug(f"Sub-agent added: {agent.name}")
+        return sub_agent, exit_stack
 
-            sub_agents.append((sub_agent, exit_stack))
-            logger.debug(f"Sub-agent added: {agent.name}")
+    async def _get_sub_agents(
+        self, sub_agent_ids: list[str]
+    ) -> list[tuple[BaseAgent, AsyncExitStack | None]]:
+        """Get and create sub-agents concurrently."""
+        # Every reference gets its own instance since an ADK agent can only have
+        # one parent; the expensive tool builds are memoized per agent instead
+        sub_agents = await self._gather_builds(
+            [functools.partial(self._build_sub_agent, sub_agent_id) for sub_agent_id in sub_agent_ids]
+        )
 
         logger.debug(f"Sub-agents created: {len(sub_agents)}")
         logger.debug(f"Sub-agents: {str(sub_agents)}")
@@ -214,16 +437,53 @@ class AgentBuilder:
         """Build an LLM agent with its sub-agents."""
         logger.debug("Creating LLM agent")
 
-        sub_agents = []
-        if root_agent.config.get("sub_agents"):
-            sub_agents_with_stacks = await self._get_sub_agents(root_agent.config.get("sub_agents"))
+        async def build_sub_agents():
+            sub_agents_with_stacks = await self._get_sub_agents(
+                root_agent.config.get("sub_agents") or []
+            )
             sub_agents = [agent for agent, _ in sub_agents_with_stacks]
+            return sub_agents, await self._combine_exit_stacks(
+                [stack for _, stack in sub_agents_with_stacks]
+            )
 
-        root_llm_agent, exit_stack = await self._create_llm_agent(root_agent, enabled_tools)
+        (sub_agents, sub_agents_exit_stack), (root_llm_agent, exit_stack) = (
+            await self._gather_builds(
+                [
+                    build_sub_agents,
+                    functools.partial(self._create_llm_agent, root_agent, enabled_tools),
+                ]
+            )
+        )
         if sub_agents:
             root_llm_agent.sub_agents = sub_agents
 
-        return root_llm_agent, exit_stack
+        return root_llm_agent, await self._combine_exit_stacks([exit_stack, sub_agents_exit_stack])
+
+    def _local_a2a_agent_id(self, root_agent) -> str | None:
+        """
+        Return the id of the agent an a2a agent calls when it is served by this deployment.
+
+        Only agents of the same client are called in process, as the API key
+        check of the A2A endpoint is skipped.
+        """
+        api_url = settings.API_URL.rstrip("/")
+        agent_card_url = root_agent.agent_card_url
+        if not settings.A2A_LOCAL_FAST_PATH_ENABLED or not api_url:
+            return None
+        if not agent_card_url.startswith(f"{api_url}/"):
+            return None
+
+        match = LOCAL_A2A_PATH.match(agent_card_url[len(api_url) :])
+        if not match or match.group(1).lower() == str(root_agent.id).lower():
+            return None
+
+        try:
+            target = self._load_agent(match.group(1))
+        except AgentNotFoundError:
+            return None
+        if str(target.client_id) != str(root_agent.client_id):
+            return None
+        return str(target.id)
 
     async def build_a2a_agent(self, root_agent) -> tuple[BaseAgent, AsyncExitStack | None]:
         """Build an A2A agent with its sub-agents."""
@@ -234,11 +494,15 @@ class AgentBuilder:
 
         try:
             sub_agents = []
+            sub_agents_exit_stack = None
             if root_agent.config.get("sub_agents"):
                 sub_agents_with_stacks = await self._get_sub_agents(
                     root_agent.config.get("sub_agents")
                 )
                 sub_agents = [agent for agent, _ in sub_agents_with_stacks]
+                sub_agents_exit_stack = await self._combine_exit_stacks(
+                    [stack for _, stack in sub_agents_with_stacks]
+                )
 
             config = root_agent.config or {}
             timeout = config.get("timeout", 300)
@@ -249,13 +513,14 @@ class AgentBuilder:
                 timeout=timeout,
                 description=root_agent.description or f"A2A Agent for {root_agent.name}",
                 sub_agents=sub_agents,
+                local_agent_id=self._local_a2a_agent_id(root_agent),
             )
 
             logger.debug(
                 f"A2A agent created successfully: {root_agent.name} ({root_agent.agent_card_url})"
             )
 
-            return a2a_agent, None
+            return a2a_agent, sub_agents_exit_stack
 
         except Exception as e:
             logger.error(f"Error building A2A agent: {str(e)}")
@@ -274,11 +539,15 @@ class AgentBuilder:
 
         try:
             sub_agents = []
+            sub_agents_exit_stack = None
             if root_agent.config.get("sub_agents"):
                 sub_agents_with_stacks = await self._get_sub_agents(
                     root_agent.config.get("sub_agents")
                 )
                 sub_agents = [agent for agent, _ in sub_agents_with_stacks]
+                sub_agents_exit_stack = await self._combine_exit_stacks(
+                    [stack for _, stack in sub_agents_with_stacks]
+                )
 
             config = root_agent.config or {}
             timeout = config.get("timeout", 300)
@@ -290,11 +559,13 @@ class AgentBuilder:
                 description=root_agent.description or f"Workflow Agent for {root_agent.name}",
                 sub_agents=sub_agents,
                 db=self.db,
+                agent_graph=self.agent_graph,
+                agent_id=str(root_agent.id),
             )
 
             logger.debug(f"Workflow agent created successfully: {root_agent.name}")
 
-            return workflow_agent, None
+            return workflow_agent, sub_agents_exit_stack
 
         except Exception as e:
             logger.error(f"Error building Workflow agent: {str(e)}")
@@ -312,11 +583,15 @@ class AgentBuilder:
         try:
             # Get sub-agents if there are any
             sub_agents = []
+            sub_agents_exit_stack = None
             if root_agent.config.get("sub_agents"):
                 sub_agents_with_stacks = await self._get_sub_agents(
                     root_agent.config.get("sub_agents")
                 )
                 sub_agents = [agent for agent, _ in sub_agents_with_stacks]
+                sub_agents_exit_stack = await self._combine_exit_stacks(
+                    [stack for _, stack in sub_agents_with_stacks]
+                )
 
             # Additional configurations
             config = root_agent.config or {}
@@ -329,20 +604,27 @@ class AgentBuilder:
                     description=task_config.get("description", ""),
                     expected_output=task_config.get("expected_output", ""),
                     enabled_tools=task_config.get("enabled_tools", []),
+                    id=task_config.get("id"),
+                    depends_on=task_config.get("depends_on"),
                 )
                 tasks.append(task)
 
+            # Fails on unknown or cyclic dependencies
+            resolve_task_dependencies(tasks)
+
             # Create the Task agent
             task_agent = TaskAgent(
                 name=root_agent.name,
                 tasks=tasks,
                 db=self.db,
                 sub_agents=sub_agents,
+                agent_graph=self.agent_graph,
+                max_concurrency=config.get("max_concurrency"),
             )
 
             logger.debug(f"Task agent created successfully: {root_agent.name}")
 
-            return task_agent, None
+            return task_agent, sub_agents_exit_stack
 
         except Exception as e:
             logger.error(f"Error building Task agent: {str(e)}")
@@ -422,6 +704,9 @@ class AgentBuilder:
         AsyncExitStack | None,
     ]:
         """Build the appropriate agent based on the type of the root agent."""
+        self._preload_agent_graph(root_agent)
+        self._check_agent_cycles(root_agent)
+
         if root_agent.type == "llm":
             return await self.build_llm_agent(root_agent, enabled_tools)
         elif root_agent.type == "a2a":
@@ -432,3 +717,102 @@ class AgentBuilder:
             return await self.build_task_agent(root_agent)
         else:
             return await self.build_composite_agent(root_agent)
+
+    def _collect_agent_tree(self, root_agent) -> tuple[dict[str, str], set[str], bool]:
+        """
+        Walk every agent reachable from the root agent.
+
+        Returns the version of each agent in the tree, the stored API keys it
+        uses and whether the built tree can be shared between runs.
+        """
+        versions = {}
+        api_key_ids = set()
+        pending = [root_agent]
+
+        while pending:
+            agent = pending.pop()
+            agent_id = str(agent.id)
+            if agent_id in versions:
+                continue
+
+            if agent.type in NON_CACHEABLE_AGENT_TYPES:
+                return versions, api_key_ids, False
+
+            # Without the pool, MCP tools own connections tied to a single run
+            config = agent.config or {}
+            if not settings.MCP_POOL_ENABLED and (
+                config.get("mcp_servers") or config.get("custom_mcp_servers")
+            ):
+                return versions, api_key_ids, False
+
+            version = agent.updated_at or agent.created_at
+            versions[agent_id] = version.isoformat() if version else ""
+
+            api_key_id = _stored_api_key_id(agent)
+            if api_key_id:
+                api_key_ids.add(api_key_id)
+
+            for child_id in _referenced_agent_ids(agent):
+                if child_id in versions:
+                    continue
+                pending.append(self._load_agent(child_id))
+
+        return versions, api_key_ids, True
+
+    def _referenced_row_versions(
+        self, versions: dict[str, str], api_key_ids: set[str]
+    ) -> dict[str, str]:
+        """
+        Return the version of every API key and MCP server used by the tree.
+
+        They are part of the cache key, so rotating or revoking a key, or
+        editing a server, is seen by every worker without an invalidation.
+        """
+        row_versions = {
+            f"api_key:{key_id}": _row_version(self.agent_graph.api_keys.get(key_id))
+            for key_id in api_key_ids
+        }
+        for agent_id in versions:
+            config = self._load_agent(agent_id).config or {}
+            for server in config.get("mcp_servers") or []:
+                server_id = server.get("id") if isinstance(server, dict) else None
+                if server_id:
+                    row_versions[f"mcp_server:{server_id}"] = _row_version(
+                        self.agent_graph.mcp_servers.get(str(server_id))
+                    )
+        return row_versions
+
+    async def build_cached_agent(
+        self, root_agent, enabled_tools: list[str] | None = None
+    ) -> tuple[
+        BaseAgent,
+        AsyncExitStack | None,
+    ]:
+        """
+        Build the agent tree, reusing a previously built tree when possible.
+
+        Trees that hold per-run resources (unpooled MCP connections, database
+        sessions) are always built from scratch and returned with their exit
+        stack. Pooled MCP tools lease a session on every call, so they can be
+        shared.
+        """
+        if not settings.AGENT_CACHE_ENABLED:
+            return await self.build_agent(root_agent, enabled_tools)
+
+        self._preload_agent_graph(root_agent)
+        versions, api_key_ids, cacheable = self._collect_agent_tree(root_agent)
+        if not cacheable:
+            return await self.build_agent(root_agent, enabled_tools)
+
+        async def build():
+            agent, exit_stack = await self.build_agent(root_agent, enabled_tools)
+            if exit_stack:
+                await exit_stack.aclose()
+            return agent
+
+        row_versions = self._referenced_row_versions(versions, api_key_ids)
+        key = built_agent_cache.make_key(
+            root_agent.id, {**versions, **row_versions}, enabled_tools
+        )
+        agent = await built_agent_cache.get_or_build(key, versions.keys(), build, api_key_ids)
+        return agent, None
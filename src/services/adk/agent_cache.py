@@ -0,0 +1,156 @@
+"""
+Process-level cache of built ADK agent trees.
+
+Entries are keyed by the root agent id plus the ``updated_at`` of every agent
+reachable from it and of the API keys and MCP servers they use, so any edit to
+a member of the tree produces a new key.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    agent: Any
+    agent_ids: frozenset[str]
+    api_key_ids: frozenset[str] = field(default_factory=frozenset)
+    expires_at: float = 0.0
+
+
+class BuiltAgentCache:
+    """LRU/TTL cache of built agent trees with single-flight builds."""
+
+    def __init__(self, max_entries: int = 128, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        root_agent_id: uuid.UUID | str,
+        versions: dict[str, Any],
+        enabled_tools: Iterable[str] | None = None,
+    ) -> str:
+        """Build a cache key from the root id, the tree versions and the enabled tools."""
+        signature = ",".join(f"{agent_id}@{versions[agent_id]}" for agent_id in sorted(versions))
+        tools = ",".join(sorted(enabled_tools or []))
+        return f"{root_agent_id}|{signature}|{tools}"
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached agent for a key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry.expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry.agent
+
+    def put(
+        self,
+        key: str,
+        agent: Any,
+        agent_ids: Iterable[str],
+        api_key_ids: Iterable[str] = (),
+    ) -> None:
+        """Store a built agent tree, evicting the least recently used entries."""
+        self._entries[key] = _CacheEntry(
+            agent=agent,
+            agent_ids=frozenset(str(agent_id) for agent_id in agent_ids),
+            api_key_ids=frozenset(str(key_id) for key_id in api_key_ids),
+            expires_at=time.monotonic() + self.ttl,
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            logger.debug(f"Evicted built agent from cache: {evicted_key.split('|')[0]}")
+
+    async def get_or_build(
+        self,
+        key: str,
+        agent_ids: Iterable[str],
+        build: Callable[[], Awaitable[Any]],
+        api_key_ids: Iterable[str] = (),
+    ) -> Any:
+        """
+        Return the cached agent for a key, building it at most once.
+
+        Concurrent callers asking for the same key wait for the first build
+        instead of starting their own.
+        """
+        agent = self.get(key)
+        if agent is not None:
+            self.hits += 1
+            return agent
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            agent = await build()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else is waiting
+            future.exception()
+            raise
+        else:
+            self.put(key, agent, agent_ids, api_key_ids)
+            future.set_result(agent)
+            return agent
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, agent_id: uuid.UUID | str) -> int:
+        """Drop every cached tree that contains the given agent."""
+        agent_id = str(agent_id)
+        keys = [key for key, entry in self._entries.items() if agent_id in entry.agent_ids]
+        for key in keys:
+            self._entries.pop(key, None)
+        if keys:
+            logger.debug(f"Invalidated {len(keys)} cached agent trees for agent {agent_id}")
+        return len(keys)
+
+    def invalidate_api_key(self, key_id: uuid.UUID | str) -> int:
+        """Drop every cached tree built with the given stored API key."""
+        key_id = str(key_id)
+        keys = [key for key, entry in self._entries.items() if key_id in entry.api_key_ids]
+        for key in keys:
+            self._entries.pop(key, None)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all cached trees."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return cache counters."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+built_agent_cache = BuiltAgentCache(
+    max_entries=settings.AGENT_CACHE_MAX_ENTRIES,
+    ttl=settings.AGENT_CACHE_TTL,
+)
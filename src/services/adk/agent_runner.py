@@ -1,9 +1,12 @@
 import asyncio
 import base64
 import json
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 
+from google.adk.agents.invocation_context import InvocationContext, new_invocation_context_id
+from google.adk.agents.run_config import RunConfig
 from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
+from google.adk.events import Event
 from google.adk.memory import InMemoryMemoryService
 from google.adk.runners import Runner
 from google.adk.sessions import DatabaseSessionService
@@ -11,8 +14,14 @@ from google.genai.types import Blob, Content, Part
 from opentelemetry import trace
 from sqlalchemy.orm import Session
 
-from src.core.exceptions import AgentNotFoundError, InternalServerError
+from src.core.exceptions import (
+    AgentNotFoundError,
+    InternalServerError,
+    InvalidRequestError,
+    ResourceNotFoundError,
+)
 from src.services.adk.agent_builder import AgentBuilder
+from src.services.adk.custom_agents.workflow_agent import WorkflowAgent, WorkflowResumeError
 from src.services.agent_service import get_agent
 from src.utils.logger import setup_logger
 from src.utils.otel import get_tracer
@@ -59,7 +68,7 @@ async def run_agent(
 
             # Using the AgentBuilder to create the agent
             agent_builder = AgentBuilder(db)
-            root_agent, exit_stack = await agent_builder.build_agent(get_root_agent)
+            root_agent, exit_stack = await agent_builder.build_cached_agent(get_root_agent)
 
             logger.debug("Configuring Runner")
             agent_runner = Runner(
@@ -260,6 +269,96 @@ def convert_sets(obj):
         return obj
 
 
+async def run_workflow_events(
+    workflow_agent: WorkflowAgent,
+    session,
+    session_service: DatabaseSessionService,
+    artifacts_service: InMemoryArtifactService,
+    memory_service: InMemoryMemoryService,
+    run: Callable[[InvocationContext], AsyncGenerator[Event, None]],
+) -> list[Event]:
+    """
+    Run part of a workflow outside of a Runner, e.g. when resuming it.
+
+    There is no new user message, so the invocation context is created here
+    and the events are appended to the session as the Runner would do.
+    """
+    ctx = InvocationContext(
+        artifact_service=artifacts_service,
+        session_service=session_service,
+        memory_service=memory_service,
+        invocation_id=new_invocation_context_id(),
+        agent=workflow_agent,
+        session=session,
+        run_config=RunConfig(),
+    )
+
+    events = []
+    async for event in run(ctx):
+        if not event.partial:
+            session_service.append_event(session=session, event=event)
+        events.append(event)
+    return events
+
+
+async def resume_workflow(
+    agent_id: str,
+    external_id: str,
+    invocation_id: str,
+    session_service: DatabaseSessionService,
+    artifacts_service: InMemoryArtifactService,
+    memory_service: InMemoryMemoryService,
+    db: Session,
+):
+    """Resume a failed or interrupted workflow run from its last completed node."""
+    agent = get_agent(db, agent_id)
+    if agent is None:
+        raise AgentNotFoundError(agent_id)
+    if agent.type != "workflow":
+        raise InvalidRequestError("Only workflow agents can be resumed")
+
+    adk_session_id = f"{external_id}_{agent_id}"
+    session = session_service.get_session(
+        app_name=agent_id,
+        user_id=external_id,
+        session_id=adk_session_id,
+    )
+    if session is None:
+        raise ResourceNotFoundError("Session", adk_session_id)
+
+    workflow_agent, exit_stack = await AgentBuilder(db).build_agent(agent)
+    try:
+        logger.info(f"Resuming invocation {invocation_id} of workflow {agent_id}")
+        events = await run_workflow_events(
+            workflow_agent,
+            session,
+            session_service,
+            artifacts_service,
+            memory_service,
+            lambda ctx: workflow_agent.resume_from_checkpoint(ctx, invocation_id),
+        )
+    except WorkflowResumeError as e:
+        raise InvalidRequestError(str(e)) from e
+    finally:
+        if exit_stack:
+            await exit_stack.aclose()
+
+    message_history = [
+        convert_sets(event.model_dump())
+        for event in events
+        if event.content and event.content.parts
+    ]
+    texts = [
+        event.content.parts[0].text
+        for event in events
+        if event.content and event.content.parts and event.content.parts[0].text
+    ]
+    return {
+        "final_response": texts[-1] if texts else "Finished without specific response",
+        "message_history": message_history,
+    }
+
+
 class EventAggregator:
     """
     Aggregates streaming events to prevent token-by-token flooding.
@@ -388,7 +487,7 @@ async def run_agent_stream(
 
                 # Using the AgentBuilder to create the agent
                 agent_builder = AgentBuilder(db)
-                root_agent, exit_stack = await agent_builder.build_agent(get_root_agent)
+                root_agent, exit_stack = await agent_builder.build_cached_agent(get_root_agent)
 
                 logger.debug("Configuring Runner")
                 agent_runner = Runner(
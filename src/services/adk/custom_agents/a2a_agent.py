@@ -1,20 +1,28 @@
+import asyncio
 import os
 from collections.abc import AsyncGenerator
+from contextvars import ContextVar
 from uuid import uuid4
 
 from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event
+from google.adk.runners import Runner
 from google.genai.types import Content, Part
 
 from src.schemas.a2a_types import AgentCard
+from src.services.adk.a2a_card_cache import agent_card_cache
 from src.utils.a2a_enhanced_client import (
     A2AClientConfig,
     A2AImplementation,
     A2AResponse,
     EnhancedA2AClient,
+    get_a2a_client,
 )
 
+# Agents of this deployment in the current chain of in-process A2A calls
+_local_call_chain: ContextVar[tuple[str, ...]] = ContextVar("local_a2a_call_chain", default=())
+
 
 class A2ACustomAgent(BaseAgent):
     """
@@ -31,6 +39,8 @@ class A2ACustomAgent(BaseAgent):
     base_url: str
     api_key: str | None
     preferred_implementation: A2AImplementation
+    # Id of the target agent when it is served by this deployment
+    local_agent_id: str | None = None
 
     def __init__(
         self,
@@ -40,6 +50,7 @@ class A2ACustomAgent(BaseAgent):
         api_key: str | None = None,
         preferred_implementation: A2AImplementation = A2AImplementation.AUTO,
         sub_agents: list[BaseAgent] = [],
+        local_agent_id: str | None = None,
         **kwargs,
     ):
         """
@@ -52,6 +63,7 @@ class A2ACustomAgent(BaseAgent):
             api_key: API key for authentication (if None, will try to get from env)
             preferred_implementation: Preferred A2A implementation (auto, custom, sdk)
             sub_agents: List of sub-agents to be executed after the A2A agent
+            local_agent_id: Target agent of this deployment, called in process instead of over HTTP
         """
         # Extract base_url from agent_card_url
         base_url = agent_card_url
@@ -85,54 +97,20 @@ class A2ACustomAgent(BaseAgent):
             api_key=api_key,
             preferred_implementation=preferred_implementation,
             sub_agents=sub_agents,
+            local_agent_id=local_agent_id,
             **kwargs,
         )
 
     async def fetch_agent_card(self) -> AgentCard:
-        """Fetch the agent card using the enhanced client."""
+        """Fetch the agent card, through the cache shared by every worker."""
         if self.agent_card:
             return self.agent_card
 
         print(f"Fetching agent card from: {self.agent_card_url}")
 
-        try:
-            # Extract agent ID from URL
-            agent_id = self._extract_agent_id_from_url(self.agent_card_url)
-
-            # Create enhanced client
-            config = A2AClientConfig(
-                base_url=self.base_url,
-                api_key=self.api_key or "default-key",
-                implementation=self.preferred_implementation,
-                timeout=self.timeout,
-            )
-
-            async with EnhancedA2AClient(config) as client:
-                response = await client.get_agent_card(agent_id)
-
-                if response.success:
-                    print(
-                        f"Agent card fetched using {response.implementation_used.value} implementation"
-                    )
-                    self.agent_card = AgentCard(**response.data)
-                    return self.agent_card
-                else:
-                    raise ValueError(f"Failed to fetch agent card: {response.error}")
-
-        except Exception as e:
-            print(f"Error fetching agent card: {e}")
-            # Fallback to basic agent card
-            self.agent_card = AgentCard(
-                name="A2A Agent",
-                description="External A2A Agent",
-                url=self.agent_card_url,
-                version="1.0.0",
-                capabilities={"streaming": True},
-                defaultInputModes=["text"],
-                defaultOutputModes=["text"],
-                skills=[],
-            )
-            return self.agent_card
+        card = await agent_card_cache.get(self.agent_card_url, api_key=self.api_key)
+        self.agent_card = AgentCard(**card)
+        return self.agent_card
 
     def _extract_agent_id_from_url(self, url: str) -> str:
         """Extract agent ID from the agent card URL."""
@@ -191,6 +169,16 @@ class A2ACustomAgent(BaseAgent):
         """
 
         try:
+            # Agents of this deployment skip the HTTP round trip
+            if self.local_agent_id:
+                async for event in self._run_local_agent(ctx):
+                    yield event
+
+                for sub_agent in self.sub_agents:
+                    async for event in sub_agent.run_async(ctx):
+                        yield event
+                return
+
             # 1. Fetch the agent card if we haven't already
             try:
                 agent_card = await self.fetch_agent_card()
@@ -229,7 +217,7 @@ class A2ACustomAgent(BaseAgent):
             print(f"Sending message to A2A agent {agent_id}: {user_message[:100]}...")
 
             # 4. Use enhanced client to communicate with the agent
-            async with EnhancedA2AClient(config) as client:
+            async with get_a2a_client(config) as client:
                 # Use session ID as a stable identifier
                 session_id = (
                     str(ctx.session.id)
@@ -270,6 +258,116 @@ class A2ACustomAgent(BaseAgent):
                 ),
             )
 
+    async def _run_local_agent(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        """
+        Run a target agent of this deployment in process, as its A2A endpoint would.
+
+        The target keeps its own session, keyed by the caller's session like an
+        A2A sessionId, and only the text of its final response is returned.
+        Calls that would re-enter an agent already in the chain are refused.
+        """
+        user_message = self._extract_user_message(ctx)
+        if not user_message:
+            yield Event(
+                author=self.name,
+                content=Content(role="agent", parts=[Part(text="No user message found")]),
+            )
+            return
+
+        app_name = self.local_agent_id
+        chain = (*_local_call_chain.get(), ctx.session.app_name)
+        if app_name in chain:
+            error_msg = f"A2A call cycle detected: agent {app_name} is already running in this chain"
+            print(error_msg)
+            yield Event(
+                author=self.name,
+                content=Content(role="agent", parts=[Part(text=error_msg)]),
+            )
+            return
+
+        print(f"Calling local A2A agent {app_name} in process: {user_message[:100]}...")
+        try:
+            final_text = await asyncio.wait_for(
+                self._call_local_agent(ctx, user_message, chain), timeout=self.timeout
+            )
+        except TimeoutError:
+            final_text = f"Local A2A agent {app_name} timed out after {self.timeout} seconds"
+            print(final_text)
+
+        yield Event(
+            author=self.name,
+            content=Content(role="agent", parts=[Part(text=final_text or "No response")]),
+        )
+
+    async def _call_local_agent(
+        self, ctx: InvocationContext, user_message: str, chain: tuple[str, ...]
+    ) -> str | None:
+        """Run the local target agent and return the text of its final response."""
+        # Imported here, the agent builder imports this module
+        from src.config.database import SessionLocal
+        from src.services.adk.agent_builder import AgentBuilder
+        from src.services.agent_service import get_agent
+
+        app_name = self.local_agent_id
+        external_id = str(ctx.session.id) if ctx.session else str(uuid4())
+        session_id = f"{external_id}_{app_name}"
+
+        token = _local_call_chain.set(chain)
+        db = SessionLocal()
+        exit_stack = None
+        try:
+            agent = get_agent(db, app_name)
+            if agent is None:
+                raise ValueError(f"Agent {app_name} not found")
+
+            root_agent, exit_stack = await AgentBuilder(db).build_cached_agent(agent)
+
+            session_service = ctx.session_service
+            if (
+                session_service.get_session(
+                    app_name=app_name, user_id=external_id, session_id=session_id
+                )
+                is None
+            ):
+                session_service.create_session(
+                    app_name=app_name, user_id=external_id, session_id=session_id
+                )
+
+            runner = Runner(
+                agent=root_agent,
+                app_name=app_name,
+                session_service=session_service,
+                artifact_service=ctx.artifact_service,
+                memory_service=ctx.memory_service,
+            )
+            # Like the A2A endpoint, only the last text response is returned
+            final_text = None
+            async for event in runner.run_async(
+                user_id=external_id,
+                session_id=session_id,
+                new_message=Content(role="user", parts=[Part(text=user_message)]),
+            ):
+                if event.content and event.content.parts:
+                    text = "".join(part.text for part in event.content.parts if part.text)
+                    if text:
+                        final_text = text
+
+            if ctx.memory_service:
+                ctx.memory_service.add_session_to_memory(
+                    session_service.get_session(
+                        app_name=app_name, user_id=external_id, session_id=session_id
+                    )
+                )
+            return final_text
+        finally:
+            _local_call_chain.reset(token)
+            if exit_stack:
+                try:
+                    await exit_stack.aclose()
+                except Exception as e:
+                    print(f"Error closing local A2A agent resources: {e}")
+            db.close()
+
     def _extract_user_message(self, ctx: InvocationContext) -> str | None:
         """Extract user message from the invocation context."""
         user_message = None
@@ -1,4 +1,6 @@
+import asyncio
 from collections.abc import AsyncGenerator
+from typing import Any
 
 from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
@@ -6,6 +8,7 @@ from google.adk.events import Event
 from google.genai.types import Content, Part
 from sqlalchemy.orm import Session
 
+from src.config.settings import settings
 from src.schemas.agent_config import AgentTask
 from src.services.agent_service import get_agent
 from src.utils.logger import setup_logger
@@ -13,6 +16,61 @@ from src.utils.logger import setup_logger
 logger = setup_logger(__name__)
 
 
+def task_reference(task: AgentTask, index: int) -> str:
+    """Return the id of a task, or its index when it has none."""
+    return task.id or str(index)
+
+
+def resolve_task_dependencies(tasks: list[AgentTask]) -> list[list[int]]:
+    """
+    Return the indexes of the tasks each task depends on.
+
+    A task without ``depends_on`` depends on the previous one, so tasks run in
+    order by default; an empty ``depends_on`` starts the task right away.
+    Dependencies are referenced by task id or index.
+    """
+    indexes = {task.id: index for index, task in enumerate(tasks) if task.id}
+
+    dependencies = []
+    for index, task in enumerate(tasks):
+        if task.depends_on is None:
+            dependencies.append([index - 1] if index else [])
+            continue
+
+        resolved = []
+        for reference in task.depends_on:
+            if isinstance(reference, str) and reference in indexes:
+                dependency = indexes[reference]
+            elif isinstance(reference, int) or str(reference).isdigit():
+                dependency = int(reference)
+            else:
+                raise ValueError(f"Task {index} depends on unknown task: {reference}")
+            if not 0 <= dependency < len(tasks) or dependency == index:
+                raise ValueError(f"Task {index} has an invalid dependency: {reference}")
+            if dependency not in resolved:
+                resolved.append(dependency)
+        dependencies.append(resolved)
+
+    # Every task must be reachable, otherwise the dependencies have a cycle
+    remaining = {index: set(depends_on) for index, depends_on in enumerate(dependencies)}
+    while remaining:
+        ready = [index for index, depends_on in remaining.items() if not depends_on]
+        if not ready:
+            raise ValueError(f"Task dependencies have a cycle between tasks {sorted(remaining)}")
+        for index in ready:
+            del remaining[index]
+        for depends_on in remaining.values():
+            depends_on.difference_update(ready)
+
+    return dependencies
+
+
+def _event_text(event: Event) -> str:
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(part.text for part in event.content.parts if part.text)
+
+
 class TaskAgent(BaseAgent):
     """
     Custom agent that implements the Task function.
@@ -23,6 +81,10 @@ class TaskAgent(BaseAgent):
     # Field declarations for Pydantic
     tasks: list[AgentTask]
     db: Session
+    # AgentGraph shared with the builder, typed loosely so it is not copied
+    agent_graph: Any = None
+    # Tasks with declared dependencies running at the same time
+    max_concurrency: int = settings.TASK_MAX_CONCURRENCY
 
     def __init__(
         self,
@@ -30,6 +92,8 @@ class TaskAgent(BaseAgent):
         tasks: list[AgentTask],
         db: Session,
         sub_agents: list[BaseAgent] = [],
+        agent_graph: Any = None,
+        max_concurrency: int | None = None,
         **kwargs,
     ):
         """
@@ -40,6 +104,8 @@ class TaskAgent(BaseAgent):
             tasks: List of tasks to be executed
             db: Database session
             sub_agents: List of sub-agents to be executed after the Task agent
+            agent_graph: Agents preloaded by the builder for the task agents
+            max_concurrency: Tasks running at the same time, when they declare dependencies
         """
         # Initialize base class
         super().__init__(
@@ -47,18 +113,28 @@ class TaskAgent(BaseAgent):
             tasks=tasks,
             db=db,
             sub_agents=sub_agents,
+            agent_graph=agent_graph,
+            max_concurrency=max_concurrency or settings.TASK_MAX_CONCURRENCY,
             **kwargs,
         )
 
+    def _get_task_agent(self, agent_id):
+        """Get a task's agent, from the preloaded graph when available."""
+        if self.agent_graph is not None:
+            agent = self.agent_graph.agents.get(str(agent_id))
+            if agent is not None:
+                return agent
+        return get_agent(self.db, agent_id)
+
     async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
         """
         Implementation of the Task agent.
 
         This method follows the pattern of implementing custom agents,
         sending the user's message to the Task service and monitoring the response.
+        Tasks run in order unless they declare ``depends_on``, then independent
+        tasks run at the same time, up to ``max_concurrency``.
         """
-        exit_stack = None
-
         try:
             # Extract the user's message from the context
             user_message = None
@@ -88,6 +164,15 @@ class TaskAgent(BaseAgent):
                 )
                 return
 
+            try:
+                dependencies = resolve_task_dependencies(self.tasks)
+            except ValueError as dependency_error:
+                yield Event(
+                    author=self.name,
+                    content=Content(role="agent", parts=[Part(text=str(dependency_error))]),
+                )
+                return
+
             # Start the agent status
             yield Event(
                 author=self.name,
@@ -97,89 +182,234 @@ class TaskAgent(BaseAgent):
                 ),
             )
 
+            # Final output of each completed task, passed to the tasks depending on it
+            outputs: dict[int, str] = {}
+
+            if all(task.depends_on is None for task in self.tasks):
+                for index in range(len(self.tasks)):
+                    async for event in self._run_task(
+                        ctx, index, user_message, dependencies[index], outputs
+                    ):
+                        yield event
+            else:
+                async for event in self._run_task_graph(
+                    ctx, user_message, dependencies, outputs
+                ):
+                    yield event
+
+        except Exception as e:
+            # Handle any uncaught error
+            logger.error(f"Error executing Task agent: {str(e)}")
+            yield Event(
+                author=self.name,
+                content=Content(
+                    role="agent",
+                    parts=[Part(text=f"Error interacting with Task agent: {str(e)}")],
+                ),
+            )
+        finally:
+            # Execute sub-agents only if no exception occurred
             try:
-                # Replace any {content} in the task descriptions with the user's input
-                task = self.tasks[0]
-                task.description = task.description.replace("{content}", user_message)
-                task.enabled_tools = task.enabled_tools or []
-
-                agent = get_agent(self.db, task.agent_id)
-
-                if not agent:
-                    yield Event(
-                        author=self.name,
-                        content=Content(parts=[Part(text="Agent not found")]),
-                    )
-                    return
-
-                # Prepare task instructions
-                task_message_instructions = f"""
+                if "e" not in locals():
+                    for sub_agent in self.sub_agents:
+                        async for event in sub_agent.run_async(ctx):
+                            yield event
+            except Exception as sub_e:
+                logger.error(f"Error executing sub-agents: {str(sub_e)}")
+                # We don't yield a new event here to avoid raising during cleanup
+
+    async def _run_task_graph(
+        self,
+        ctx: InvocationContext,
+        user_message: str,
+        dependencies: list[list[int]],
+        outputs: dict[int, str],
+    ) -> AsyncGenerator[Event, None]:
+        """
+        Runs every task once its dependencies are done, merging their events.
+
+        Each task runs on its own branch, so the agents of concurrent tasks do
+        not see each other's events; dependents receive the outputs instead.
+        A task waits until each of its events has been yielded, and so appended
+        to the session, before going on; its agent then finds the instructions
+        among the events of its branch.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        done = [asyncio.Event() for _ in self.tasks]
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def run(index: int):
+            try:
+                # Waiting tasks do not hold a concurrency slot
+                for dependency in dependencies[index]:
+                    await done[dependency].wait()
+
+                async with semaphore:
+                    branch = f"{ctx.branch}.{self.name}" if ctx.branch else self.name
+                    branch_ctx = ctx.model_copy(update={"branch": f"{branch}.task_{index}"})
+                    async for event in self._run_task(
+                        branch_ctx,
+                        index,
+                        user_message,
+                        dependencies[index],
+                        outputs,
+                        concurrent=True,
+                    ):
+                        delivered = asyncio.Event()
+                        await queue.put((event, delivered))
+                        await delivered.wait()
+            except Exception as e:
+                logger.error(f"Error running task {index}: {str(e)}")
+            finally:
+                done[index].set()
+                await queue.put(None)
+
+        runners = [asyncio.create_task(run(index)) for index in range(len(self.tasks))]
+        try:
+            finished = 0
+            while finished < len(runners):
+                item = await queue.get()
+                if item is None:
+                    finished += 1
+                    continue
+                event, delivered = item
+                try:
+                    yield event
+                finally:
+                    delivered.set()
+        finally:
+            for runner in runners:
+                runner.cancel()
+
+    async def _run_task(
+        self,
+        ctx: InvocationContext,
+        index: int,
+        user_message: str,
+        dependencies: list[int],
+        outputs: dict[int, str],
+        concurrent: bool = False,
+    ) -> AsyncGenerator[Event, None]:
+        """Runs a single task, storing its final output when it succeeds."""
+        task = self.tasks[index]
+        exit_stack = None
+
+        if any(dependency not in outputs for dependency in dependencies):
+            yield Event(
+                author=self.name,
+                branch=ctx.branch,
+                content=Content(
+                    role="agent",
+                    parts=[
+                        Part(
+                            text=f"Task {task_reference(task, index)} skipped, "
+                            "a task it depends on did not complete"
+                        )
+                    ],
+                ),
+            )
+            return
+
+        try:
+            agent = self._get_task_agent(task.agent_id)
+
+            if not agent:
+                yield Event(
+                    author=self.name,
+                    branch=ctx.branch,
+                    content=Content(parts=[Part(text="Agent not found")]),
+                )
+                return
+
+            # Replace any {content} in the task description with the user's input
+            description = task.description.replace("{content}", user_message)
+
+            # Outputs of the tasks this one depends on
+            previous_results = "".join(
+                f"""
+                    <result task="{task_reference(self.tasks[dependency], dependency)}">
+                        <expected_output>{self.tasks[dependency].expected_output}</expected_output>
+                        <output>{outputs[dependency]}</output>
+                    </result>"""
+                for dependency in dependencies
+            )
+            if previous_results:
+                previous_results = f"""
+                    <previous_results>{previous_results}
+                    </previous_results>"""
+
+            # Prepare task instructions
+            task_message_instructions = f"""
                 <task>
                     <instructions>
                         Execute the following task:
                     </instructions>
-                    <description>{task.description}</description>
-                    <expected_output>{task.expected_output}</expected_output>
+                    <description>{description}</description>
+                    <expected_output>{task.expected_output}</expected_output>{previous_results}
                 </task>
                 """
 
-                # Send task instructions as an event
-                yield Event(
-                    author=f"{self.name} - Task executor",
-                    content=Content(
-                        role="agent",
-                        parts=[Part(text=task_message_instructions)],
-                    ),
-                )
+            # Send task instructions as an event
+            yield Event(
+                author=f"{self.name} - Task executor",
+                branch=ctx.branch,
+                content=Content(
+                    role="agent",
+                    parts=[Part(text=task_message_instructions)],
+                ),
+            )
 
-                from src.services.adk.agent_builder import AgentBuilder
+            from src.services.adk.agent_builder import AgentBuilder
 
-                logger.debug(f"Building agent in Task agent: {agent.name}")
-                agent_builder = AgentBuilder(self.db)
-                root_agent, exit_stack = await agent_builder.build_agent(agent, task.enabled_tools)
+            logger.debug(f"Building agent in Task agent: {agent.name}")
+            agent_builder = AgentBuilder(self.db, self.agent_graph)
+            root_agent, exit_stack = await agent_builder.build_agent(
+                agent, task.enabled_tools or []
+            )
 
-                # Store task instructions in context for reference by sub-agents
+            # Store task instructions in context for reference by sub-agents. Tasks
+            # running at the same time share the session, so they only get the
+            # instructions through the event sent on their branch
+            if not concurrent:
                 ctx.session.state["task_instructions"] = task_message_instructions
 
-                # Process the agent responses
-                try:
-                    async for event in root_agent.run_async(ctx):
-                        yield event
-                except GeneratorExit:
-                    logger.warning("Generator was closed prematurely, handling cleanup...")
-                    # Allow the exception to propagate after cleanup
-                    raise
-                except Exception as e:
-                    error_msg = f"Error during agent execution: {str(e)}"
-                    logger.error(error_msg)
-                    yield Event(
-                        author=self.name,
-                        content=Content(
-                            role="agent",
-                            parts=[Part(text=error_msg)],
-                        ),
-                    )
-
+            # Process the agent responses
+            output = ""
+            try:
+                async for event in root_agent.run_async(ctx):
+                    text = _event_text(event)
+                    if text:
+                        output = text
+                    yield event
+            except GeneratorExit:
+                logger.warning("Generator was closed prematurely, handling cleanup...")
+                # Allow the exception to propagate after cleanup
+                raise
             except Exception as e:
-                error_msg = f"Error sending request: {str(e)}"
+                error_msg = f"Error during agent execution: {str(e)}"
                 logger.error(error_msg)
-                logger.error(f"Error type: {type(e).__name__}")
-                logger.error(f"Error details: {str(e)}")
-
                 yield Event(
                     author=self.name,
-                    content=Content(role="agent", parts=[Part(text=error_msg)]),
+                    branch=ctx.branch,
+                    content=Content(
+                        role="agent",
+                        parts=[Part(text=error_msg)],
+                    ),
                 )
+                return
+
+            outputs[index] = output
 
         except Exception as e:
-            # Handle any uncaught error
-            logger.error(f"Error executing Task agent: {str(e)}")
+            error_msg = f"Error sending request: {str(e)}"
+            logger.error(error_msg)
+            logger.error(f"Error type: {type(e).__name__}")
+            logger.error(f"Error details: {str(e)}")
+
             yield Event(
                 author=self.name,
-                content=Content(
-                    role="agent",
-                    parts=[Part(text=f"Error interacting with Task agent: {str(e)}")],
-                ),
+                branch=ctx.branch,
+                content=Content(role="agent", parts=[Part(text=error_msg)]),
             )
         finally:
             # Ensure we close the exit_stack in the same task context where it was created
@@ -189,13 +419,3 @@ class TaskAgent(BaseAgent):
                     logger.debug("Exit stack closed successfully")
                 except Exception as e:
                     logger.error(f"Error closing exit_stack: {str(e)}")
-
-            # Execute sub-agents only if no exception occurred
-            try:
-                if "e" not in locals():
-                    for sub_agent in self.sub_agents:
-                        async for event in sub_agent.run_async(ctx):
-                            yield event
-            except Exception as sub_e:
-                logger.error(f"Error executing sub-agents: {str(sub_e)}")
-                # We don't yield a new event here to avoid raising during cleanup
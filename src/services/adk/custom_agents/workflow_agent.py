@@ -1,30 +1,136 @@
+import asyncio
+import hashlib
+import json
+import time
 import uuid
 from collections.abc import AsyncGenerator
+from contextlib import AsyncExitStack
 from datetime import datetime
-from typing import Any, TypedDict
+from typing import Annotated, Any, TypedDict
 
 from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event
 from google.genai.types import Content, Part
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, StateGraph
 from sqlalchemy.orm import Session
 
+from src.config.settings import settings
+from src.services.adk.custom_agents.workflow_conditions import (
+    ConditionPredicate,
+    ConditionState,
+    compile_conditions,
+)
+from src.services.adk.workflow_checkpointer import (
+    get_workflow_checkpointer,
+    workflow_thread_id,
+)
+from src.services.adk.workflow_scheduler import workflow_delay_scheduler
 from src.services.agent_service import get_agent
 from src.utils.logger import setup_logger
+from src.utils.ttl_cache import TTLCache
 
 logger = setup_logger(__name__)
 
+# Compiled graphs keyed by a hash of flow_json, editing a workflow changes its key
+_compiled_graphs = TTLCache(
+    max_entries=settings.WORKFLOW_GRAPH_CACHE_MAX_ENTRIES,
+    ttl=settings.WORKFLOW_GRAPH_CACHE_TTL,
+)
 
+
+NODE_TYPES = (
+    "start-node",
+    "agent-node",
+    "condition-node",
+    "message-node",
+    "delay-node",
+    "join-node",
+)
+
+
+def flow_hash(flow_json: dict[str, Any]) -> str:
+    """Return a stable hash of a workflow definition."""
+    serialized = json.dumps(flow_json, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class WorkflowResumeError(ValueError):
+    """Raised when a workflow run cannot be resumed from its checkpoints."""
+
+
+def _append_events(left: list[Event], right: list[Event]) -> list[Event]:
+    """Append the events emitted by a node."""
+    return left + right if right else left
+
+
+def _merge_outputs(left: dict[str, Any], right: dict[str, Any]) -> dict[str, Any]:
+    """Merge the outputs emitted by a node, keyed by node id."""
+    return {**left, **right} if right else left
+
+
+def _last_value(left: Any, right: Any) -> Any:
+    return right
+
+
+def _highest_cycle(left: int, right: int) -> int:
+    return max(left, right)
+
+
+# Nodes only return what they add or change: content is append-only and node_outputs
+# merge-only. Parallel branches update the state in the same step through these reducers.
+# The conversation history stays in the session (ctx.session.events), it is not part of
+# the state so it is not copied into every checkpoint.
 class State(TypedDict):
-    content: list[Event]
-    status: str
-    session_id: str
+    content: Annotated[list[Event], _append_events]
+    status: Annotated[str, _last_value]
+    session_id: Annotated[str, _last_value]
     # Additional fields to store any node outputs
-    node_outputs: dict[str, Any]
+    node_outputs: Annotated[dict[str, Any], _merge_outputs]
     # Cycle counter to prevent infinite loops
-    cycle_count: int
-    conversation_history: list[Event]
+    cycle_count: Annotated[int, _highest_cycle]
+
+
+class NodeAgentRegistry:
+    """
+    Agents used by the nodes of a single workflow run.
+
+    Each referenced agent is built once and reused every time its node runs,
+    including across cycles. The resources they opened are released by
+    ``aclose`` when the run ends.
+    """
+
+    def __init__(self, workflow: "WorkflowAgent"):
+        self.workflow = workflow
+        self._builder = None
+        self._builds: dict[str, asyncio.Future] = {}
+        self._exit_stack = AsyncExitStack()
+
+    async def get(self, agent) -> BaseAgent:
+        """Return the built agent for an agent row, building it on first use."""
+        # Import moved to inside the function to avoid circular import
+        from src.services.adk.agent_builder import AgentBuilder
+
+        if self._builder is None:
+            self._builder = AgentBuilder(self.workflow.db, self.workflow.agent_graph)
+
+        async def build():
+            root_agent, exit_stack = await self._builder.build_cached_agent(agent)
+            if exit_stack:
+                self._exit_stack.push_async_exit(exit_stack)
+            return root_agent
+
+        root_agent, _ = await AgentBuilder._memoized(self._builds, str(agent.id), build)
+        return root_agent
+
+    async def aclose(self):
+        """Close the resources of every agent built during the run."""
+        self._builds.clear()
+        try:
+            await self._exit_stack.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing workflow node agents: {e}")
 
 
 class WorkflowAgent(BaseAgent):
@@ -39,6 +145,10 @@ class WorkflowAgent(BaseAgent):
     flow_json: dict[str, Any]
     timeout: int
     db: Session
+    # AgentGraph shared with the builder, typed loosely so it is not copied
+    agent_graph: Any = None
+    # Database id of the agent, used to resume delayed runs
+    agent_id: str | None = None
 
     def __init__(
         self,
@@ -47,6 +157,8 @@ class WorkflowAgent(BaseAgent):
         timeout: int = 3600,
         sub_agents: list[BaseAgent] = [],
         db: Session = None,
+        agent_graph: Any = None,
+        agent_id: str | None = None,
         **kwargs,
     ):
         """
@@ -58,71 +170,75 @@ class WorkflowAgent(BaseAgent):
             timeout: Maximum execution time (seconds)
             sub_agents: List of sub-agents to be executed after the workflow agent
             db: Session
+            agent_graph: Agents preloaded by the builder for the node agents
+            agent_id: Database id of the agent
         """
         # Initialize base class
         super().__init__(
             name=name,
             flow_json=flow_json,
-            timeout=self.timeout if self.timeout else 3600,
+            timeout=timeout or 3600,
             sub_agents=sub_agents,
             db=db,
+            agent_graph=agent_graph,
+            agent_id=agent_id,
             **kwargs,
         )
 
         logger.debug(f"Workflow agent initialized with {len(flow_json.get('nodes', []))} nodes")
 
-    async def _create_node_functions(self, ctx: InvocationContext):
-        """Creates functions for each type of node in the flow."""
+    def _get_node_agent(self, agent_id: str):
+        """Get a node's agent, from the preloaded graph when available."""
+        if self.agent_graph is not None:
+            agent = self.agent_graph.agents.get(str(agent_id))
+            if agent is not None:
+                return agent
+        return get_agent(self.db, agent_id)
+
+    def _create_node_functions(self, node_agents: NodeAgentRegistry):
+        """
+        Creates functions for each type of node in the flow, for a single run.
+
+        The invocation context is passed to each call, so the compiled graph
+        does not hold on to a single invocation.
+        """
 
         # Function for the initial node
         async def start_node_function(
             state: State,
             node_id: str,
             node_data: dict[str, Any],
+            ctx: InvocationContext,
         ) -> AsyncGenerator[State, None]:
             logger.debug("🏁 INITIAL NODE")
 
-            content = state.get("content", [])
-
-            if not content:
-                content = [
-                    Event(
-                        author=f"workflow-node:{node_id}",
-                        content=Content(parts=[Part(text="Content not found")]),
-                    )
-                ]
+            if not state.get("content"):
                 yield {
-                    "content": content,
+                    "content": [
+                        Event(
+                            author=f"workflow-node:{node_id}",
+                            content=Content(parts=[Part(text="Content not found")]),
+                        )
+                    ],
                     "status": "error",
-                    "node_outputs": {},
-                    "cycle_count": 0,
-                    "conversation_history": ctx.session.events,
                 }
                 return
-            session_id = state.get("session_id", "")
-
-            # Store specific results for this node
-            node_outputs = state.get("node_outputs", {})
-            node_outputs[node_id] = {"started_at": datetime.now().isoformat()}
 
             new_event = Event(
                 author=f"workflow-node:{node_id}",
                 content=Content(parts=[Part(text="Workflow started")]),
             )
-            content = content + [new_event]
 
             yield {
-                "content": content,
+                "content": [new_event],
                 "status": "started",
-                "node_outputs": node_outputs,
-                "cycle_count": 0,
-                "session_id": session_id,
-                "conversation_history": ctx.session.events,
+                # Store specific results for this node
+                "node_outputs": {node_id: {"started_at": datetime.now().isoformat()}},
             }
 
         # Generic function for agent nodes
         async def agent_node_function(
-            state: State, node_id: str, node_data: dict[str, Any]
+            state: State, node_id: str, node_data: dict[str, Any], ctx: InvocationContext
         ) -> AsyncGenerator[State, None]:
 
             agent_config = node_data.get("agent", {})
@@ -133,13 +249,7 @@ class WorkflowAgent(BaseAgent):
             cycle_count = state.get("cycle_count", 0) + 1
             logger.debug(f"👤 AGENT: {agent_name} (Cycle {cycle_count})")
 
-            content = state.get("content", [])
-            session_id = state.get("session_id", "")
-
-            # Get conversation history
-            conversation_history = state.get("conversation_history", [])
-
-            agent = get_agent(self.db, agent_id)
+            agent = self._get_node_agent(agent_id)
 
             if not agent:
                 yield {
@@ -149,62 +259,46 @@ class WorkflowAgent(BaseAgent):
                             content=Content(parts=[Part(text="Agent not found")]),
                         )
                     ],
-                    "session_id": session_id,
                     "status": "error",
-                    "node_outputs": {},
                     "cycle_count": cycle_count,
-                    "conversation_history": conversation_history,
                 }
                 return
 
-            # Import moved to inside the function to avoid circular import
-            from src.services.adk.agent_builder import AgentBuilder
-
-            agent_builder = AgentBuilder(self.db)
-            root_agent, exit_stack = await agent_builder.build_agent(agent)
+            root_agent = await node_agents.get(agent)
 
             new_content = []
             async for event in root_agent.run_async(ctx):
-                conversation_history.append(event)
-
                 modified_event = Event(author=f"workflow-node:{node_id}", content=event.content)
                 new_content.append(modified_event)
 
             logger.debug(f"New content: {new_content}")
 
-            node_outputs = state.get("node_outputs", {})
-            node_outputs[node_id] = {
-                "processed_by": agent_name,
-                "agent_content": new_content,
-                "cycle": cycle_count,
-            }
-
-            content = content + new_content
-
             yield {
-                "content": content,
+                "content": new_content,
                 "status": "processed_by_agent",
-                "node_outputs": node_outputs,
+                "node_outputs": {
+                    node_id: {
+                        "processed_by": agent_name,
+                        "agent_content": new_content,
+                        "cycle": cycle_count,
+                    }
+                },
                 "cycle_count": cycle_count,
-                "conversation_history": conversation_history,
-                "session_id": session_id,
             }
 
-            if exit_stack:
-                await exit_stack.aclose()
 
         # Function for condition nodes
         async def condition_node_function(
-            state: State, node_id: str, node_data: dict[str, Any]
+            state: State, node_id: str, node_data: dict[str, Any], ctx: InvocationContext
         ) -> AsyncGenerator[State, None]:
             label = node_data.get("label", "No name condition")
-            conditions = node_data.get("conditions", [])
+            # Compiled with the graph, see _create_graph
+            predicates: list[ConditionPredicate] = node_data.get("predicates", [])
             cycle_count = state.get("cycle_count", 0)
 
             logger.debug(f"🔄 CONDITION: {label} (Cycle {cycle_count})")
 
             content = state.get("content", [])
-            conversation_history = state.get("conversation_history", [])
 
             latest_event = None
             if content and len(content) > 0:
@@ -226,27 +320,18 @@ class WorkflowAgent(BaseAgent):
             if latest_event:
                 evaluation_state["content"] = [latest_event]
 
-            session_id = state.get("session_id", "")
-
-            # Check all conditions
+            # Check all conditions, the router reuses the result stored in node_outputs
             conditions_met = []
             condition_details = []
-            for condition in conditions:
-                condition_id = condition.get("id")
-                condition_data = condition.get("data", {})
-                field = condition_data.get("field")
-                operator = condition_data.get("operator")
-                expected_value = condition_data.get("value")
-
-                logger.debug(
-                    f"  Checking if {field} {operator} '{expected_value}' (current value: '{evaluation_state.get(field, '')}')"
-                )
-                if self._evaluate_condition(condition, evaluation_state):
-                    conditions_met.append(condition_id)
-                    condition_details.append(f"{field} {operator} '{expected_value}' ✅")
-                    logger.debug(f"  ✅ Condition {condition_id} met!")
+            values = ConditionState(evaluation_state)
+            for predicate in predicates:
+                logger.debug(f"  Checking if {predicate.describe()}")
+                if predicate.evaluate(values):
+                    conditions_met.append(predicate.id)
+                    condition_details.append(f"{predicate.describe()} ✅")
+                    logger.debug(f"  ✅ Condition {predicate.id} met!")
                 else:
-                    condition_details.append(f"{field} {operator} '{expected_value}' ❌")
+                    condition_details.append(f"{predicate.describe()} ❌")
 
             # Check if the cycle reached the limit (extra security)
             if cycle_count >= 10:
@@ -254,33 +339,17 @@ class WorkflowAgent(BaseAgent):
                     f"⚠️ ATTENTION: Cycle limit reached ({cycle_count}). Forcing termination."
                 )
 
-                condition_content = [
-                    Event(
-                        author=f"workflow-node:{node_id}",
-                        content=Content(parts=[Part(text="Cycle limit reached")]),
-                    )
-                ]
-                content = content + condition_content
                 yield {
-                    "content": content,
+                    "content": [
+                        Event(
+                            author=f"workflow-node:{node_id}",
+                            content=Content(parts=[Part(text="Cycle limit reached")]),
+                        )
+                    ],
                     "status": "cycle_limit_reached",
-                    "node_outputs": state.get("node_outputs", {}),
-                    "cycle_count": cycle_count,
-                    "conversation_history": conversation_history,
-                    "session_id": session_id,
                 }
                 return
 
-            # Store specific results for this node
-            node_outputs = state.get("node_outputs", {})
-            node_outputs[node_id] = {
-                "condition_evaluated": label,
-                "content_evaluated": content,
-                "conditions_met": conditions_met,
-                "condition_details": condition_details,
-                "cycle": cycle_count,
-            }
-
             # Prepare a more descriptive message about the conditions
             conditions_result_text = "\n".join(condition_details)
             condition_summary = "TRUE" if conditions_met else "FALSE"
@@ -297,19 +366,24 @@ class WorkflowAgent(BaseAgent):
                     ),
                 )
             ]
-            content = content + condition_content
 
             yield {
-                "content": content,
+                "content": condition_content,
                 "status": "condition_evaluated",
-                "node_outputs": node_outputs,
-                "cycle_count": cycle_count,
-                "conversation_history": conversation_history,
-                "session_id": session_id,
+                # Store specific results for this node, only the evaluated event is kept
+                "node_outputs": {
+                    node_id: {
+                        "condition_evaluated": label,
+                        "content_evaluated": evaluation_state.get("content", []),
+                        "conditions_met": conditions_met,
+                        "condition_details": condition_details,
+                        "cycle": cycle_count,
+                    }
+                },
             }
 
         async def message_node_function(
-            state: State, node_id: str, node_data: dict[str, Any]
+            state: State, node_id: str, node_data: dict[str, Any], ctx: InvocationContext
         ) -> AsyncGenerator[State, None]:
             # Handle both old and new message format
             message_data = node_data.get("message", {})
@@ -328,35 +402,26 @@ class WorkflowAgent(BaseAgent):
 
             logger.debug(f"💬 MESSAGE-NODE: {message_content}")
 
-            content = state.get("content", [])
-            session_id = state.get("session_id", "")
-            conversation_history = state.get("conversation_history", [])
-
             label = node_data.get("label", "message_node")
 
             new_event = Event(
                 author=f"workflow-node:{node_id}",
                 content=Content(parts=[Part(text=message_content)]),
             )
-            content = content + [new_event]
-
-            node_outputs = state.get("node_outputs", {})
-            node_outputs[node_id] = {
-                "message_type": message_type,
-                "message_content": message_content,
-            }
 
             yield {
-                "content": content,
+                "content": [new_event],
                 "status": "message_added",
-                "node_outputs": node_outputs,
-                "cycle_count": state.get("cycle_count", 0),
-                "conversation_history": conversation_history,
-                "session_id": session_id,
+                "node_outputs": {
+                    node_id: {
+                        "message_type": message_type,
+                        "message_content": message_content,
+                    }
+                },
             }
 
         async def delay_node_function(
-            state: State, node_id: str, node_data: dict[str, Any]
+            state: State, node_id: str, node_data: dict[str, Any], ctx: InvocationContext
         ) -> AsyncGenerator[State, None]:
             delay_data = node_data.get("delay", {})
             delay_value = delay_data.get("value", 0)
@@ -373,35 +438,92 @@ class WorkflowAgent(BaseAgent):
             label = node_data.get("label", "delay_node")
             logger.debug(f"⏱️ DELAY-NODE: {delay_value} {delay_unit} - {delay_description}")
 
-            content = state.get("content", [])
-            session_id = state.get("session_id", "")
-            conversation_history = state.get("conversation_history", [])
-
             # Store node output information
-            node_outputs = state.get("node_outputs", {})
-            node_outputs[node_id] = {
-                "delay_value": delay_value,
-                "delay_unit": delay_unit,
-                "delay_seconds": delay_seconds,
-                "delay_start_time": datetime.now().isoformat(),
-            }
+            previous_output = state.get("node_outputs", {}).get(node_id) or {}
 
-            # Actually perform the delay
-            import asyncio
+            if previous_output.get("resumed"):
+                # Woken up by the scheduler, the delay has already passed
+                node_output = {
+                    key: value for key, value in previous_output.items() if key != "resumed"
+                }
+            else:
+                node_output = {
+                    "delay_value": delay_value,
+                    "delay_unit": delay_unit,
+                    "delay_seconds": delay_seconds,
+                    "delay_start_time": datetime.now().isoformat(),
+                }
+
+                # Long delays end the run and are resumed later by the scheduler
+                if (
+                    delay_seconds >= settings.WORKFLOW_DURABLE_DELAY_MIN_SECONDS
+                    and self._is_invocation_root(ctx)
+                ):
+                    wake_at = time.time() + delay_seconds
+                    node_output["resume_at"] = datetime.fromtimestamp(wake_at).isoformat()
+                    scheduled = await workflow_delay_scheduler.schedule(
+                        {
+                            "agent_id": self.agent_id,
+                            "app_name": ctx.session.app_name,
+                            "user_id": ctx.session.user_id,
+                            "session_id": ctx.session.id,
+                            "node_id": node_id,
+                            "state": self._dump_state(
+                                {
+                                    **state,
+                                    "node_outputs": {
+                                        **state.get("node_outputs", {}),
+                                        node_id: node_output,
+                                    },
+                                }
+                            ),
+                        },
+                        wake_at,
+                    )
+                    if scheduled:
+                        paused_event = Event(
+                            author=f"workflow-node:{node_id}",
+                            content=Content(
+                                parts=[Part(text=f"Workflow paused for {delay_value} {delay_unit}")]
+                            ),
+                        )
+                        yield {
+                            "content": [paused_event],
+                            "status": "delayed",
+                            "node_outputs": {node_id: node_output},
+                        }
+                        return
 
-            await asyncio.sleep(delay_seconds)
+                # Actually perform the delay
+                await asyncio.sleep(delay_seconds)
 
             # Update node outputs with completion information
-            node_outputs[node_id]["delay_end_time"] = datetime.now().isoformat()
-            node_outputs[node_id]["delay_completed"] = True
+            node_output["delay_end_time"] = datetime.now().isoformat()
+            node_output["delay_completed"] = True
 
             yield {
-                "content": content,
                 "status": "delay_completed",
-                "node_outputs": node_outputs,
-                "cycle_count": state.get("cycle_count", 0),
-                "conversation_history": conversation_history,
-                "session_id": session_id,
+                "node_outputs": {node_id: node_output},
+            }
+
+        async def join_node_function(
+            state: State, node_id: str, node_data: dict[str, Any], ctx: InvocationContext
+        ) -> AsyncGenerator[State, None]:
+            sources = node_data.get("join_sources", [])
+            logger.debug(f"🔀 JOIN-NODE: {sources}")
+
+            # Branch outputs were already merged into the state by its reducer
+            node_outputs = state.get("node_outputs", {})
+
+            yield {
+                "status": "branches_joined",
+                "node_outputs": {
+                    node_id: {
+                        "joined": sources,
+                        "branch_outputs": {source: node_outputs.get(source) for source in sources},
+                        "joined_at": datetime.now().isoformat(),
+                    }
+                },
             }
 
         return {
@@ -410,169 +532,35 @@ class WorkflowAgent(BaseAgent):
             "condition-node": condition_node_function,
             "message-node": message_node_function,
             "delay-node": delay_node_function,
+            "join-node": join_node_function,
         }
 
-    def _evaluate_condition(self, condition: dict[str, Any], state: State) -> bool:
-        """Evaluates a condition against the current state."""
-        condition_type = condition.get("type")
-        condition_data = condition.get("data", {})
-
-        if condition_type == "previous-output":
-            field, operator, expected_value, actual_value = self._extract_condition_values(
-                condition_data, state
-            )
-
-            if field == "content" and isinstance(actual_value, list) and actual_value:
-                actual_value = self._extract_text_from_events(actual_value)
-
-            result = self._process_condition(operator, actual_value, expected_value)
-
-            logger.debug(f"  Check '{operator}': {result}")
-            return result
-
-        return False
-
-    def _process_condition(self, operator, actual_value, expected_value):
-        """Converts values to strings and processes the condition using the appropriate operator."""
-        actual_str = str(actual_value) if actual_value is not None else ""
-        expected_str = str(expected_value) if expected_value is not None else ""
-
-        return self._process_operator(operator, actual_value, actual_str, expected_str)
-
-    def _extract_condition_values(self, condition_data, state):
-        """Extracts field, operator, expected value and actual value from condition data."""
-        field = condition_data.get("field")
-        operator = condition_data.get("operator")
-        expected_value = condition_data.get("value")
-        actual_value = state.get(field, "")
-
-        return field, operator, expected_value, actual_value
-
-    def _extract_text_from_events(self, events):
-        """Extracts text content from a list of events for comparison."""
-        extracted_texts = []
-        for event in events:
-            if hasattr(event, "content") and hasattr(event.content, "parts"):
-                extracted_texts.extend(
-                    [
-                        part.text
-                        for part in event.content.parts
-                        if hasattr(part, "text") and part.text
-                    ]
-                )
-
-        if extracted_texts:
-            joined_text = " ".join(extracted_texts)
-            logger.debug(f"  Extracted text from events: '{joined_text[:100]}...'")
-            return joined_text
-
-        return ""
-
-    def _process_operator(self, operator, actual_value, actual_str, expected_str):
-        """Process the operator and return the result of the comparison."""
-        # Definition checks
-        if operator in ["is_defined", "is_not_defined"]:
-            return self._check_definition(operator, actual_value)
-
-        # Equality checks
-        elif operator in ["equals", "not_equals"]:
-            return self._check_equality(operator, actual_str, expected_str)
-
-        # Content checks
-        elif operator in ["contains", "not_contains"]:
-            return self._case_insensitive_comparison(expected_str, actual_str, operator)
-
-        # String pattern checks
-        elif operator in ["starts_with", "ends_with"]:
-            return self._check_string_pattern(operator, actual_str, expected_str)
-
-        # Numeric checks
-        elif operator in [
-            "greater_than",
-            "greater_than_or_equal",
-            "less_than",
-            "less_than_or_equal",
-        ]:
-            return self._check_numeric(operator, actual_str, expected_str)
-
-        # Regex checks
-        elif operator in ["matches", "not_matches"]:
-            return self._check_regex(operator, actual_str, expected_str)
-
-        return False
-
-    def _check_definition(self, operator, actual_value):
-        """Check if a value is defined or not."""
-        if operator == "is_defined":
-            return actual_value is not None and actual_value != ""
-        else:  # is_not_defined
-            return actual_value is None or actual_value == ""
-
-    def _check_equality(self, operator, actual_str, expected_str):
-        """Check if two strings are equal or not."""
-        return (
-            (actual_str == expected_str) if operator == "equals" else (actual_str != expected_str)
-        )
-
-    def _check_string_pattern(self, operator, actual_str, expected_str):
-        """Check if a string starts or ends with another string."""
-        if operator == "starts_with":
-            return actual_str.lower().startswith(expected_str.lower())
-        else:  # ends_with
-            return actual_str.lower().endswith(expected_str.lower())
-
-    def _check_numeric(self, operator, actual_str, expected_str):
-        """Compare numeric values."""
-        try:
-            actual_num = float(actual_str) if actual_str else 0
-            expected_num = float(expected_str) if expected_str else 0
-
-            if operator == "greater_than":
-                return actual_num > expected_num
-            elif operator == "greater_than_or_equal":
-                return actual_num >= expected_num
-            elif operator == "less_than":
-                return actual_num < expected_num
-            else:  # less_than_or_equal
-                return actual_num <= expected_num
-        except (ValueError, TypeError):
-            print(
-                f"  Error converting values for numeric comparison: '{actual_str[:100]}...' and '{expected_str}'"
-            )
-            return False
-
-    def _check_regex(self, operator, actual_str, expected_str):
-        """Check if a string matches a regex pattern."""
-        import re
-
-        try:
-            pattern = re.compile(expected_str, re.IGNORECASE)
-            if operator == "matches":
-                return bool(pattern.search(actual_str))
-            else:  # not_matches
-                return not bool(pattern.search(actual_str))
-        except re.error:
-            print(f"  Error in regular expression: '{expected_str}'")
-            return operator == "not_matches"  # Return True for not_matches, False for matches
-
-    def _case_insensitive_comparison(self, expected_str, actual_str, operator):
-        """Performs case-insensitive string comparison based on the specified operator."""
-        expected_lower = expected_str.lower()
-        actual_lower = actual_str.lower()
-
-        logger.debug(
-            f"  Comparison '{operator}' without case distinction: '{expected_lower}' in '{actual_lower[:100]}...'"
-        )
+    def _join_sources(self, flow_data: dict[str, Any]) -> dict[str, list[str]]:
+        """Maps each join node to the nodes it waits for."""
+        join_nodes = {
+            node.get("id") for node in flow_data.get("nodes", []) if node.get("type") == "join-node"
+        }
+        join_sources = {node_id: [] for node_id in join_nodes}
+        for edge in flow_data.get("edges", []):
+            target = edge.get("target")
+            if target in join_sources and edge.get("source") not in join_sources[target]:
+                join_sources[target].append(edge.get("source"))
+        return join_sources
 
-        if operator == "contains":
-            return expected_lower in actual_lower
-        elif operator == "not_contains":
-            return expected_lower not in actual_lower
+    def _create_flow_router(
+        self,
+        flow_data: dict[str, Any],
+        condition_predicates: dict[str, list[ConditionPredicate]],
+    ):
+        """
+        Creates a router based on the connections in flow.json.
 
-        return False
+        A handle connected to several nodes fans out: the router returns every
+        target and LangGraph runs them in the same step. Edges into join nodes
+        are left out, the graph waits on them instead.
+        """
+        join_sources = self._join_sources(flow_data)
 
-    def _create_flow_router(self, flow_data: dict[str, Any]):
-        """Creates a router based on the connections in flow.json."""
         # Map connections to understand how nodes are connected
         edges_map = {}
 
@@ -581,25 +569,31 @@ class WorkflowAgent(BaseAgent):
             target = edge.get("target")
             source_handle = edge.get("sourceHandle", "default")
 
+            if target in join_sources:
+                continue
+
             if source not in edges_map:
                 edges_map[source] = {}
 
-            # Store the destination for each specific handle
-            edges_map[source][source_handle] = target
+            # Store the destinations for each specific handle
+            edges_map[source].setdefault(source_handle, []).append(target)
 
-        # Map condition nodes and their conditions
-        condition_nodes = {}
-        for node in flow_data.get("nodes", []):
-            if node.get("type") == "condition-node":
-                node_id = node.get("id")
-                conditions = node.get("data", {}).get("conditions", [])
-                condition_nodes[node_id] = conditions
+        def destinations(targets: list[str]) -> str | list[str]:
+            return targets[0] if len(targets) == 1 else targets
+
+        # Map condition nodes and their compiled conditions
+        condition_nodes = condition_predicates
 
         # Routing function for each specific node
         def create_router_for_node(node_id: str):
-            def router(state: State) -> str:
+            def router(state: State) -> str | list[str]:
                 print(f"Routing from node: {node_id}")
 
+                # A durable delay ended the run, the scheduler resumes it later
+                if state.get("status") == "delayed":
+                    logger.debug("Workflow delayed. Finalizing the flow.")
+                    return END
+
                 # Check if the cycle limit has been reached
                 cycle_count = state.get("cycle_count", 0)
                 if cycle_count >= 10:
@@ -621,31 +615,32 @@ class WorkflowAgent(BaseAgent):
                                 f"Using stored condition evaluation result: Condition {condition_id} met."
                             )
                             if node_id in edges_map and condition_id in edges_map[node_id]:
-                                return edges_map[node_id][condition_id]
+                                return destinations(edges_map[node_id][condition_id])
                         else:
                             print("Using stored condition evaluation result: No conditions met.")
                     else:
-                        for condition in conditions:
-                            condition_id = condition.get("id")
-
-                            # Get latest event for evaluation, ignoring condition node informational events
-                            content = state.get("content", [])
-
-                            # Filter out events generated by condition nodes or informational messages
-                            filtered_content = []
-                            for event in content:
-                                # Ignore events from condition nodes or that contain evaluation results
-                                if not hasattr(event, "author") or not (
-                                    event.author.startswith("Condition")
-                                    or "Condition evaluated:" in str(event)
-                                ):
-                                    filtered_content.append(event)
-
-                            evaluation_state = state.copy()
-                            evaluation_state["content"] = filtered_content
+                        # Get latest event for evaluation, ignoring condition informational events
+                        content = state.get("content", [])
+
+                        # Filter out events generated by condition nodes or informational messages
+                        filtered_content = []
+                        for event in content:
+                            # Ignore events from condition nodes or that contain evaluation results
+                            if not hasattr(event, "author") or not (
+                                event.author.startswith("Condition")
+                                or "Condition evaluated:" in str(event)
+                            ):
+                                filtered_content.append(event)
+
+                        evaluation_state = state.copy()
+                        evaluation_state["content"] = filtered_content
+                        values = ConditionState(evaluation_state)
+
+                        for predicate in conditions:
+                            condition_id = predicate.id
 
                             # Check if the condition is met
-                            is_condition_met = self._evaluate_condition(condition, evaluation_state)
+                            is_condition_met = predicate.evaluate(values)
 
                             if is_condition_met:
                                 any_condition_met = True
@@ -653,7 +648,7 @@ class WorkflowAgent(BaseAgent):
 
                                 # Find the connection that uses this condition_id as a handle
                                 if node_id in edges_map and condition_id in edges_map[node_id]:
-                                    return edges_map[node_id][condition_id]
+                                    return destinations(edges_map[node_id][condition_id])
                             else:
                                 print(
                                     f"Condition {condition_id} not met. Continuing evaluation or using default path."
@@ -663,7 +658,7 @@ class WorkflowAgent(BaseAgent):
                     if not any_condition_met:
                         if node_id in edges_map and "bottom-handle" in edges_map[node_id]:
                             print("No condition met. Using default path (bottom-handle).")
-                            return edges_map[node_id]["bottom-handle"]
+                            return destinations(edges_map[node_id]["bottom-handle"])
                         else:
                             print("No condition met and no default path. Closing the flow.")
                             return END
@@ -673,12 +668,12 @@ class WorkflowAgent(BaseAgent):
                     # Try to use the default handle or bottom-handle first
                     for handle in ["default", "bottom-handle"]:
                         if handle in edges_map[node_id]:
-                            return edges_map[node_id][handle]
+                            return destinations(edges_map[node_id][handle])
 
                     # If no specific handle is found, use the first available
                     if edges_map[node_id]:
                         first_handle = list(edges_map[node_id].keys())[0]
-                        return edges_map[node_id][first_handle]
+                        return destinations(edges_map[node_id][first_handle])
 
                 # If there is no output connection, close the flow
                 print(f"No output connection from node {node_id}. Closing the flow.")
@@ -688,7 +683,18 @@ class WorkflowAgent(BaseAgent):
 
         return create_router_for_node
 
-    async def _create_graph(self, ctx: InvocationContext, flow_data: dict[str, Any]) -> StateGraph:
+    def _get_graph(self, flow_data: dict[str, Any]) -> StateGraph:
+        """Returns the compiled graph for the flow data, compiling it on first use."""
+        key = flow_hash(flow_data)
+        graph = _compiled_graphs.get(key)
+        if graph is None:
+            graph = self._create_graph(flow_data)
+            _compiled_graphs.set(key, graph)
+        else:
+            logger.debug(f"Using cached workflow graph {key[:12]}")
+        return graph
+
+    def _create_graph(self, flow_data: dict[str, Any]) -> StateGraph:
         """Creates a StateGraph from the flow data."""
         # Debug: Print flow_data structure
         logger.debug(f"Flow data keys: {list(flow_data.keys()) if flow_data else 'None'}")
@@ -705,25 +711,38 @@ class WorkflowAgent(BaseAgent):
         # Initialize StateGraph
         graph_builder = StateGraph(State)
 
-        # Create functions for each node type
-        node_functions = await self._create_node_functions(ctx)
-
         # Dictionary to store specific functions for each node
         node_specific_functions = {}
 
+        join_sources = self._join_sources(flow_data)
+
+        # Conditions are compiled once, for the condition nodes and their routers
+        condition_predicates = {
+            node.get("id"): compile_conditions(node.get("data", {}).get("conditions", []))
+            for node in nodes
+            if node.get("type") == "condition-node"
+        }
+
         # Add nodes to the graph
         for node in nodes:
             node_id = node.get("id")
             node_type = node.get("type")
             node_data = node.get("data", {})
+            if node_id in join_sources:
+                node_data = {**node_data, "join_sources": join_sources[node_id]}
+            if node_id in condition_predicates:
+                node_data = {**node_data, "predicates": condition_predicates[node_id]}
 
-            if node_type in node_functions:
+            if node_type in NODE_TYPES:
                 # Create a specific function for this node
                 def create_node_function(node_type, node_id, node_data):
-                    async def node_function(state):
+                    async def node_function(state: State, config: RunnableConfig):
+                        run = config["configurable"]
                         # Consume the asynchronous generator and return the last result
                         result = None
-                        async for item in node_functions[node_type](state, node_id, node_data):
+                        async for item in run["node_functions"][node_type](
+                            state, node_id, node_data, run["ctx"]
+                        ):
                             result = item
                         return result
 
@@ -739,7 +758,7 @@ class WorkflowAgent(BaseAgent):
                 graph_builder.add_node(node_id, node_specific_functions[node_id])
 
         # Create function to generate specific routers
-        create_router = self._create_flow_router(flow_data)
+        create_router = self._create_flow_router(flow_data, condition_predicates)
 
         # Add conditional connections for each node
         for node in nodes:
@@ -753,7 +772,7 @@ class WorkflowAgent(BaseAgent):
                 for edge in flow_data.get("edges", []):
                     if edge.get("source") == node_id:
                         target = edge.get("target")
-                        if target in node_specific_functions:
+                        if target in node_specific_functions and target not in join_sources:
                             edge_destinations[target] = target
 
                 # Add END as a possible destination
@@ -768,6 +787,13 @@ class WorkflowAgent(BaseAgent):
 
                 graph_builder.add_conditional_edges(node_id, node_router, edge_destinations)
 
+        # A join node runs once every node connected to it has finished
+        for join_id, sources in join_sources.items():
+            sources = [source for source in sources if source in node_specific_functions]
+            if join_id in node_specific_functions and sources:
+                print(f"Adding join node {join_id} waiting for {sources}")
+                graph_builder.add_edge(sources if len(sources) > 1 else sources[0], join_id)
+
         # Find the initial node (usually the start-node)
         entry_point = None
         for node in nodes:
@@ -792,9 +818,15 @@ class WorkflowAgent(BaseAgent):
                 f"Entry point '{entry_point}' not found in available nodes: {list(node_specific_functions.keys())}"
             )
 
-        # Define the entry point
+        # Define the entry point, a resumed run starts from the node it stopped at
         print(f"Defining entry point: {entry_point}")
-        graph_builder.set_entry_point(entry_point)
+
+        def entry_router(state: State, config: RunnableConfig) -> str:
+            return config["configurable"].get("resume_from") or entry_point
+
+        graph_builder.set_conditional_entry_point(
+            entry_router, {node_id: node_id for node_id in node_specific_functions}
+        )
 
         # Compile the graph
         return graph_builder.compile()
@@ -804,18 +836,59 @@ class WorkflowAgent(BaseAgent):
         try:
             user_message = await self._extract_user_message(ctx)
             session_id = self._get_session_id(ctx)
-            graph = await self._create_graph(ctx, self.flow_json)
+            graph = self._get_graph(self.flow_json)
             initial_state = await self._prepare_initial_state(ctx, user_message, session_id)
 
             print("\n🚀 Starting workflow execution:")
             print(f"Initial content: {user_message[:100]}...")
 
             # Iterar sobre o AsyncGenerator em vez de usar await
-            async for event in self._execute_workflow(ctx, graph, initial_state):
+            async for event in self._execute_workflow(
+                ctx, graph, initial_state, thread_id=self._get_thread_id(ctx)
+            ):
                 yield event
 
         except Exception as e:
-            yield await self._handle_workflow_error(e)
+            yield await self._handle_workflow_error(e, ctx)
+
+    def _is_invocation_root(self, ctx: InvocationContext) -> bool:
+        """
+        Whether this workflow is the agent the run was started with.
+
+        Only then can the delay scheduler resume it, a nested workflow would
+        return to its parent, which carries on without waiting. ``ctx.agent`` is
+        always this agent here, ADK copies the context for every agent it runs,
+        so the check relies on the parent link and the agent of the session.
+        """
+        return bool(
+            self.agent_id
+            and ctx.session
+            and self.parent_agent is None
+            and ctx.session.app_name == self.agent_id
+        )
+
+    def _get_thread_id(self, ctx: InvocationContext, invocation_id: str | None = None):
+        """Gets the checkpoint thread of a run, None when it cannot be resumed by id."""
+        if not self.agent_id:
+            return None
+        return workflow_thread_id(
+            self.agent_id, self._get_session_id(ctx), invocation_id or ctx.invocation_id
+        )
+
+    async def resume_from_checkpoint(
+        self, ctx: InvocationContext, invocation_id: str
+    ) -> AsyncGenerator[Event, None]:
+        """Continues a failed or interrupted run from its last completed node."""
+        try:
+            graph = self._get_graph(self.flow_json)
+            async for event in self._execute_workflow(
+                ctx, graph, None, thread_id=self._get_thread_id(ctx, invocation_id)
+            ):
+                yield event
+        except WorkflowResumeError:
+            raise
+        except Exception as e:
+            yield await self._handle_workflow_error(e, ctx)
 
     async def _extract_user_message(self, ctx: InvocationContext) -> str:
         """Extracts the user message from context session events or state."""
@@ -850,47 +923,183 @@ class WorkflowAgent(BaseAgent):
             content=Content(parts=[Part(text=user_message)]),
         )
 
-        conversation_history = ctx.session.events or [user_event]
-
         return State(
             content=[user_event],
             status="started",
             session_id=session_id,
             cycle_count=0,
             node_outputs={},
-            conversation_history=conversation_history,
+        )
+
+    async def resume(
+        self,
+        ctx: InvocationContext,
+        node_id: str,
+        saved_state: dict[str, Any],
+        resume_id: str | None = None,
+    ) -> AsyncGenerator[Event, None]:
+        """
+        Continues a delayed run from its delay node.
+
+        Attempts with the same ``resume_id`` share a checkpoint thread, so a
+        retry continues after the nodes an earlier attempt completed instead of
+        running them, and sending their events, again. Without checkpoints a
+        resume that fails after sending events raises WorkflowResumeError, so
+        it is not retried.
+        """
+        thread_id = self._get_thread_id(ctx, resume_id)
+        checkpointer = await get_workflow_checkpointer() if thread_id else None
+        sent_events = False
+        try:
+            graph = self._get_graph(self.flow_json)
+            if checkpointer is not None and await self._has_checkpoint(
+                graph, checkpointer, thread_id
+            ):
+                logger.info(f"Retrying workflow {self.name} from its last checkpoint")
+                state, resume_from = None, None
+            else:
+                state = self._load_state(saved_state)
+                state["node_outputs"].setdefault(node_id, {})["resumed"] = True
+                resume_from = node_id
+
+            async for event in self._execute_workflow(
+                ctx, graph, state, resume_from=resume_from, thread_id=thread_id
+            ):
+                sent_events = True
+                yield event
+        except Exception as e:
+            # Raised so the delay scheduler retries the resume
+            logger.error(f"Error resuming workflow {self.name} from node {node_id}: {e}")
+            if sent_events and checkpointer is None:
+                raise WorkflowResumeError(
+                    f"Workflow {self.name} failed after sending events: {e}"
+                ) from e
+            raise
+
+    @staticmethod
+    async def _has_checkpoint(graph: StateGraph, checkpointer, thread_id: str) -> bool:
+        """Whether a run left unfinished nodes under ``thread_id``."""
+        graph = graph.copy(update={"checkpointer": checkpointer})
+        snapshot = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+        return bool(snapshot.next)
+
+    @staticmethod
+    def _dump_state(state: State) -> dict[str, Any]:
+        """Serializes the state of a run so it can be resumed by another worker."""
+
+        def default(value):
+            if hasattr(value, "model_dump"):
+                return value.model_dump(mode="json", exclude_none=True)
+            return str(value)
+
+        return json.loads(
+            json.dumps(
+                {
+                    "content": state.get("content", []),
+                    "node_outputs": state.get("node_outputs", {}),
+                    "cycle_count": state.get("cycle_count", 0),
+                    "session_id": state.get("session_id", ""),
+                },
+                default=default,
+            )
+        )
+
+    @staticmethod
+    def _load_state(saved_state: dict[str, Any]) -> State:
+        """Restores a serialized state, node outputs keep their events as dicts."""
+        return State(
+            content=[Event.model_validate(event) for event in saved_state.get("content", [])],
+            status="resumed",
+            session_id=saved_state.get("session_id", ""),
+            cycle_count=saved_state.get("cycle_count", 0),
+            node_outputs=saved_state.get("node_outputs", {}),
         )
 
     async def _execute_workflow(
-        self, ctx: InvocationContext, graph: StateGraph, initial_state: State
+        self,
+        ctx: InvocationContext,
+        graph: StateGraph,
+        initial_state: State | None,
+        resume_from: str | None = None,
+        thread_id: str | None = None,
     ) -> AsyncGenerator[Event, None]:
-        """Executes the workflow graph and yields events."""
-        sent_events = 0
-
-        async for state in graph.astream(initial_state, {"recursion_limit": 100}):
-            # LangGraph returns a dict where keys are node names and values are the updated state
-            # We need to get the actual state from the values, not iterate over key-value pairs
-            if isinstance(state, dict):
-                # Get the latest state (usually the last value in the dict)
-                for node_name, updated_state in state.items():
-                    if isinstance(updated_state, dict):
-                        content = updated_state.get("content", [])
-                        for event in content[sent_events:]:
-                            if hasattr(event, "author") and event.author != "user":
-                                yield event
-                        sent_events = len(content)
-                        break  # Only process the first valid state update
+        """
+        Executes the workflow graph and yields events.
+
+        With a checkpointer, each completed step is saved under ``thread_id``.
+        Without an initial state the run continues from its last checkpoint.
+        """
+        checkpointer = await get_workflow_checkpointer() if thread_id else None
+        if checkpointer is not None:
+            graph = graph.copy(update={"checkpointer": checkpointer})
+
+        node_agents = NodeAgentRegistry(self)
+        config = {
+            "recursion_limit": 100,
+            # Upper bound on the branches of a fan-out running at the same time
+            "max_concurrency": self.flow_json.get("max_concurrency")
+            or settings.WORKFLOW_MAX_CONCURRENCY,
+            "configurable": {
+                "ctx": ctx,
+                "resume_from": resume_from,
+                "node_functions": self._create_node_functions(node_agents),
+            },
+        }
+        if checkpointer is not None:
+            config["configurable"]["thread_id"] = thread_id
+
+        if initial_state is None:
+            if checkpointer is None:
+                raise WorkflowResumeError("Workflow checkpoints are disabled")
+            snapshot = await graph.aget_state(config)
+            if not snapshot.next:
+                raise WorkflowResumeError("No interrupted workflow run found for this invocation")
+            logger.info(f"Resuming workflow {self.name} at {list(snapshot.next)}")
+            initial_values = snapshot.values
+        else:
+            initial_values = initial_state
+
+        status = initial_values.get("status")
+
+        try:
+            # Stream the delta of each node, events of the initial state were already sent
+            async for step in graph.astream(initial_state, config, stream_mode="updates"):
+                for update in step.values():
+                    if not update:
+                        continue
+                    for event in update.get("content") or []:
+                        if hasattr(event, "author") and event.author != "user":
+                            yield event
+                    status = update.get("status", status)
+        finally:
+            await node_agents.aclose()
+
+        # Only failed or interrupted runs are kept for resuming, a delayed run is
+        # resumed from its scheduler record under a new invocation
+        if checkpointer is not None:
+            try:
+                await checkpointer.adelete_thread(thread_id)
+            except Exception as e:
+                logger.warning(f"Could not delete workflow checkpoints of {thread_id}: {e}")
+
+        # Sub-agents run when a delayed run is resumed
+        if status == "delayed":
+            return
 
         # Execute sub-agents if any
         for sub_agent in self.sub_agents:
             async for event in sub_agent.run_async(ctx):
                 yield event
 
-    async def _handle_workflow_error(self, error: Exception) -> Event:
+    async def _handle_workflow_error(
+        self, error: Exception, ctx: InvocationContext | None = None
+    ) -> Event:
         """Creates an error event for workflow execution errors."""
         error_msg = f"Error executing the workflow agent: {str(error)}"
         print(error_msg)
         return Event(
+            # The invocation id is what a client passes to resume the run
+            invocation_id=ctx.invocation_id if ctx else "",
             author=f"workflow-error:{self.name}",
             content=Content(
                 role="agent",
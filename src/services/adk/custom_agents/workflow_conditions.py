@@ -0,0 +1,157 @@
+"""
+Condition predicates for workflow condition nodes.
+
+Conditions are compiled once, together with the workflow graph, so regexes
+and expected numbers are not parsed again on every evaluation.
+"""
+
+import re
+from typing import Any
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+NUMERIC_OPERATORS = {
+    "greater_than": lambda actual, expected: actual > expected,
+    "greater_than_or_equal": lambda actual, expected: actual >= expected,
+    "less_than": lambda actual, expected: actual < expected,
+    "less_than_or_equal": lambda actual, expected: actual <= expected,
+}
+
+
+def _parse_number(value: str) -> float:
+    return float(value) if value else 0
+
+
+def extract_text_from_events(events: list[Any]) -> str:
+    """Extracts text content from a list of events for comparison."""
+    extracted_texts = []
+    for event in events:
+        if hasattr(event, "content") and hasattr(event.content, "parts"):
+            extracted_texts.extend(
+                [part.text for part in event.content.parts if hasattr(part, "text") and part.text]
+            )
+
+    if extracted_texts:
+        joined_text = " ".join(extracted_texts)
+        logger.debug(f"  Extracted text from events: '{joined_text[:100]}...'")
+        return joined_text
+
+    return ""
+
+
+class ConditionState:
+    """State values read by the predicates of a single evaluation, extracted once."""
+
+    def __init__(self, state: dict[str, Any]):
+        self.state = state
+        self._values: dict[str, Any] = {}
+
+    def get(self, field: str) -> Any:
+        if field not in self._values:
+            value = self.state.get(field, "")
+            if field == "content" and isinstance(value, list) and value:
+                value = extract_text_from_events(value)
+            self._values[field] = value
+        return self._values[field]
+
+
+class ConditionPredicate:
+    """A workflow condition compiled into a reusable predicate."""
+
+    def __init__(self, condition: dict[str, Any]):
+        condition_data = condition.get("data", {})
+        self.id = condition.get("id")
+        self.type = condition.get("type")
+        self.field = condition_data.get("field")
+        self.operator = condition_data.get("operator")
+        self.expected_value = condition_data.get("value")
+        self.expected_str = str(self.expected_value) if self.expected_value is not None else ""
+        self.expected_lower = self.expected_str.lower()
+
+        self.pattern = None
+        self.pattern_error = False
+        if self.operator in ("matches", "not_matches"):
+            try:
+                self.pattern = re.compile(self.expected_str, re.IGNORECASE)
+            except re.error:
+                logger.warning(
+                    f"Invalid regular expression in condition {self.id}: '{self.expected_str}'"
+                )
+                self.pattern_error = True
+
+        self.expected_number = None
+        if self.operator in NUMERIC_OPERATORS:
+            try:
+                self.expected_number = _parse_number(self.expected_str)
+            except (ValueError, TypeError):
+                logger.warning(f"Invalid number in condition {self.id}: '{self.expected_str}'")
+
+    def describe(self) -> str:
+        return f"{self.field} {self.operator} '{self.expected_value}'"
+
+    def evaluate(self, values: ConditionState) -> bool:
+        """Evaluates the condition against the state values."""
+        if self.type != "previous-output":
+            return False
+
+        actual_value = values.get(self.field)
+        result = self._evaluate_operator(actual_value)
+        logger.debug(f"  Check '{self.operator}': {result}")
+        return result
+
+    def _evaluate_operator(self, actual_value: Any) -> bool:
+        operator = self.operator
+        actual_str = str(actual_value) if actual_value is not None else ""
+
+        # Definition checks
+        if operator == "is_defined":
+            return actual_value is not None and actual_value != ""
+        if operator == "is_not_defined":
+            return actual_value is None or actual_value == ""
+
+        # Equality checks
+        if operator == "equals":
+            return actual_str == self.expected_str
+        if operator == "not_equals":
+            return actual_str != self.expected_str
+
+        # Content checks
+        if operator == "contains":
+            return self.expected_lower in actual_str.lower()
+        if operator == "not_contains":
+            return self.expected_lower not in actual_str.lower()
+
+        # String pattern checks
+        if operator == "starts_with":
+            return actual_str.lower().startswith(self.expected_lower)
+        if operator == "ends_with":
+            return actual_str.lower().endswith(self.expected_lower)
+
+        # Numeric checks
+        if operator in NUMERIC_OPERATORS:
+            if self.expected_number is None:
+                return False
+            try:
+                actual_number = _parse_number(actual_str)
+            except (ValueError, TypeError):
+                logger.debug(
+                    f"  Error converting value for numeric comparison: '{actual_str[:100]}...'"
+                )
+                return False
+            return NUMERIC_OPERATORS[operator](actual_number, self.expected_number)
+
+        # Regex checks, an invalid pattern never matches
+        if operator in ("matches", "not_matches"):
+            if self.pattern_error:
+                return operator == "not_matches"
+            matched = bool(self.pattern.search(actual_str))
+            return matched if operator == "matches" else not matched
+
+        return False
+
+
+def compile_conditions(conditions: list[dict[str, Any]]) -> list[ConditionPredicate]:
+    """Compiles the conditions of a condition node."""
+    return [ConditionPredicate(condition) for condition in conditions]
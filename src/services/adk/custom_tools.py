@@ -2,9 +2,11 @@ import json
 import urllib.parse
 from typing import Any
 
-import requests
+import httpx
 from google.adk.tools import FunctionTool
 
+from src.services.adk.http_tool_cache import get_cache_policy, http_tool_cache
+from src.utils.http_client import get_http_client, host_slot
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -24,12 +26,13 @@ class CustomToolBuilder:
         parameters = tool_config.get("parameters", {}) or {}
         values = tool_config.get("values", {})
         error_handling = tool_config.get("error_handling", {})
+        cache_policy = get_cache_policy(tool_config.get("cache"))
 
         path_params = parameters.get("path_params") or {}
         query_params = parameters.get("query_params") or {}
         body_params = parameters.get("body_params") or {}
 
-        def http_tool(**kwargs):
+        async def http_tool(**kwargs):
             try:
                 # Combines default values with provided values
                 all_values = {**values, **kwargs}
@@ -80,27 +83,50 @@ class CustomToolBuilder:
                     ):
                         body_data[param] = value
 
-                # Makes the HTTP request
-                response = requests.request(
-                    method=method,
-                    url=url,
-                    headers=processed_headers,
-                    params=query_params_dict,
-                    json=body_data if body_data else None,
-                    timeout=error_handling.get("timeout", 30),
-                )
+                # Reuses a cached response when the tool opted in
+                cache_key = None
+                if cache_policy and method.upper() in (m.upper() for m in cache_policy.methods):
+                    cache_key = http_tool_cache.make_key(
+                        name,
+                        method,
+                        url,
+                        query_params_dict,
+                        body_data,
+                        processed_headers if cache_policy.include_headers else None,
+                    )
+                    cached_response = await http_tool_cache.get(name, cache_key)
+                    if cached_response is not None:
+                        return cached_response
+
+                # Makes the HTTP request on the shared client without blocking the loop
+                timeout = error_handling.get("timeout", 30)
+                async with host_slot(url, timeout):
+                    response = await get_http_client().request(
+                        method=method,
+                        url=url,
+                        headers=processed_headers,
+                        params=query_params_dict,
+                        json=body_data if body_data else None,
+                        timeout=timeout,
+                    )
 
                 if response.status_code >= 400:
-                    raise requests.exceptions.HTTPError(
-                        f"Error in the request: {response.status_code} - {response.text}"
+                    raise httpx.HTTPStatusError(
+                        f"Error in the request: {response.status_code} - {response.text}",
+                        request=response.request,
+                        response=response,
                     )
 
                 # Try to parse the response as JSON, if it fails, return the text content
                 try:
-                    return json.dumps(response.json())
+                    result = json.dumps(response.json())
                 except ValueError:
                     # Response is not JSON, return the text content
-                    return json.dumps({"content": response.text})
+                    result = json.dumps({"content": response.text})
+
+                if cache_key:
+                    await http_tool_cache.set(cache_key, result, cache_policy)
+                return result
 
             except Exception as e:
                 logger.error(f"Error executing tool {name}: {str(e)}")
@@ -0,0 +1,136 @@
+"""
+Response cache for HTTP custom tools.
+
+Tools opt in with a ``cache`` block in their configuration (see
+``HTTPToolCache``). Responses are shared between workers through Redis; when a Redis call fails,
+an in-process cache is used until Redis is retried.
+"""
+
+import hashlib
+import json
+import time
+from collections import defaultdict
+from typing import Any
+
+from src.config.redis import get_redis
+from src.config.settings import settings
+from src.schemas.agent_config import HTTPToolCache
+from src.utils.logger import setup_logger
+from src.utils.ttl_cache import TTLCache
+
+logger = setup_logger(__name__)
+
+KEY_PREFIX = "http_tool"
+
+
+def get_cache_policy(cache_config: Any) -> HTTPToolCache | None:
+    """Return the cache policy of a tool, or None when caching is off."""
+    if not cache_config:
+        return None
+    try:
+        policy = HTTPToolCache.model_validate(cache_config)
+    except ValueError as e:
+        logger.warning(f"Ignoring invalid HTTP tool cache configuration: {e}")
+        return None
+    return policy if policy.enabled else None
+
+
+class HttpToolResponseCache:
+    """Redis-backed cache of HTTP tool responses with an in-process fallback."""
+
+    def __init__(self, max_local_entries: int = 512, redis_retry_interval: float = 30.0):
+        # Entries carry their own expiry, the TTLCache TTL is only an upper bound
+        self._local = TTLCache(max_entries=max_local_entries, ttl=86400)
+        self.redis_retry_interval = redis_retry_interval
+        self._redis_retry_at = 0.0
+        self._hits: dict[str, int] = defaultdict(int)
+        self._misses: dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def make_key(
+        tool_name: str,
+        method: str,
+        url: str,
+        params: dict[str, Any],
+        body: dict[str, Any] | None,
+        headers: dict[str, Any] | None = None,
+    ) -> str:
+        """Build a cache key from the request that the tool is about to send."""
+        request = json.dumps(
+            [method.upper(), url, params, body, headers], sort_keys=True, default=str
+        )
+        return f"{KEY_PREFIX}:{tool_name}:{hashlib.sha256(request.encode()).hexdigest()}"
+
+    async def _redis(self):
+        """Return the Redis client, or None while Redis is considered down."""
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        try:
+            return await get_redis()
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+
+    def _redis_failed(self, error: Exception) -> None:
+        self._redis_retry_at = time.monotonic() + self.redis_retry_interval
+        logger.warning(f"Redis unavailable, HTTP tool responses are cached in process: {error}")
+
+    async def get(self, tool_name: str, key: str) -> str | None:
+        """Return a cached response, counting the hit or miss for the tool."""
+        value = None
+        redis_client = await self._redis()
+        if redis_client is not None:
+            try:
+                cached = await redis_client.get(key)
+                value = json.loads(cached) if cached else None
+            except Exception as e:
+                self._redis_failed(e)
+                redis_client = None
+
+        if redis_client is None:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                value = entry[1]
+
+        if value is None:
+            self._misses[tool_name] += 1
+            return None
+
+        self._hits[tool_name] += 1
+        return value
+
+    async def set(self, key: str, value: str, policy: HTTPToolCache) -> bool:
+        """Store a response unless it is larger than the policy allows."""
+        size = len(value.encode())
+        if size > policy.max_entry_size:
+            logger.debug(f"HTTP tool response too large to cache: {size} bytes")
+            return False
+
+        redis_client = await self._redis()
+        if redis_client is not None:
+            try:
+                # Same encoding as CacheService
+                await redis_client.setex(key, policy.ttl, json.dumps(value))
+                return True
+            except Exception as e:
+                self._redis_failed(e)
+
+        self._local.set(key, (time.monotonic() + policy.ttl, value))
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit and miss counts, in total and per tool."""
+        tools = sorted(set(self._hits) | set(self._misses))
+        return {
+            "hits": sum(self._hits.values()),
+            "misses": sum(self._misses.values()),
+            "local_entries": self._local.stats()["entries"],
+            "tools": {
+                tool: {"hits": self._hits[tool], "misses": self._misses[tool]} for tool in tools
+            },
+        }
+
+
+http_tool_cache = HttpToolResponseCache(
+    max_local_entries=settings.HTTP_TOOL_CACHE_LOCAL_MAX_ENTRIES,
+)
@@ -0,0 +1,300 @@
+"""
+Per-worker pool of long-lived MCP client sessions.
+
+Each pooled connection is owned by a dedicated task that enters the transport
+and session contexts and later exits them, so anyio cancel scopes are always
+closed in the task that opened them. Agent runs only lease connections.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any
+
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Opens a session inside the given exit stack and returns it with its tools
+SessionOpener = Callable[[AsyncExitStack], Awaitable[tuple[Any, list[Any]]]]
+
+
+class MCPPoolError(Exception):
+    """Raised when a pooled MCP connection cannot be provided."""
+
+
+def server_config_key(server_config: dict[str, Any]) -> str:
+    """Return a stable hash identifying an MCP server configuration."""
+    serialized = json.dumps(server_config, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class PooledConnection:
+    """A single MCP session kept open by its owner task."""
+
+    def __init__(self, key: str, opener: SessionOpener):
+        self.key = key
+        self.session = None
+        self.tools: list[Any] = []
+        self.leases = 0
+        self.healthy = True
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.last_health_check = self.created_at
+        self._opener = opener
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._error: BaseException | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def closed(self) -> bool:
+        return self._task is not None and self._task.done()
+
+    async def _run(self):
+        try:
+            async with AsyncExitStack() as exit_stack:
+                self.session, self.tools = await self._opener(exit_stack)
+                self._ready.set()
+                await self._closing.wait()
+        except BaseException as e:
+            self._error = e
+            if not isinstance(e, asyncio.CancelledError):
+                logger.warning(f"MCP pooled connection {self.key[:12]} closed with error: {e}")
+        finally:
+            self.healthy = False
+            self._ready.set()
+
+    async def start(self, timeout: float):
+        """Open the connection, failing if it is not ready within the timeout."""
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except TimeoutError as e:
+            await self.close()
+            raise MCPPoolError(f"Timed out after {timeout}s connecting to MCP server") from e
+        except asyncio.CancelledError:
+            # The caller gave up (e.g. a build deadline), do not leave the owner running
+            self._closing.set()
+            self._task.cancel()
+            raise
+
+        if self._error is not None or self.session is None:
+            raise MCPPoolError(f"Failed to connect to MCP server: {self._error}")
+
+    async def close(self):
+        """Ask the owner task to exit the session contexts and wait for it."""
+        self._closing.set()
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=10)
+        except (TimeoutError, asyncio.CancelledError):
+            self._task.cancel()
+        except Exception as e:
+            logger.debug(f"Error closing MCP pooled connection: {e}")
+
+
+class _ServerSlot:
+    """Connections and reconnect state for a single server configuration."""
+
+    def __init__(self):
+        self.connections: list[PooledConnection] = []
+        self.lock = asyncio.Lock()
+        self.failures = 0
+        self.retry_at = 0.0
+
+
+class MCPConnectionPool:
+    """Pool of MCP sessions keyed by server configuration hash."""
+
+    def __init__(
+        self,
+        max_sessions_per_server: int = 4,
+        max_leases_per_session: int = 16,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 60.0,
+        connect_timeout: float = 30.0,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ):
+        self.max_sessions_per_server = max_sessions_per_server
+        self.max_leases_per_session = max_leases_per_session
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.connect_timeout = connect_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._slots: dict[str, _ServerSlot] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._maintenance_task: asyncio.Task | None = None
+
+    def _ensure_loop(self):
+        """Bind the pool to the running loop, dropping state from a previous loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._slots = {}
+            self._maintenance_task = None
+            self._loop = loop
+
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = loop.create_task(self._maintenance_loop())
+
+    def _backoff_delay(self, failures: int) -> float:
+        delay = min(self.backoff_base * (2 ** (failures - 1)), self.backoff_max)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def acquire(self, key: str, opener: SessionOpener) -> PooledConnection:
+        """Lease a connection for a server, opening a new one if needed."""
+        self._ensure_loop()
+        slot = self._slots.setdefault(key, _ServerSlot())
+
+        async with slot.lock:
+            slot.connections = [c for c in slot.connections if not c.closed]
+            usable = [c for c in slot.connections if c.healthy]
+            least_loaded = min(usable, key=lambda c: c.leases, default=None)
+
+            can_open = len(slot.connections) < self.max_sessions_per_server
+            in_backoff = time.monotonic() < slot.retry_at
+
+            if least_loaded is not None and (
+                least_loaded.leases < self.max_leases_per_session or not can_open or in_backoff
+            ):
+                connection = least_loaded
+            elif in_backoff:
+                raise MCPPoolError(
+                    f"MCP server {key[:12]} is in reconnect backoff for "
+                    f"{slot.retry_at - time.monotonic():.1f}s"
+                )
+            elif not can_open:
+                raise MCPPoolError(
+                    f"MCP server {key[:12]} reached the limit of "
+                    f"{self.max_sessions_per_server} sessions"
+                )
+            else:
+                connection = PooledConnection(key, opener)
+                try:
+                    await connection.start(self.connect_timeout)
+                except Exception:
+                    slot.failures += 1
+                    slot.retry_at = time.monotonic() + self._backoff_delay(slot.failures)
+                    raise
+                slot.failures = 0
+                slot.retry_at = 0.0
+                slot.connections.append(connection)
+                logger.debug(
+                    f"Opened pooled MCP connection {key[:12]} "
+                    f"({len(slot.connections)}/{self.max_sessions_per_server})"
+                )
+
+            connection.leases += 1
+            connection.last_used = time.monotonic()
+            return connection
+
+    def release(self, connection: PooledConnection):
+        """Return a leased connection to the pool."""
+        connection.leases = max(connection.leases - 1, 0)
+        connection.last_used = time.monotonic()
+
+    def discard(self, connection: PooledConnection):
+        """Mark a connection as broken so it is not leased again."""
+        connection.healthy = False
+
+    @asynccontextmanager
+    async def lease(self, key: str, opener: SessionOpener):
+        """Lease a connection for the duration of the context."""
+        connection = await self.acquire(key, opener)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    async def _check_health(self, connection: PooledConnection):
+        from mcp.shared.exceptions import McpError
+
+        connection.last_health_check = time.monotonic()
+        try:
+            await asyncio.wait_for(connection.session.send_ping(), timeout=10)
+        except McpError:
+            # The server answered, it just does not implement ping
+            pass
+        except Exception as e:
+            logger.warning(f"MCP pooled connection {connection.key[:12]} failed health check: {e}")
+            self.discard(connection)
+
+    async def _maintenance_loop(self):
+        interval = max(min(self.health_check_interval, self.idle_timeout) / 2, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._run_maintenance()
+            except Exception as e:
+                logger.error(f"Error in MCP pool maintenance: {e}")
+
+    @staticmethod
+    def _remove(slot: _ServerSlot, connection: PooledConnection):
+        if connection in slot.connections:
+            slot.connections.remove(connection)
+
+    async def _run_maintenance(self):
+        """Evict idle or broken connections and health check the rest."""
+        now = time.monotonic()
+        for key, slot in list(self._slots.items()):
+            to_close = []
+            for connection in list(slot.connections):
+                if connection.closed:
+                    self._remove(slot, connection)
+                elif connection.leases == 0 and (
+                    not connection.healthy or now - connection.last_used > self.idle_timeout
+                ):
+                    self._remove(slot, connection)
+                    to_close.append(connection)
+                elif (
+                    connection.healthy
+                    and now - connection.last_health_check > self.health_check_interval
+                ):
+                    await self._check_health(connection)
+
+            for connection in to_close:
+                logger.debug(f"Closing idle MCP pooled connection {key[:12]}")
+                await connection.close()
+
+            if not slot.connections and now >= slot.retry_at:
+                self._slots.pop(key, None)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of connections and leases per server key."""
+        return {
+            key[:12]: {
+                "connections": len(slot.connections),
+                "leases": sum(c.leases for c in slot.connections),
+                "failures": slot.failures,
+            }
+            for key, slot in self._slots.items()
+        }
+
+    async def close(self):
+        """Close every pooled connection."""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+
+        slots, self._slots = self._slots, {}
+        for slot in slots.values():
+            for connection in slot.connections:
+                await connection.close()
+
+
+mcp_connection_pool = MCPConnectionPool(
+    max_sessions_per_server=settings.MCP_POOL_MAX_SESSIONS_PER_SERVER,
+    max_leases_per_session=settings.MCP_POOL_MAX_LEASES_PER_SESSION,
+    idle_timeout=settings.MCP_POOL_IDLE_TIMEOUT,
+    health_check_interval=settings.MCP_POOL_HEALTH_CHECK_INTERVAL,
+    connect_timeout=settings.MCP_POOL_CONNECT_TIMEOUT,
+    backoff_max=settings.MCP_POOL_BACKOFF_MAX,
+)
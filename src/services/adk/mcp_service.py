@@ -1,89 +1,323 @@
+import asyncio
+import copy
+import functools
 import os
 from contextlib import AsyncExitStack
 from typing import Any
 
+import anyio
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.mcp_tool import MCPTool
 from google.adk.tools.mcp_tool.mcp_toolset import (
     MCPToolset,
     SseServerParams,
     StdioServerParameters,
 )
+from mcp.client.session import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+from mcp.types import INVALID_PARAMS, METHOD_NOT_FOUND, ErrorData
+from mcp.types import Tool as McpBaseTool
 from sqlalchemy.orm import Session
 
+from src.config.settings import settings
+from src.services.adk.custom_home_mcp_transport import (
+    custom_home_mcp_client,
+    is_custom_home_mcp,
+)
+from src.services.adk.mcp_pool import SessionOpener, mcp_connection_pool, server_config_key
 from src.services.mcp_server_service import get_mcp_server
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 
+class PooledMCPTool(MCPTool):
+    """
+    MCP tool that leases a pooled session for every call instead of owning one.
+
+    The tool only needs its schema to be declared to the model, so it can be
+    built from the stored catalog before any connection to the server exists.
+    """
+
+    def __init__(self, mcp_tool: Any, server_key: str, opener: SessionOpener):
+        # MCPTool.__init__ requires a live session, which is resolved per call here
+        BaseTool.__init__(
+            self,
+            name=mcp_tool.name,
+            description=mcp_tool.description or "",
+        )
+        self.mcp_tool = mcp_tool
+        self.mcp_session = None
+        self.mcp_session_manager = None
+        self.auth_scheme = None
+        self.auth_credential = None
+        self._server_key = server_key
+        self._opener = opener
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: Any) -> Any:
+        async with mcp_connection_pool.lease(self._server_key, self._opener) as connection:
+            try:
+                return await self._call(connection, args)
+            except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                logger.warning(f"Pooled MCP session closed while calling {self.name}, retrying")
+                mcp_connection_pool.discard(connection)
+
+        # Retry once on a fresh connection
+        async with mcp_connection_pool.lease(self._server_key, self._opener) as connection:
+            return await self._call(connection, args)
+
+    async def _call(self, connection: Any, args: dict[str, Any]) -> Any:
+        """
+        Call the tool on a leased connection.
+
+        Tools declared from a stored catalog are not listed when the session
+        opens, so the server's tools are only listed again when the call fails
+        with the protocol's unknown-tool error, and the call is retried if the
+        tool is listed. The server did not run the tool in that case; tool
+        results flagged as errors are returned as they are, never retried.
+        """
+        try:
+            return await connection.session.call_tool(self.name, arguments=args)
+        except McpError as e:
+            if not _is_unknown_tool_error(e.error):
+                raise
+            error = e
+
+        logger.warning(f"MCP server reported tool {self.name} as unknown, listing its tools")
+        connection.tools = await MCPService._list_all_tools(connection.session)
+        if any(tool.name == self.name for tool in connection.tools):
+            return await connection.session.call_tool(self.name, arguments=args)
+        raise error
+
+
+def _is_unknown_tool_error(error: ErrorData) -> bool:
+    """Whether a JSON-RPC error says the called tool does not exist."""
+    if error.code == METHOD_NOT_FOUND:
+        return True
+    message = error.message.lower()
+    return error.code == INVALID_PARAMS and "unknown tool" in message
+
+
 class MCPService:
-    def __init__(self):
+    def __init__(self, mcp_servers: dict[str, Any] | None = None):
         self.tools = []
         self.exit_stack = AsyncExitStack()
+        # MCP server rows already loaded by the caller, keyed by id
+        self.mcp_servers = mcp_servers or {}
+
+    def _prepare_connection_params(
+        self, server_config: dict[str, Any]
+    ) -> SseServerParams | StdioServerParameters:
+        """Normalize the server configuration and build its connection parameters."""
+        # Determina o tipo de servidor (local ou remoto)
+        if "url" in server_config:
+            url = server_config["url"]
+            # Correção automática para Cloudflare Tunnel (remove a porta 8000 que costuma ser erro de input)
+            if "trycloudflare.com:8000" in url:
+                url = url.replace(":8000", "")
+                logger.info(f"Auto-fixed Cloudflare URL: {server_config['url']} -> {url}")
+                server_config["url"] = url
+
+            headers = server_config.get("headers", {})
+
+            # Extrai token da URL se presente
+            url_token = None
+            if "token=" in url:
+                import urllib.parse
+
+                parsed_url = urllib.parse.urlparse(url)
+                url_params = urllib.parse.parse_qs(parsed_url.query)
+                if "token" in url_params:
+                    url_token = url_params["token"][0]
+
+            # Sincronização bidirecional de autenticação:
+            # 1. Se tem token na URL mas não no Header, injeta no Header
+            if url_token and "Authorization" not in headers:
+                headers["Authorization"] = f"Bearer {url_token}"
+                server_config["headers"] = headers
+                logger.debug("Auto-injected token from URL into Authorization header")
+
+            # 2. Se tem token no Header mas não na URL, injeta na URL (necessário para alguns transportes)
+            elif "Authorization" in headers and not url_token:
+                auth_val = headers["Authorization"]
+                if auth_val.startswith("Bearer "):
+                    token = auth_val.replace("Bearer ", "")
+                    separator = "&" if "?" in url else "?"
+                    url = f"{url}{separator}token={token}"
+                    server_config["url"] = url
+                    logger.debug("Auto-injected token from headers into URL query param")
+
+            connection_params = SseServerParams(url=url, headers=headers)
+        else:
+            # Local server (Stdio)
+            command = server_config.get("command", "npx")
+            args = server_config.get("args", [])
+
+            # Adds environment variables if specified
+            env = server_config.get("env", {})
+            if env:
+                for key, value in env.items():
+                    os.environ[key] = value
+
+            connection_params = StdioServerParameters(command=command, args=args, env=env)
+
+        return connection_params
+
+    async def _open_session(
+        self,
+        server_config: dict[str, Any],
+        connection_params: SseServerParams | StdioServerParameters,
+        exit_stack: AsyncExitStack,
+    ) -> ClientSession:
+        """Open the transport and an initialized MCP session inside the exit stack."""
+        if "url" in server_config and is_custom_home_mcp(server_config["url"]):
+            client_context = custom_home_mcp_client(
+                url=server_config["url"],
+                headers=server_config.get("headers", {}),
+                # Tools discovery should be fast, but give some room for many tools
+                timeout=300,
+            )
+        elif "url" in server_config:
+            client_context = sse_client(
+                url=connection_params.url,
+                headers=connection_params.headers,
+            )
+        else:
+            client_context = stdio_client(connection_params)
+
+        transports = await exit_stack.enter_async_context(client_context)
+        session = await exit_stack.enter_async_context(ClientSession(*transports))
+
+        # Handshake with timeout
+        logger.debug("Initializing MCP session...")
+        with anyio.fail_after(10):
+            await session.initialize()
+
+        return session
+
+    @staticmethod
+    async def _list_all_tools(session: ClientSession) -> list[Any]:
+        """List the tools advertised by an MCP session, following pagination."""
+        all_mcp_tools = []
+        cursor = None
+        page_count = 0
+        while True:
+            page_count += 1
+            logger.debug(f"Fetching MCP tools page {page_count} (cursor={cursor})...")
+            with anyio.fail_after(15):
+                tools_result = await session.list_tools(cursor=cursor)
+
+            batch_size = len(tools_result.tools)
+            all_mcp_tools.extend(tools_result.tools)
+
+            cursor = tools_result.nextCursor
+            logger.debug(f"Page {page_count} received {batch_size} tools. Next cursor: {cursor}")
+
+            if not cursor:
+                break
+
+            # Safety break to prevent infinite loops if server is broken
+            if page_count > 50:
+                logger.warning("Reached 50 pages limit, stopping pagination safety break.")
+                break
+
+        return all_mcp_tools
+
+    async def _open_pooled_session(
+        self,
+        server_config: dict[str, Any],
+        connection_params: SseServerParams | StdioServerParameters,
+        exit_stack: AsyncExitStack,
+        list_tools: bool = True,
+    ) -> tuple[ClientSession, list[Any]]:
+        """
+        Session opener used by the connection pool.
+
+        Sessions opened for tools of the stored catalog skip listing the tools.
+        """
+        session = await self._open_session(server_config, connection_params, exit_stack)
+        return session, await self._list_all_tools(session) if list_tools else []
+
+    async def _lease_pooled_tools(
+        self, server_config: dict[str, Any]
+    ) -> tuple[list[Any], AsyncExitStack]:
+        """Lease a pooled session for the server and wrap its tools."""
+        connection_params = self._prepare_connection_params(server_config)
+        opener = functools.partial(self._open_pooled_session, server_config, connection_params)
+
+        connection = await mcp_connection_pool.acquire(server_config_key(server_config), opener)
+
+        # Closing the run's exit stack only returns the lease to the pool
+        exit_stack = AsyncExitStack()
+        exit_stack.callback(mcp_connection_pool.release, connection)
+
+        # The session may have been opened for catalog tools, without listing them
+        if not connection.tools:
+            try:
+                connection.tools = await self._list_all_tools(connection.session)
+            except BaseException:
+                await exit_stack.aclose()
+                raise
+
+        tools = [PooledMCPTool(tool, connection.key, opener) for tool in connection.tools]
+        return tools, exit_stack
+
+    def _catalog_tools(
+        self, mcp_server: Any, server_config: dict[str, Any]
+    ) -> list[PooledMCPTool] | None:
+        """
+        Build tools from the catalog stored on the MCP server row.
+
+        Returns None when the catalog is missing, lacks input schemas or was
+        discovered from a different configuration, so the caller falls back
+        to live discovery. No connection is opened until a tool is invoked.
+        """
+        if not (settings.MCP_POOL_ENABLED and settings.MCP_TOOLS_FROM_CATALOG):
+            return None
+
+        catalog = mcp_server.tools or []
+        if not catalog or any(not entry.get("inputSchema") for entry in catalog):
+            return None
+
+        if mcp_server.tools_hash != server_config_key(mcp_server.config_json or {}):
+            logger.debug(f"Stored tool catalog for {mcp_server.name} is stale, listing live")
+            return None
+
+        connection_params = self._prepare_connection_params(server_config)
+        opener = functools.partial(
+            self._open_pooled_session, server_config, connection_params, list_tools=False
+        )
+        server_key = server_config_key(server_config)
+
+        return [
+            PooledMCPTool(
+                McpBaseTool(
+                    name=entry["name"],
+                    description=entry.get("description") or "",
+                    inputSchema=entry["inputSchema"],
+                ),
+                server_key,
+                opener,
+            )
+            for entry in catalog
+        ]
+
+    async def _connect_server(
+        self, server_config: dict[str, Any]
+    ) -> tuple[list[Any], AsyncExitStack | None]:
+        """Get the tools of a server, from the connection pool when enabled."""
+        if settings.MCP_POOL_ENABLED:
+            return await self._lease_pooled_tools(server_config)
+        return await self._connect_to_mcp_server(server_config)
 
     async def _connect_to_mcp_server(
         self, server_config: dict[str, Any]
     ) -> tuple[list[Any], AsyncExitStack | None]:
         """Connect to a specific MCP server and return its tools."""
         try:
-            # Determina o tipo de servidor (local ou remoto)
-            if "url" in server_config:
-                url = server_config["url"]
-                # Correção automática para Cloudflare Tunnel (remove a porta 8000 que costuma ser erro de input)
-                if "trycloudflare.com:8000" in url:
-                    url = url.replace(":8000", "")
-                    logger.info(f"Auto-fixed Cloudflare URL: {server_config['url']} -> {url}")
-                    server_config["url"] = url
-
-                headers = server_config.get("headers", {})
-
-                # Extrai token da URL se presente
-                url_token = None
-                if "token=" in url:
-                    import urllib.parse
-
-                    parsed_url = urllib.parse.urlparse(url)
-                    url_params = urllib.parse.parse_qs(parsed_url.query)
-                    if "token" in url_params:
-                        url_token = url_params["token"][0]
-
-                # Sincronização bidirecional de autenticação:
-                # 1. Se tem token na URL mas não no Header, injeta no Header
-                if url_token and "Authorization" not in headers:
-                    headers["Authorization"] = f"Bearer {url_token}"
-                    server_config["headers"] = headers
-                    logger.debug("Auto-injected token from URL into Authorization header")
-
-                # 2. Se tem token no Header mas não na URL, injeta na URL (necessário para alguns transportes)
-                elif "Authorization" in headers and not url_token:
-                    auth_val = headers["Authorization"]
-                    if auth_val.startswith("Bearer "):
-                        token = auth_val.replace("Bearer ", "")
-                        separator = "&" if "?" in url else "?"
-                        url = f"{url}{separator}token={token}"
-                        server_config["url"] = url
-                        logger.debug("Auto-injected token from headers into URL query param")
-
-                connection_params = SseServerParams(url=url, headers=headers)
-            else:
-                # Local server (Stdio)
-                command = server_config.get("command", "npx")
-                args = server_config.get("args", [])
-
-                # Adds environment variables if specified
-                env = server_config.get("env", {})
-                if env:
-                    for key, value in env.items():
-                        os.environ[key] = value
-
-                connection_params = StdioServerParameters(command=command, args=args, env=env)
-
-            # Check if this is a CustomHomeMCP server (non-standard SSE pattern)
-            from mcp.client.session import ClientSession
-
-            from src.services.adk.custom_home_mcp_transport import (
-                custom_home_mcp_client,
-                is_custom_home_mcp,
-            )
+            connection_params = self._prepare_connection_params(server_config)
 
             if "url" in server_config and is_custom_home_mcp(server_config["url"]):
                 # Redact token from URL for logging
@@ -99,56 +333,16 @@ class MCPService:
                 exit_stack = AsyncExitStack()
                 all_mcp_tools = []
                 try:
-                    import anyio
-
-                    client_context = custom_home_mcp_client(
-                        url=server_config["url"],
-                        headers=server_config.get("headers", {}),
-                        # Tools discovery should be fast, but give some room for many tools
-                        timeout=300,
-                    )
-                    transports = await exit_stack.enter_async_context(client_context)
-                    session = await exit_stack.enter_async_context(ClientSession(*transports))
-
-                    # Handshake with timeout
-                    logger.debug("Initializing MCP session...")
-                    async with anyio.fail_after(10):
-                        await session.initialize()
+                    session = await self._open_session(server_config, connection_params, exit_stack)
 
                     # List tools from the session with pagination
-                    cursor = None
-                    page_count = 0
-                    while True:
-                        page_count += 1
-                        logger.debug(f"Fetching MCP tools page {page_count} (cursor={cursor})...")
-                        async with anyio.fail_after(15):
-                            tools_result = await session.list_tools(cursor=cursor)
-
-                        batch_size = len(tools_result.tools)
-                        all_mcp_tools.extend(tools_result.tools)
-
-                        cursor = tools_result.nextCursor
-                        logger.debug(
-                            f"Page {page_count} received {batch_size} tools. Next cursor: {cursor}"
-                        )
-
-                        if not cursor:
-                            break
-
-                        # Safety break to prevent infinite loops if server is broken
-                        if page_count > 50:
-                            logger.warning(
-                                "Reached 50 pages limit, stopping pagination safety break."
-                            )
-                            break
+                    all_mcp_tools = await self._list_all_tools(session)
                 except (TimeoutError, Exception) as e:
                     logger.warning(f"Failed to connect or list tools from custom MCP server: {e}")
                     # If we already have some tools, we can continue, but usually [] is safer if failed early
                     if not all_mcp_tools:
                         return [], None
 
-                from google.adk.tools.mcp_tool import MCPTool
-
                 tools = [
                     MCPTool(
                         mcp_tool=tool,
@@ -241,6 +435,160 @@ class MCPService:
 
         return filtered_tools
 
+    def _collect_server_jobs(
+        self, mcp_config: dict[str, Any], db: Session
+    ) -> list[dict[str, Any]]:
+        """Resolve the configured MCP servers into connection jobs."""
+        jobs = []
+
+        mcp_servers = mcp_config.get("mcp_servers", [])
+        if mcp_servers is not None:
+            for server in mcp_servers:
+                try:
+                    # Search for the MCP server in the database
+                    mcp_server = self.mcp_servers.get(str(server["id"])) or get_mcp_server(
+                        db, server["id"]
+                    )
+                    if not mcp_server:
+                        logger.warning(f"MCP Server not found: {server['id']}")
+                        continue
+
+                    # Prepares the server configuration without touching the stored one
+                    server_config = copy.deepcopy(mcp_server.config_json)
+
+                    # Replaces the environment variables in the config_json
+                    if "env" in server_config and server_config["env"] is not None:
+                        for key, value in server_config["env"].items():
+                            if value and value.startswith("env@@"):
+                                env_key = value.replace("env@@", "")
+                                if server.get("envs") and env_key in server.get("envs", {}):
+                                    server_config["env"][key] = server["envs"][env_key]
+                                else:
+                                    logger.warning(
+                                        f"Environment variable '{env_key}' not provided for the MCP server {mcp_server.name}"
+                                    )
+                                    continue
+
+                    jobs.append(
+                        {
+                            "label": mcp_server.name,
+                            "config": server_config,
+                            "mcp_server": mcp_server,
+                            "agent_tools": server.get("tools", []),
+                        }
+                    )
+                except Exception as e:
+                    logger.error(f"Error preparing MCP server {server.get('id', 'unknown')}: {e}")
+
+        custom_mcp_servers = mcp_config.get("custom_mcp_servers", [])
+        if custom_mcp_servers is not None:
+            for server in custom_mcp_servers:
+                if not server:
+                    logger.warning("Empty server configuration found in custom_mcp_servers")
+                    continue
+                jobs.append(
+                    {
+                        "label": f"custom {server.get('url', 'unknown')}",
+                        "config": server,
+                        "mcp_server": None,
+                        "agent_tools": [],
+                    }
+                )
+
+        return jobs
+
+    async def _connect_job(self, job: dict[str, Any]) -> tuple[list[Any], AsyncExitStack | None]:
+        """Get the tools for a single connection job."""
+        if job["mcp_server"] is not None:
+            catalog_tools = self._catalog_tools(job["mcp_server"], job["config"])
+            if catalog_tools is not None:
+                logger.debug(f"Using stored tool catalog for {job['label']}")
+                return catalog_tools, AsyncExitStack()
+
+        logger.debug(f"Connecting to MCP server: {job['label']}")
+        return await self._connect_server(job["config"])
+
+    async def _connect_concurrently(
+        self, jobs: list[dict[str, Any]]
+    ) -> list[tuple[list[Any], AsyncExitStack | None] | None]:
+        """
+        Connect to the servers concurrently with per-server and overall deadlines.
+
+        Only used with the connection pool: pooled sessions are owned by their
+        own tasks, so leasing them from separate tasks is safe. Servers that miss
+        a deadline are dropped with a warning instead of stalling the run.
+        """
+        semaphore = asyncio.Semaphore(max(settings.MCP_BUILD_CONCURRENCY, 1))
+        server_deadline = settings.MCP_SERVER_CONNECT_DEADLINE
+
+        async def connect(job: dict[str, Any]):
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(self._connect_job(job), timeout=server_deadline)
+                except TimeoutError:
+                    logger.warning(
+                        f"MCP server {job['label']} missed its {server_deadline}s deadline, skipping it"
+                    )
+                except Exception as e:
+                    logger.error(f"Error connecting to MCP server {job['label']}: {e}")
+                return None
+
+        tasks = [asyncio.create_task(connect(job)) for job in jobs]
+        if not tasks:
+            return []
+
+        _, pending = await asyncio.wait(tasks, timeout=settings.MCP_BUILD_DEADLINE)
+        for job, task in zip(jobs, tasks, strict=True):
+            if task in pending:
+                logger.warning(
+                    f"MCP server {job['label']} missed the {settings.MCP_BUILD_DEADLINE}s "
+                    "tool build deadline, skipping it"
+                )
+                task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return [None if task.cancelled() else task.result() for task in tasks]
+
+    async def _connect_sequentially(
+        self, jobs: list[dict[str, Any]]
+    ) -> list[tuple[list[Any], AsyncExitStack | None] | None]:
+        """
+        Connect to the servers one at a time within the per-server and overall deadlines.
+
+        Unpooled sessions are entered in the calling task and must be exited
+        there too, so they cannot be opened from concurrent tasks. For the
+        same reason the per-server deadline is a cancel scope of the calling
+        task rather than asyncio.wait_for, which runs the job in a new task.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.MCP_BUILD_DEADLINE
+        server_deadline = settings.MCP_SERVER_CONNECT_DEADLINE
+        results = []
+
+        for job in jobs:
+            if loop.time() >= deadline:
+                logger.warning(
+                    f"MCP tool build deadline of {settings.MCP_BUILD_DEADLINE}s reached, "
+                    f"skipping MCP server {job['label']}"
+                )
+                results.append(None)
+                continue
+
+            try:
+                with anyio.fail_after(min(server_deadline, deadline - loop.time())):
+                    results.append(await self._connect_job(job))
+            except TimeoutError:
+                logger.warning(
+                    f"MCP server {job['label']} missed its {server_deadline}s deadline, skipping it"
+                )
+                results.append(None)
+            except Exception as e:
+                logger.error(f"Error connecting to MCP server {job['label']}: {e}")
+                results.append(None)
+
+        return results
+
     async def build_tools(
         self, mcp_config: dict[str, Any], db: Session
     ) -> tuple[list[Any], AsyncExitStack]:
@@ -249,96 +597,39 @@ class MCPService:
         self.exit_stack = AsyncExitStack()
 
         try:
-            mcp_servers = mcp_config.get("mcp_servers", [])
-            if mcp_servers is not None:
-                # Process each MCP server in the configuration
-                for server in mcp_servers:
-                    try:
-                        # Search for the MCP server in the database
-                        mcp_server = get_mcp_server(db, server["id"])
-                        if not mcp_server:
-                            logger.warning(f"MCP Server not found: {server['id']}")
-                            continue
-
-                        # Prepares the server configuration
-                        server_config = mcp_server.config_json.copy()
-
-                        # Replaces the environment variables in the config_json
-                        if "env" in server_config and server_config["env"] is not None:
-                            for key, value in server_config["env"].items():
-                                if value and value.startswith("env@@"):
-                                    env_key = value.replace("env@@", "")
-                                    if server.get("envs") and env_key in server.get("envs", {}):
-                                        server_config["env"][key] = server["envs"][env_key]
-                                    else:
-                                        logger.warning(
-                                            f"Environment variable '{env_key}' not provided for the MCP server {mcp_server.name}"
-                                        )
-                                        continue
-
-                        logger.debug(f"Connecting to MCP server: {mcp_server.name}")
-                        tools, exit_stack = await self._connect_to_mcp_server(server_config)
-
-                        if tools and exit_stack:
-                            # Filters incompatible tools
-                            filtered_tools = self._filter_incompatible_tools(tools)
-
-                            # Filters tools compatible with the agent
-                            agent_tools = server.get("tools", [])
-                            if agent_tools:
-                                filtered_tools = self._filter_tools_by_agent(
-                                    filtered_tools, agent_tools
-                                )
-                            self.tools.extend(filtered_tools)
-
-                            # Registers the exit_stack with the AsyncExitStack
-                            await self.exit_stack.enter_async_context(exit_stack)
-                            logger.debug(
-                                f"MCP Server {mcp_server.name} connected successfully. Added {len(filtered_tools)} tools."
-                            )
-                        else:
-                            logger.warning(
-                                f"Failed to connect or no tools available for {mcp_server.name}"
-                            )
-
-                    except Exception as e:
-                        logger.error(
-                            f"Error connecting to MCP server {server.get('id', 'unknown')}: {e}"
-                        )
-                        continue
+            jobs = self._collect_server_jobs(mcp_config, db)
+            if settings.MCP_POOL_ENABLED:
+                results = await self._connect_concurrently(jobs)
+            else:
+                results = await self._connect_sequentially(jobs)
 
-            custom_mcp_servers = mcp_config.get("custom_mcp_servers", [])
-            if custom_mcp_servers is not None:
-                # Process custom MCP servers
-                for server in custom_mcp_servers:
-                    if not server:
-                        logger.warning("Empty server configuration found in custom_mcp_servers")
-                        continue
+            # Registers the results in configuration order
+            for job, result in zip(jobs, results, strict=True):
+                if result is None:
+                    continue
 
-                    try:
-                        logger.debug(
-                            f"Connecting to custom MCP server: {server.get('url', 'unknown')}"
-                        )
-                        tools, exit_stack = await self._connect_to_mcp_server(server)
-
-                        if tools:
-                            self.tools.extend(tools)
-                        else:
-                            logger.warning("No tools returned from custom MCP server")
-                            continue
-
-                        if exit_stack:
-                            await self.exit_stack.enter_async_context(exit_stack)
-                            logger.debug(
-                                f"Custom MCP server connected successfully. Added {len(tools)} tools."
-                            )
-                        else:
-                            logger.warning("No exit_stack returned from custom MCP server")
-                    except Exception as e:
-                        logger.error(
-                            f"Error connecting to custom MCP server {server.get('url', 'unknown')}: {e}"
-                        )
-                        continue
+                tools, exit_stack = result
+                if not tools or not exit_stack:
+                    logger.warning(f"Failed to connect or no tools available for {job['label']}")
+                    if exit_stack:
+                        await exit_stack.aclose()
+                    continue
+
+                if job["mcp_server"] is not None:
+                    # Filters incompatible tools
+                    tools = self._filter_incompatible_tools(tools)
+
+                    # Filters tools compatible with the agent
+                    if job["agent_tools"]:
+                        tools = self._filter_tools_by_agent(tools, job["agent_tools"])
+
+                self.tools.extend(tools)
+
+                # Registers the exit_stack with the AsyncExitStack
+                await self.exit_stack.enter_async_context(exit_stack)
+                logger.debug(
+                    f"MCP Server {job['label']} connected successfully. Added {len(tools)} tools."
+                )
 
             logger.debug(f"MCP Toolset created successfully. Total of {len(self.tools)} tools.")
 
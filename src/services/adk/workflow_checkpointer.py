@@ -0,0 +1,140 @@
+"""
+Postgres checkpointer for workflow runs.
+
+Every completed node of a workflow run is saved by LangGraph under a thread
+made of the agent, session and invocation ids, so a failed or interrupted run
+can continue from its last completed node instead of starting over.
+Successful runs delete their thread; the threads of failed or abandoned runs
+are deleted by a periodic job once their last checkpoint is older than
+WORKFLOW_CHECKPOINT_TTL.
+"""
+
+import asyncio
+import re
+import weakref
+from datetime import UTC, datetime, timedelta
+
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+try:
+    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+
+    HAS_POSTGRES_SAVER = True
+except ImportError:
+    HAS_POSTGRES_SAVER = False
+
+_savers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Future]" = (
+    weakref.WeakKeyDictionary()
+)
+_pruner: asyncio.Task | None = None
+
+# Threads whose most recent checkpoint was written before the cutoff. The ISO
+# timestamps of LangGraph checkpoints are all UTC, so they compare as text.
+STALE_THREADS_QUERY = """
+SELECT thread_id FROM checkpoints
+GROUP BY thread_id
+HAVING max(checkpoint->>'ts') < %s
+"""
+
+
+def workflow_thread_id(agent_id: str, session_id: str, invocation_id: str) -> str:
+    """Return the checkpoint thread of a workflow run."""
+    return f"{agent_id}:{session_id}:{invocation_id}"
+
+
+def _connection_string() -> str:
+    # psycopg takes plain postgresql:// URLs, without a SQLAlchemy driver suffix
+    return re.sub(r"^postgresql\+\w+://", "postgresql://", settings.POSTGRES_CONNECTION_STRING)
+
+
+async def _create_saver():
+    pool = AsyncConnectionPool(
+        conninfo=_connection_string(),
+        max_size=settings.WORKFLOW_CHECKPOINT_POOL_SIZE,
+        kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+        open=False,
+    )
+    await pool.open()
+    saver = AsyncPostgresSaver(pool)
+    # Creates or migrates the LangGraph checkpoint tables
+    await saver.setup()
+    return saver
+
+
+async def get_workflow_checkpointer():
+    """
+    Return the checkpointer of the running event loop, or None when disabled.
+
+    Workflows run without checkpoints when the saver cannot be created.
+    """
+    if not settings.WORKFLOW_CHECKPOINT_ENABLED:
+        return None
+    if not HAS_POSTGRES_SAVER:
+        logger.warning("langgraph-checkpoint-postgres is not installed, workflows not checkpointed")
+        return None
+
+    loop = asyncio.get_running_loop()
+    future = _savers.get(loop)
+    if future is None:
+        future = _savers[loop] = loop.create_task(_create_saver())
+
+    try:
+        return await asyncio.shield(future)
+    except Exception as e:
+        _savers.pop(loop, None)
+        logger.error(f"Could not create the workflow checkpointer: {e}")
+        return None
+
+
+async def delete_stale_checkpoints(max_age: float) -> int:
+    """Delete the threads whose last checkpoint is older than ``max_age`` seconds."""
+    saver = await get_workflow_checkpointer()
+    if saver is None:
+        return 0
+
+    cutoff = (datetime.now(UTC) - timedelta(seconds=max_age)).isoformat()
+    async with saver.conn.connection() as conn:
+        cursor = await conn.execute(STALE_THREADS_QUERY, (cutoff,))
+        rows = await cursor.fetchall()
+
+    for row in rows:
+        await saver.adelete_thread(row["thread_id"])
+    if rows:
+        logger.info(f"Deleted the checkpoints of {len(rows)} stale workflow runs")
+    return len(rows)
+
+
+async def _prune_loop():
+    while True:
+        await asyncio.sleep(settings.WORKFLOW_CHECKPOINT_PRUNE_INTERVAL)
+        try:
+            await delete_stale_checkpoints(settings.WORKFLOW_CHECKPOINT_TTL)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Could not delete stale workflow checkpoints: {e}")
+
+
+def start_checkpoint_pruning() -> None:
+    """Start deleting stale checkpoint threads periodically on the running loop."""
+    global _pruner
+    if settings.WORKFLOW_CHECKPOINT_ENABLED and (_pruner is None or _pruner.done()):
+        _pruner = asyncio.get_running_loop().create_task(_prune_loop())
+
+
+async def close_workflow_checkpointer() -> None:
+    """Stop the pruning job and close the connection pool of the running event loop."""
+    global _pruner
+    if _pruner is not None:
+        _pruner.cancel()
+        _pruner = None
+
+    future = _savers.pop(asyncio.get_running_loop(), None)
+    if future is None or not future.done() or future.cancelled() or future.exception():
+        return
+    await future.result().conn.close()
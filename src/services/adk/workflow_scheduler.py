@@ -0,0 +1,193 @@
+"""
+Durable timers for workflow delay nodes.
+
+A long delay does not keep the run waiting in memory: the delay node stores
+a resume record in Redis and the run ends. Every worker polls a sorted set of
+wake-up times, claims the due records and continues those workflows from
+their delay node, appending the new events to the session. A failed resume is
+retried from the checkpoint of its last attempt, so completed nodes do not run
+twice.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any
+
+from src.config.redis import get_redis
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+QUEUE_KEY = "workflow_delay:queue"
+RECORD_KEY = "workflow_delay:{}"
+
+# Claims the due records by moving their score to the end of the lease, so a
+# record whose worker died becomes due again once the lease expires
+CLAIM_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[3])
+for _, member in ipairs(due) do
+    redis.call('ZADD', KEYS[1], ARGV[2], member)
+end
+return due
+"""
+
+
+class WorkflowDelayScheduler:
+    """Redis sorted-set timer wheel that resumes delayed workflows."""
+
+    def __init__(
+        self,
+        poll_interval: float = 5.0,
+        lease: float = 3600.0,
+        batch_size: int = 10,
+        max_attempts: int = 3,
+    ):
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self._task: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+
+    async def schedule(self, record: dict[str, Any], wake_at: float) -> bool:
+        """
+        Store a resume record to be run at ``wake_at`` (epoch seconds).
+
+        Returns False when Redis is unavailable, the caller then waits in process.
+        """
+        record = {**record, "id": str(uuid.uuid4()), "attempts": 0}
+        try:
+            redis_client = await get_redis()
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.set(RECORD_KEY.format(record["id"]), json.dumps(record))
+                pipe.zadd(QUEUE_KEY, {record["id"]: wake_at})
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not schedule workflow delay, waiting in process: {e}")
+            return False
+
+        logger.info(f"Workflow {record.get('agent_id')} delayed, resumes at {wake_at:.0f}")
+        return True
+
+    def start(self):
+        """Start polling for due records on the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._poll_loop())
+
+    async def stop(self):
+        """Stop polling. Records being resumed are claimed again after their lease."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in list(self._running):
+            task.cancel()
+
+    async def _poll_loop(self):
+        while True:
+            try:
+                await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Workflow delay poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _poll(self):
+        redis_client = await get_redis()
+        now = time.time()
+        record_ids = await redis_client.eval(
+            CLAIM_SCRIPT, 1, QUEUE_KEY, now, now + self.lease, self.batch_size
+        )
+        for record_id in record_ids:
+            task = asyncio.create_task(self._run_record(record_id))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_record(self, record_id: str):
+        redis_client = await get_redis()
+        record_key = RECORD_KEY.format(record_id)
+        payload = await redis_client.get(record_key)
+        if payload is None:
+            await redis_client.zrem(QUEUE_KEY, record_id)
+            return
+
+        record = json.loads(payload)
+        try:
+            await self._resume(record)
+        except Exception as e:
+            # Imported here, the workflow agent depends on this module
+            from src.services.adk.custom_agents.workflow_agent import WorkflowResumeError
+
+            record["attempts"] = record.get("attempts", 0) + 1
+            # A run that cannot continue from a checkpoint would repeat its events
+            if record["attempts"] < self.max_attempts and not isinstance(e, WorkflowResumeError):
+                logger.warning(
+                    f"Error resuming delayed workflow {record_id} "
+                    f"(attempt {record['attempts']}): {e}"
+                )
+                await redis_client.set(record_key, json.dumps(record))
+                await redis_client.zadd(QUEUE_KEY, {record_id: time.time() + self.poll_interval})
+                return
+            logger.error(f"Giving up on delayed workflow {record_id}: {e}")
+
+        await redis_client.zrem(QUEUE_KEY, record_id)
+        await redis_client.delete(record_key)
+
+    async def _resume(self, record: dict[str, Any]):
+        """Rebuild the workflow agent and continue the run from its delay node."""
+        # Imported here, the workflow agent depends on this module
+        from src.config.database import SessionLocal
+        from src.core.exceptions import AgentNotFoundError
+        from src.services.adk.agent_builder import AgentBuilder
+        from src.services.adk.agent_runner import run_workflow_events
+        from src.services.adk.custom_agents.workflow_agent import WorkflowAgent
+        from src.services.agent_service import get_agent
+        from src.services.service_providers import (
+            artifacts_service,
+            memory_service,
+            session_service,
+        )
+
+        session = session_service.get_session(
+            app_name=record["app_name"],
+            user_id=record["user_id"],
+            session_id=record["session_id"],
+        )
+        if session is None:
+            raise ValueError(f"Session {record['session_id']} no longer exists")
+
+        db = SessionLocal()
+        exit_stack = None
+        try:
+            agent = get_agent(db, record["agent_id"])
+            if agent is None:
+                raise AgentNotFoundError(record["agent_id"])
+
+            workflow_agent, exit_stack = await AgentBuilder(db).build_agent(agent)
+            if not isinstance(workflow_agent, WorkflowAgent):
+                raise ValueError(f"Agent {record['agent_id']} is no longer a workflow agent")
+
+            logger.info(f"Resuming workflow {record['agent_id']} from node {record['node_id']}")
+            await run_workflow_events(
+                workflow_agent,
+                session,
+                session_service,
+                artifacts_service,
+                memory_service,
+                lambda ctx: workflow_agent.resume(
+                    ctx, record["node_id"], record["state"], resume_id=record["id"]
+                ),
+            )
+        finally:
+            if exit_stack:
+                await exit_stack.aclose()
+            db.close()
+
+
+workflow_delay_scheduler = WorkflowDelayScheduler(
+    poll_interval=settings.WORKFLOW_DELAY_POLL_INTERVAL,
+    lease=settings.WORKFLOW_DELAY_LEASE,
+)
@@ -1,20 +1,32 @@
+import copy
 import logging
 import uuid
+from dataclasses import dataclass, field
 from typing import Any, Optional
 
 import httpx
 from fastapi import HTTPException, status
+from sqlalchemy import inspect
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
 
-from src.models.models import Agent, AgentFolder, ApiKey
+from src.config.settings import settings
+from src.models.models import Agent, AgentFolder, ApiKey, MCPServer
+from src.repositories.agent_repository import AgentRepository
 from src.schemas.schemas import AgentCreate
+from src.services.adk.agent_cache import built_agent_cache
 from src.services.mcp_server_service import get_mcp_server
-from src.repositories.agent_repository import AgentRepository
-from src.core.exceptions import ResourceNotFoundError
+from src.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Per-worker cache of agent columns; other workers see changes after the TTL
+_agent_row_cache = TTLCache(
+    max_entries=settings.AGENT_ROW_CACHE_MAX_ENTRIES,
+    ttl=settings.AGENT_ROW_CACHE_TTL,
+)
+
 
 # Helper function to generate API keys
 def generate_api_key() -> str:
@@ -62,6 +74,35 @@ def validate_sub_agents(db: Session, sub_agents: list[uuid.UUID | str]) -> bool:
     return True
 
 
+def normalize_agent_name(name: str | None) -> str | None:
+    """Replace spaces and special characters in an agent name with underscores"""
+    if not name:
+        return name
+    return "".join(c if c.isalnum() or c == "_" else "_" for c in name)
+
+
+def invalidate_agent_cache(agent_id: uuid.UUID | str) -> None:
+    """Drop an agent from the row cache and every built tree that contains it"""
+    _agent_row_cache.pop(str(agent_id))
+    built_agent_cache.invalidate(agent_id)
+
+
+def _get_cached_agent(db: Session, agent_id: uuid.UUID) -> Agent | None:
+    """Return a cached agent attached to the session, without querying the database"""
+    key = identity_key(Agent, agent_id)
+    if key in db.identity_map:
+        return db.identity_map.get(key)
+
+    values = _agent_row_cache.get(str(agent_id))
+    if values is None:
+        return None
+
+    # Each session gets its own instance, so changes never leak into the cache
+    agent = Agent(**copy.deepcopy(values))
+    make_transient_to_detached(agent)
+    return db.merge(agent, load=False)
+
+
 def get_agent(db: Session, agent_id: uuid.UUID | str) -> Optional[Agent]:
     """Search for an agent by ID using AgentRepository"""
     try:
@@ -73,6 +114,10 @@ def get_agent(db: Session, agent_id: uuid.UUID | str) -> Optional[Agent]:
                 logger.warning(f"Invalid agent ID: {agent_id}")
                 return None
 
+        agent = _get_cached_agent(db, agent_id)
+        if agent:
+            return agent
+
         agent_repo = AgentRepository(db)
         agent = agent_repo.get(agent_id)
 
@@ -80,11 +125,12 @@ def get_agent(db: Session, agent_id: uuid.UUID | str) -> Optional[Agent]:
             logger.warning(f"Agent not found: {agent_id}")
             return None
 
-        # Sanitize agent name if it contains spaces or special characters
-        if agent.name and any(c for c in agent.name if not (c.isalnum() or c == "_")):
-            agent.name = "".join(c if c.isalnum() or c == "_" else "_" for c in agent.name)
-            agent_repo.update(agent)
-
+        _agent_row_cache.set(
+            str(agent_id),
+            copy.deepcopy(
+                {attr.key: getattr(agent, attr.key) for attr in inspect(Agent).column_attrs}
+            ),
+        )
         return agent
     except SQLAlchemyError as e:
         logger.error(f"Error searching for agent {agent_id}: {str(e)}")
@@ -94,6 +140,99 @@ def get_agent(db: Session, agent_id: uuid.UUID | str) -> Optional[Agent]:
         )
 
 
+@dataclass
+class AgentGraph:
+    """Every agent reachable from a root agent plus the rows they reference, keyed by id"""
+
+    agents: dict[str, Agent] = field(default_factory=dict)
+    api_keys: dict[str, ApiKey] = field(default_factory=dict)
+    mcp_servers: dict[str, MCPServer] = field(default_factory=dict)
+
+
+def get_agent_for_update(db: Session, agent_id: uuid.UUID | str) -> Agent | None:
+    """Load an agent from the database, bypassing the row cache, for read-modify-write"""
+    try:
+        if isinstance(agent_id, str):
+            try:
+                agent_id = uuid.UUID(agent_id)
+            except ValueError:
+                logger.warning(f"Invalid agent ID: {agent_id}")
+                return None
+
+        # populate_existing replaces a cached copy already merged into the session
+        return (
+            db.query(Agent)
+            .filter(Agent.id == agent_id)
+            .populate_existing()
+            .with_for_update()
+            .first()
+        )
+    except SQLAlchemyError as e:
+        logger.error(f"Error searching for agent {agent_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error searching for agent",
+        ) from e
+
+
+def _referenced_api_key_id(agent: Agent) -> uuid.UUID | None:
+    """Return the stored API key referenced by an agent, by column or config"""
+    if agent.api_key_id:
+        return agent.api_key_id
+    try:
+        return uuid.UUID((agent.config or {}).get("api_key"))
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def get_agent_graph(db: Session, root_agent_id: uuid.UUID | str) -> AgentGraph:
+    """Load an agent tree with its API keys and MCP servers in bulk"""
+    try:
+        if isinstance(root_agent_id, str):
+            try:
+                root_agent_id = uuid.UUID(root_agent_id)
+            except ValueError:
+                logger.warning(f"Invalid agent ID: {root_agent_id}")
+                return AgentGraph()
+
+        agent_repo = AgentRepository(db)
+        agents = agent_repo.get_tree(root_agent_id)
+
+        api_key_ids = set()
+        mcp_server_ids = set()
+        for agent in agents:
+            api_key_id = _referenced_api_key_id(agent)
+            if api_key_id:
+                api_key_ids.add(api_key_id)
+
+            for server in (agent.config or {}).get("mcp_servers") or []:
+                try:
+                    mcp_server_ids.add(uuid.UUID(str(server["id"])))
+                except (ValueError, TypeError, KeyError):
+                    continue
+
+        api_keys = (
+            db.query(ApiKey).filter(ApiKey.id.in_(api_key_ids)).all() if api_key_ids else []
+        )
+        mcp_servers = (
+            db.query(MCPServer).filter(MCPServer.id.in_(mcp_server_ids)).all()
+            if mcp_server_ids
+            else []
+        )
+
+        return AgentGraph(
+            agents={str(agent.id): agent for agent in agents},
+            api_keys={str(key.id): key for key in api_keys},
+            mcp_servers={str(server.id): server for server in mcp_servers},
+        )
+    except SQLAlchemyError as e:
+        logger.error(f"Error loading agent graph {root_agent_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error searching for agent",
+        ) from e
+
+
 def get_agents_by_client(
     db: Session,
     client_id: uuid.UUID,
@@ -118,12 +257,6 @@ def get_agents_by_client(
         # Note: Sorting is handled by repository, but we keep this for compatibility
         # In future, move sorting logic to repository
 
-        # Sanitize agent names
-        for agent in agents:
-            if agent.name and any(c for c in agent.name if not (c.isalnum() or c == "_")):
-                agent.name = "".join(c if c.isalnum() or c == "_" else "_" for c in agent.name)
-                agent_repo.update(agent)
-
         return agents
     except SQLAlchemyError as e:
         logger.error(f"Error searching for client agents {client_id}: {str(e)}")
@@ -154,9 +287,7 @@ async def create_agent(db: Session, agent: AgentCreate) -> Agent:
                 if not agent.name or agent.name.strip() == "":
                     # Sanitize name: remove spaces and special characters
                     card_name = agent_card.get("name", "Unknown Agent")
-                    sanitized_name = "".join(
-                        c if c.isalnum() or c == "_" else "_" for c in card_name
-                    )
+                    sanitized_name = normalize_agent_name(card_name)
                     agent.name = sanitized_name
 
                 agent.description = agent_card.get("description", "")
@@ -370,6 +501,7 @@ async def create_agent(db: Session, agent: AgentCreate) -> Agent:
 
         # Create agent from the processed dictionary
         db_agent = Agent(**agent_dict)
+        db_agent.name = normalize_agent_name(db_agent.name)
 
         # Make one final check to ensure all nested objects are serializable
         # (especially nested UUIDs in config)
@@ -405,7 +537,7 @@ async def create_agent(db: Session, agent: AgentCreate) -> Agent:
 async def update_agent(db: Session, agent_id: uuid.UUID, agent_data: dict[str, Any]) -> Agent:
     """Update an existing agent"""
     try:
-        agent = db.query(Agent).filter(Agent.id == agent_id).first()
+        agent = get_agent_for_update(db, agent_id)
         if not agent:
             raise HTTPException(status_code=404, detail="Agent not found")
 
@@ -468,9 +600,7 @@ async def update_agent(db: Session, agent_id: uuid.UUID, agent_data: dict[str, A
                 if "name" not in agent_data or not agent_data["name"].strip():
                     # Sanitize name: remove spaces and special characters
                     card_name = agent_card.get("name", "Unknown Agent")
-                    sanitized_name = "".join(
-                        c if c.isalnum() or c == "_" else "_" for c in card_name
-                    )
+                    sanitized_name = normalize_agent_name(card_name)
                     agent_data["name"] = sanitized_name
                 agent_data["description"] = agent_card.get("description", "")
 
@@ -517,9 +647,7 @@ async def update_agent(db: Session, agent_id: uuid.UUID, agent_data: dict[str, A
                 if "name" not in agent_data or not agent_data["name"].strip():
                     # Sanitize name: remove spaces and special characters
                     card_name = agent_card.get("name", "Unknown Agent")
-                    sanitized_name = "".join(
-                        c if c.isalnum() or c == "_" else "_" for c in card_name
-                    )
+                    sanitized_name = normalize_agent_name(card_name)
                     agent_data["name"] = sanitized_name
                 agent_data["description"] = agent_card.get("description", "")
 
@@ -709,11 +837,15 @@ async def update_agent(db: Session, agent_id: uuid.UUID, agent_data: dict[str, A
                 agent_data["config"] = {}
             agent_data["config"]["api_key"] = generate_api_key()
 
+        if agent_data.get("name"):
+            agent_data["name"] = normalize_agent_name(agent_data["name"])
+
         for key, value in agent_data.items():
             setattr(agent, key, value)
 
         db.commit()
         db.refresh(agent)
+        invalidate_agent_cache(agent_id)
         return agent
     except HTTPException:
         db.rollback()
@@ -733,6 +865,7 @@ def delete_agent(db: Session, agent_id: uuid.UUID) -> bool:
         # Actually delete the agent from the database
         db.delete(db_agent)
         db.commit()
+        invalidate_agent_cache(agent_id)
         logger.info(f"Agent deleted successfully: {agent_id}")
         return True
     except SQLAlchemyError as e:
@@ -861,6 +994,8 @@ def delete_agent_folder(db: Session, folder_id: uuid.UUID) -> bool:
         # Delete the folder
         db.delete(folder)
         db.commit()
+        for agent in agents:
+            invalidate_agent_cache(agent.id)
         logger.info(f"Agent folder removed: {folder_id}")
         return True
     except SQLAlchemyError as e:
@@ -886,6 +1021,7 @@ def assign_agent_to_folder(
             agent.folder_id = None
             db.commit()
             db.refresh(agent)
+            invalidate_agent_cache(agent_id)
             logger.info(f"Agent removed from folder: {agent_id}")
             return agent
 
@@ -908,6 +1044,7 @@ def assign_agent_to_folder(
         agent.folder_id = folder_id
         db.commit()
         db.refresh(agent)
+        invalidate_agent_cache(agent_id)
         logger.info(f"Agent assigned to folder: {folder_id}")
         return agent
     except SQLAlchemyError as e:
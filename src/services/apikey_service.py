@@ -5,12 +5,35 @@ from fastapi import HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from src.config.settings import settings
 from src.models.models import ApiKey
+from src.services.adk.agent_cache import built_agent_cache
 from src.utils.crypto import decrypt_api_key, encrypt_api_key
+from src.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 
+def _zero_secret(secret: bytearray) -> None:
+    """Overwrite a cached secret in place when it leaves the cache"""
+    secret[:] = bytes(len(secret))
+
+
+# Decrypted keys kept as bytearrays so they can be zeroed on eviction. The
+# strings handed to callers are copies and are not covered by this.
+_decrypted_key_cache = TTLCache(
+    max_entries=settings.API_KEY_CACHE_MAX_ENTRIES,
+    ttl=settings.API_KEY_CACHE_TTL,
+    on_evict=_zero_secret,
+)
+
+
+def invalidate_decrypted_api_key(key_id: uuid.UUID) -> None:
+    """Drop a decrypted key from the cache and the agent trees built with it"""
+    _decrypted_key_cache.pop(str(key_id))
+    built_agent_cache.invalidate_api_key(key_id)
+
+
 def create_api_key(
     db: Session, client_id: uuid.UUID, name: str, provider: str, key_value: str
 ) -> ApiKey:
@@ -103,14 +126,25 @@ def get_api_keys_by_client(
         )
 
 
-def get_decrypted_api_key(db: Session, key_id: uuid.UUID) -> str | None:
-    """Get the decrypted value of an API key"""
+def get_decrypted_api_key(
+    db: Session, key_id: uuid.UUID, key: ApiKey | None = None
+) -> str | None:
+    """Get the decrypted value of an API key, optionally from an already loaded row"""
     try:
-        key = get_api_key(db, key_id)
+        cached = _decrypted_key_cache.get(str(key_id), transform=lambda secret: secret.decode())
+        if cached is not None:
+            return cached
+
+        if key is None:
+            key = get_api_key(db, key_id)
         if not key or not key.is_active:
             logger.warning(f"API key {key_id} not found or inactive")
             return None
-        return decrypt_api_key(key.encrypted_key)
+
+        decrypted = decrypt_api_key(key.encrypted_key)
+        if decrypted:
+            _decrypted_key_cache.set(str(key_id), bytearray(decrypted.encode()))
+        return decrypted
     except Exception as e:
         logger.error(f"Error decrypting API key {key_id}: {str(e)}")
         return None
@@ -141,6 +175,7 @@ def update_api_key(
 
         db.commit()
         db.refresh(key)
+        invalidate_decrypted_api_key(key_id)
 
         # Add masked key value for display
         key.key_value_masked = "*****"
@@ -166,6 +201,7 @@ def delete_api_key(db: Session, key_id: uuid.UUID) -> bool:
         # Soft delete - only marks as inactive
         key.is_active = False
         db.commit()
+        invalidate_decrypted_api_key(key_id)
         logger.info(f"API key {key_id} deactivated")
         return True
     except SQLAlchemyError as e:
@@ -1,9 +1,11 @@
-import os
+import asyncio
+import copy
 from contextlib import ExitStack
 from typing import Any
 
 from sqlalchemy.orm import Session
 
+from src.config.settings import settings
 from src.services.mcp_server_service import get_mcp_server
 from src.utils.logger import setup_logger
 
@@ -50,11 +52,9 @@ class MCPService:
                 command = server_config.get("command", "npx")
                 args = server_config.get("args", [])
 
-                # Adds environment variables if specified
+                # The server process gets these variables on top of the default
+                # environment; os.environ is not touched, connections run in threads
                 env = server_config.get("env", {})
-                if env:
-                    for key, value in env.items():
-                        os.environ[key] = value
 
                 connection_params = StdioServerParameters(command=command, args=args, env=env)
 
@@ -104,6 +104,133 @@ class MCPService:
                 filtered_tools.append(tool)
         return filtered_tools
 
+    @staticmethod
+    def _close_adapter(adapter: Any):
+        """Stop an adapter that is no longer needed."""
+        try:
+            if hasattr(adapter, "stop"):
+                adapter.stop()
+            elif hasattr(adapter, "close"):
+                adapter.close()
+        except Exception as e:
+            logger.debug(f"Error closing MCP adapter: {e}")
+
+    def _collect_server_jobs(
+        self, mcp_config: dict[str, Any], db: Session
+    ) -> list[dict[str, Any]]:
+        """Resolve the configured MCP servers into connection jobs."""
+        jobs = []
+
+        mcp_servers = mcp_config.get("mcp_servers", [])
+        if mcp_servers is not None:
+            for server in mcp_servers:
+                try:
+                    # Search for the MCP server in the database
+                    mcp_server = get_mcp_server(db, server["id"])
+                    if not mcp_server:
+                        logger.warning(f"MCP Server not found: {server['id']}")
+                        continue
+
+                    # Prepares the server configuration without touching the stored one
+                    server_config = copy.deepcopy(mcp_server.config_json)
+
+                    # Replaces the environment variables in the config_json
+                    if "env" in server_config and server_config["env"] is not None:
+                        for key, value in server_config["env"].items():
+                            if value and value.startswith("env@@"):
+                                env_key = value.replace("env@@", "")
+                                if server.get("envs") and env_key in server.get("envs", {}):
+                                    server_config["env"][key] = server["envs"][env_key]
+                                else:
+                                    logger.warning(
+                                        f"Environment variable '{env_key}' not provided for the MCP server {mcp_server.name}"
+                                    )
+                                    continue
+
+                    jobs.append(
+                        {
+                            "label": mcp_server.name,
+                            "config": server_config,
+                            "custom": False,
+                            "agent_tools": server.get("tools", []),
+                        }
+                    )
+                except Exception as e:
+                    logger.error(f"Error preparing MCP server {server.get('id', 'unknown')}: {e}")
+
+        custom_mcp_servers = mcp_config.get("custom_mcp_servers", [])
+        if custom_mcp_servers is not None:
+            for server in custom_mcp_servers:
+                if not server:
+                    logger.warning("Empty server configuration found in custom_mcp_servers")
+                    continue
+                jobs.append(
+                    {
+                        "label": f"custom {server.get('url', 'unknown')}",
+                        "config": server,
+                        "custom": True,
+                        "agent_tools": [],
+                    }
+                )
+
+        return jobs
+
+    async def _connect_concurrently(
+        self, jobs: list[dict[str, Any]]
+    ) -> list[tuple[list[Any], Any] | None]:
+        """
+        Connect to the servers in worker threads with per-server and overall deadlines.
+
+        MCPServerAdapter connects synchronously, so each connection runs in a
+        thread. Servers that miss a deadline are dropped with a warning and
+        their adapter is stopped once the late connection finishes.
+        """
+        semaphore = asyncio.Semaphore(max(settings.MCP_BUILD_CONCURRENCY, 1))
+        server_deadline = settings.MCP_SERVER_CONNECT_DEADLINE
+
+        def close_late(future: asyncio.Future):
+            if not future.cancelled() and future.exception() is None:
+                _, adapter = future.result()
+                if adapter:
+                    self._close_adapter(adapter)
+
+        async def connect(job: dict[str, Any]):
+            async with semaphore:
+                logger.info(f"Connecting to MCP server: {job['label']}")
+                future = asyncio.ensure_future(
+                    asyncio.to_thread(self._connect_to_mcp_server, job["config"])
+                )
+                try:
+                    return await asyncio.wait_for(asyncio.shield(future), timeout=server_deadline)
+                except TimeoutError:
+                    logger.warning(
+                        f"MCP server {job['label']} missed its {server_deadline}s deadline, skipping it"
+                    )
+                    future.add_done_callback(close_late)
+                except asyncio.CancelledError:
+                    future.add_done_callback(close_late)
+                    raise
+                except Exception as e:
+                    logger.error(f"Error connecting to MCP server {job['label']}: {e}")
+                return None
+
+        tasks = [asyncio.create_task(connect(job)) for job in jobs]
+        if not tasks:
+            return []
+
+        _, pending = await asyncio.wait(tasks, timeout=settings.MCP_BUILD_DEADLINE)
+        for job, task in zip(jobs, tasks, strict=True):
+            if task in pending:
+                logger.warning(
+                    f"MCP server {job['label']} missed the {settings.MCP_BUILD_DEADLINE}s "
+                    "tool build deadline, skipping it"
+                )
+                task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return [None if task.cancelled() else task.result() for task in tasks]
+
     async def build_tools(self, mcp_config: dict[str, Any], db: Session) -> tuple[list[Any], Any]:
         """Builds a list of tools from multiple MCP servers."""
         if not HAS_MCP_PACKAGES:
@@ -115,103 +242,47 @@ class MCPService:
         adapter_list = []
 
         try:
-            mcp_servers = mcp_config.get("mcp_servers", [])
-            if mcp_servers is not None:
-                # Process each MCP server in the configuration
-                for server in mcp_servers:
-                    try:
-                        # Search for the MCP server in the database
-                        mcp_server = get_mcp_server(db, server["id"])
-                        if not mcp_server:
-                            logger.warning(f"MCP Server not found: {server['id']}")
-                            continue
-
-                        # Prepares the server configuration
-                        server_config = mcp_server.config_json.copy()
-
-                        # Replaces the environment variables in the config_json
-                        if "env" in server_config and server_config["env"] is not None:
-                            for key, value in server_config["env"].items():
-                                if value and value.startswith("env@@"):
-                                    env_key = value.replace("env@@", "")
-                                    if server.get("envs") and env_key in server.get("envs", {}):
-                                        server_config["env"][key] = server["envs"][env_key]
-                                    else:
-                                        logger.warning(
-                                            f"Environment variable '{env_key}' not provided for the MCP server {mcp_server.name}"
-                                        )
-                                        continue
-
-                        logger.info(f"Connecting to MCP server: {mcp_server.name}")
-                        tools, adapter = self._connect_to_mcp_server(server_config)
-
-                        if tools and adapter:
-                            # Filters incompatible tools
-                            filtered_tools = self._filter_incompatible_tools(tools)
-
-                            # Filters tools compatible with the agent
-                            if agent_tools := server.get("tools", []):
-                                filtered_tools = self._filter_tools_by_agent(
-                                    filtered_tools, agent_tools
-                                )
-                            self.tools.extend(filtered_tools)
-
-                            # Add to the adapter list for cleanup later
-                            adapter_list.append(adapter)
-                            logger.info(
-                                f"MCP Server {mcp_server.name} connected successfully. Added {len(filtered_tools)} tools."
-                            )
-                        else:
-                            logger.warning(
-                                f"Failed to connect or no tools available for {mcp_server.name}"
-                            )
-
-                    except Exception as e:
-                        logger.error(
-                            f"Error connecting to MCP server {server.get('id', 'unknown')}: {e}"
-                        )
-                        continue
-
-            custom_mcp_servers = mcp_config.get("custom_mcp_servers", [])
-            if custom_mcp_servers is not None:
-                # Process custom MCP servers
-                for server in custom_mcp_servers:
-                    if not server:
-                        logger.warning("Empty server configuration found in custom_mcp_servers")
-                        continue
-
-                    try:
-                        logger.info(
-                            f"Connecting to custom MCP server: {server.get('url', 'unknown')}"
-                        )
-                        tools, adapter = self._connect_to_mcp_server(server)
-
-                        if tools:
-                            self.tools.extend(tools)
-                        else:
-                            logger.warning("No tools returned from custom MCP server")
-                            continue
-
-                        if adapter:
-                            adapter_list.append(adapter)
-                            logger.info(
-                                f"Custom MCP server connected successfully. Added {len(tools)} tools."
-                            )
-                        else:
-                            logger.warning("No adapter returned from custom MCP server")
-                    except Exception as e:
-                        logger.error(
-                            f"Error connecting to custom MCP server {server.get('url', 'unknown')}: {e}"
-                        )
-                        continue
+            jobs = self._collect_server_jobs(mcp_config, db)
+            results = await self._connect_concurrently(jobs)
+
+            # Registers the results in configuration order
+            for job, result in zip(jobs, results, strict=True):
+                if result is None:
+                    continue
+
+                tools, adapter = result
+                # Tools of custom servers are kept even without an adapter to clean up
+                if not tools or not (adapter or job["custom"]):
+                    logger.warning(f"Failed to connect or no tools available for {job['label']}")
+                    if adapter:
+                        self._close_adapter(adapter)
+                    continue
+                if not adapter:
+                    logger.warning(f"No adapter returned from {job['label']}")
+
+                if not job["custom"]:
+                    # Filters incompatible tools
+                    tools = self._filter_incompatible_tools(tools)
+
+                    # Filters tools compatible with the agent
+                    if job["agent_tools"]:
+                        tools = self._filter_tools_by_agent(tools, job["agent_tools"])
+
+                self.tools.extend(tools)
+
+                # Add to the adapter list for cleanup later
+                if adapter:
+                    adapter_list.append(adapter)
+                logger.info(
+                    f"MCP Server {job['label']} connected successfully. Added {len(tools)} tools."
+                )
 
             logger.info(f"MCP Toolset created successfully. Total of {len(self.tools)} tools.")
 
         except Exception as e:
             # Ensure cleanup
             for adapter in adapter_list:
-                if hasattr(adapter, "close"):
-                    adapter.close()
+                self._close_adapter(adapter)
             logger.error(f"Fatal error connecting to MCP servers: {e}")
             # Return empty lists in case of error
             return [], None
@@ -1,5 +1,6 @@
 import logging
 import uuid
+from typing import Any
 
 from fastapi import HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
@@ -7,11 +8,20 @@ from sqlalchemy.orm import Session
 
 from src.models.models import MCPServer
 from src.schemas.schemas import MCPServerCreate
+from src.services.adk.agent_cache import built_agent_cache
+from src.services.adk.mcp_pool import server_config_key
 from src.utils.mcp_discovery import discover_mcp_tools
 
 logger = logging.getLogger(__name__)
 
 
+def _catalog_hash(config_json: dict[str, Any], tools: list[dict[str, Any]]) -> str | None:
+    """Hash of the configuration a tool catalog was discovered with, if it is usable"""
+    if not tools or any(not tool.get("inputSchema") for tool in tools):
+        return None
+    return server_config_key(config_json or {})
+
+
 def get_mcp_server(db: Session, server_id: uuid.UUID) -> MCPServer | None:
     """Search for an MCP server by ID"""
     try:
@@ -65,6 +75,9 @@ def create_mcp_server(db: Session, server: MCPServerCreate) -> MCPServer:
             server_data["tools"] = [
                 tool if isinstance(tool, dict) else tool.model_dump() for tool in supplied_tools
             ]
+        server_data["tools_hash"] = _catalog_hash(
+            server_data["config_json"], server_data["tools"]
+        )
         db_server = MCPServer(**server_data)
         db.add(db_server)
         db.commit()
@@ -106,8 +119,12 @@ def update_mcp_server(
             else:
                 setattr(db_server, key, value)
 
+        db_server.tools_hash = _catalog_hash(db_server.config_json, db_server.tools)
+
         db.commit()
         db.refresh(db_server)
+        # Cached agent trees embed the server configuration in their tools
+        built_agent_cache.clear()
         logger.info(f"MCP server updated successfully: {server_id}")
         return db_server
     except SQLAlchemyError as e:
@@ -128,6 +145,7 @@ def delete_mcp_server(db: Session, server_id: uuid.UUID) -> bool:
 
         db.delete(db_server)
         db.commit()
+        built_agent_cache.clear()
         logger.info(f"MCP server removed successfully: {server_id}")
         return True
     except SQLAlchemyError as e:
@@ -1,10 +1,16 @@
+import base64
+import binascii
+import json
 import logging
 import uuid
+from datetime import datetime
+from typing import Any
 
 from fastapi import HTTPException, status
 from google.adk.events import Event
 from google.adk.sessions import DatabaseSessionService
 from google.adk.sessions import Session as SessionADK
+from sqlalchemy import DateTime, PickleType, column, select, table, tuple_
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -13,6 +19,33 @@ from src.services.agent_service import get_agents_by_client
 
 logger = logging.getLogger(__name__)
 
+# Events table of the ADK session services, read directly for paginated access
+_events_table = table(
+    "events",
+    column("id"),
+    column("app_name"),
+    column("user_id"),
+    column("session_id"),
+    column("invocation_id"),
+    column("author"),
+    column("timestamp", DateTime),
+    column("content"),
+    column("branch"),
+    column("actions", PickleType),
+    column("long_running_tool_ids_json"),
+    column("grounding_metadata"),
+    column("partial"),
+    column("turn_complete"),
+    column("error_code"),
+    column("error_message"),
+    column("interrupted"),
+)
+_SUMMARY_COLUMNS = ("id", "author", "invocation_id", "timestamp", "content")
+_KEY_COLUMNS = ("app_name", "user_id", "session_id")
+
+# Position of an event in a session, as (timestamp, event id)
+EventCursor = tuple[datetime, str]
+
 
 def _session_to_dict(session: SessionModel):
     """Convert Session model to dictionary with created_at field"""
@@ -165,3 +198,136 @@ def get_session_events(session_service: DatabaseSessionService, session_id: str)
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error searching for events of session: {str(e)}",
         )
+
+
+def encode_event_cursor(cursor: EventCursor) -> str:
+    """Return the opaque form of an event cursor used in query strings."""
+    timestamp, event_id = cursor
+    raw = f"{timestamp.isoformat()}|{event_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_event_cursor(value: str) -> EventCursor:
+    """Parse a cursor returned by encode_event_cursor, raising HTTP 400 when invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode()
+        timestamp, event_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), event_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid cursor: {value}"
+        ) from e
+
+
+def get_session_record(db: Session, session_id: str) -> dict | None:
+    """Search for a session by ID without loading its events"""
+    user_id, _, app_name = session_id.partition("_")
+    try:
+        session = (
+            db.query(SessionModel)
+            .filter(
+                SessionModel.id == session_id,
+                SessionModel.app_name == app_name,
+                SessionModel.user_id == user_id,
+            )
+            .first()
+        )
+        return _session_to_dict(session) if session else None
+    except SQLAlchemyError as e:
+        logger.error(f"Error searching for session {session_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error searching for session",
+        ) from e
+
+
+def _event_row_to_dict(row) -> dict[str, Any]:
+    event = dict(row._mapping)
+    # JSONB on PostgreSQL, serialized JSON text elsewhere
+    for key in ("content", "grounding_metadata"):
+        if isinstance(event.get(key), str):
+            event[key] = json.loads(event[key])
+
+    actions = event.get("actions")
+    if hasattr(actions, "model_dump"):
+        event["actions"] = actions.model_dump()
+    if "long_running_tool_ids_json" in event:
+        ids_json = event.pop("long_running_tool_ids_json")
+        event["long_running_tool_ids"] = json.loads(ids_json) if ids_json else None
+    return event
+
+
+def get_session_event(db: Session, session_id: str, event_id: str) -> dict[str, Any] | None:
+    """Read the summary columns of a single event of a session."""
+    user_id, _, app_name = session_id.partition("_")
+    events = _events_table.c
+    query = select(*(events[name] for name in _SUMMARY_COLUMNS)).where(
+        events.app_name == app_name,
+        events.user_id == user_id,
+        events.session_id == session_id,
+        events.id == event_id,
+    )
+    try:
+        row = db.execute(query).first()
+    except SQLAlchemyError as e:
+        logger.error(f"Error reading event {event_id} of session {session_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error searching for events of session",
+        ) from e
+    return _event_row_to_dict(row) if row else None
+
+
+def list_session_events(
+    db: Session,
+    session_id: str,
+    after: EventCursor | None = None,
+    before: EventCursor | None = None,
+    limit: int | None = None,
+    detailed: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Read events of a session in (timestamp, id) order without loading the session.
+
+    With ``before`` and a ``limit``, or a ``limit`` alone, the events closest to
+    ``before`` (or the most recent ones) are returned, still oldest first. Only
+    the id, author, invocation id, timestamp and content are read unless
+    ``detailed`` is set.
+    """
+    user_id, _, app_name = session_id.partition("_")
+    events = _events_table.c
+    if detailed:
+        columns = [c for c in events if c.name not in _KEY_COLUMNS]
+    else:
+        columns = [events[name] for name in _SUMMARY_COLUMNS]
+    query = select(*columns).where(
+        events.app_name == app_name,
+        events.user_id == user_id,
+        events.session_id == session_id,
+    )
+    if after is not None:
+        query = query.where(tuple_(events.timestamp, events.id) > tuple_(*after))
+    if before is not None:
+        query = query.where(tuple_(events.timestamp, events.id) < tuple_(*before))
+
+    # Without a lower bound the page ends at the newest events, read backwards
+    newest_first = after is None and limit is not None
+    if newest_first:
+        query = query.order_by(events.timestamp.desc(), events.id.desc())
+    else:
+        query = query.order_by(events.timestamp, events.id)
+    if limit is not None:
+        query = query.limit(limit)
+
+    try:
+        rows = db.execute(query).all()
+    except SQLAlchemyError as e:
+        logger.error(f"Error reading events of session {session_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error searching for events of session",
+        ) from e
+
+    if newest_first:
+        rows.reverse()
+    return [_event_row_to_dict(row) for row in rows]
@@ -3,6 +3,10 @@ Enhanced A2A Client that supports both custom implementation and official SDK.
 
 This client provides a unified interface to communicate with A2A agents,
 automatically detecting and using the best available implementation.
+
+Clients created with ``get_a2a_client`` share the worker's connection pool,
+and the implementations detected on a server are cached per base URL, so a
+call does not probe the server again until the cache expires or a call fails.
 """
 
 import json
@@ -37,9 +41,12 @@ except ImportError:
     SDK_AVAILABLE = False
     logging.warning("a2a-sdk not available for enhanced client")
 
+from src.config.settings import settings
 from src.schemas.a2a_types import (
     Message as CustomMessage,
 )
+from src.utils.http_client import get_http_client
+from src.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -74,20 +81,32 @@ class A2AResponse:
     raw_response: Any | None = None
 
 
+# Implementations available on each server, keyed by base URL (per worker)
+_detected_implementations = TTLCache(
+    max_entries=settings.A2A_IMPLEMENTATION_CACHE_MAX_ENTRIES,
+    ttl=settings.A2A_IMPLEMENTATION_CACHE_TTL,
+)
+
+
 class EnhancedA2AClient:
     """
     Enhanced A2A client that supports both custom implementation and official SDK.
 
     Automatically detects and uses the best available implementation
     and provides a unified interface for communication with A2A agents.
+    A shared ``http_client`` is used as is and not closed with the client.
     """
 
-    def __init__(self, config: A2AClientConfig):
+    def __init__(self, config: A2AClientConfig, http_client: httpx.AsyncClient | None = None):
         self.config = config
-        self.httpx_client = None
+        self.httpx_client = http_client
+        self._owns_http_client = http_client is None
         self.sdk_client = None
         self.available_implementations = []
         self._agent_cards_cache = {}
+        self._headers = {"x-api-key": config.api_key, "Content-Type": "application/json"}
+        if config.custom_headers:
+            self._headers.update(config.custom_headers)
 
     async def __aenter__(self):
         """Context manager entry."""
@@ -101,14 +120,17 @@ class EnhancedA2AClient:
     async def initialize(self):
         """Initialize the client and detect available implementations."""
         # Initialize HTTP client
-        headers = {"x-api-key": self.config.api_key, "Content-Type": "application/json"}
-        if self.config.custom_headers:
-            headers.update(self.config.custom_headers)
-
-        self.httpx_client = httpx.AsyncClient(timeout=self.config.timeout, headers=headers)
+        if self.httpx_client is None:
+            self.httpx_client = httpx.AsyncClient(
+                timeout=self.config.timeout, headers=self._headers
+            )
 
-        # Detect available implementations
-        await self._detect_available_implementations()
+        # Detect available implementations, unless known for this server
+        cached = _detected_implementations.get(self.config.base_url)
+        if cached is not None:
+            self.available_implementations = list(cached)
+        else:
+            await self._detect_available_implementations()
 
         # Initialize SDK client if available
         if A2AImplementation.SDK in self.available_implementations and SDK_AVAILABLE:
@@ -116,7 +138,7 @@ class EnhancedA2AClient:
 
     async def close(self):
         """Close client resources."""
-        if self.httpx_client:
+        if self.httpx_client and self._owns_http_client:
             await self.httpx_client.aclose()
 
         if self.sdk_client:
@@ -130,7 +152,7 @@ class EnhancedA2AClient:
         # Test custom implementation
         try:
             custom_health_url = f"{self.config.base_url}/api/v1/a2a/health"
-            response = await self.httpx_client.get(custom_health_url)
+            response = await self._get(custom_health_url)
             if response.status_code == 200:
                 implementations.append(A2AImplementation.CUSTOM)
                 logger.info("Custom A2A implementation detected")
@@ -140,7 +162,7 @@ class EnhancedA2AClient:
         # Test SDK implementation
         try:
             sdk_health_url = f"{self.config.base_url}/api/v1/a2a-sdk/health"
-            response = await self.httpx_client.get(sdk_health_url)
+            response = await self._get(sdk_health_url)
             if response.status_code == 200:
                 implementations.append(A2AImplementation.SDK)
                 logger.info("SDK A2A implementation detected")
@@ -150,6 +172,33 @@ class EnhancedA2AClient:
         self.available_implementations = implementations
         logger.info(f"Available A2A implementations: {[impl.value for impl in implementations]}")
 
+        # An unreachable server is probed again on the next call
+        if implementations:
+            _detected_implementations.set(self.config.base_url, tuple(implementations))
+
+    async def _redetect_implementation(self, failed: A2AImplementation) -> bool:
+        """
+        Detect the implementations again after a call failed.
+
+        Returns whether another implementation should be tried instead.
+        """
+        _detected_implementations.pop(self.config.base_url)
+        await self._detect_available_implementations()
+        try:
+            return self._choose_implementation() != failed
+        except ValueError:
+            return False
+
+    def _request_kwargs(self, headers: dict[str, str] | None = None) -> dict[str, Any]:
+        # Headers and timeout are sent per request, the HTTP client may be shared
+        return {"headers": {**self._headers, **(headers or {})}, "timeout": self.config.timeout}
+
+    async def _get(self, url: str) -> httpx.Response:
+        return await self.httpx_client.get(url, **self._request_kwargs())
+
+    async def _post(self, url: str, request_data: dict[str, Any]) -> httpx.Response:
+        return await self.httpx_client.post(url, json=request_data, **self._request_kwargs())
+
     async def _initialize_sdk_client(self):
         """Initialize SDK client if available."""
         if not SDK_AVAILABLE:
@@ -207,10 +256,14 @@ class EnhancedA2AClient:
         chosen_impl = self._choose_implementation(implementation)
 
         try:
-            if chosen_impl == A2AImplementation.SDK:
-                response = await self._get_agent_card_sdk(agent_id_str)
-            else:
-                response = await self._get_agent_card_custom(agent_id_str)
+            try:
+                response = await self._get_agent_card_with(chosen_impl, agent_id_str)
+            except Exception as e:
+                if implementation or not await self._redetect_implementation(chosen_impl):
+                    raise
+                logger.warning(f"Agent card request with {chosen_impl.value} failed: {e}")
+                chosen_impl = self._choose_implementation()
+                response = await self._get_agent_card_with(chosen_impl, agent_id_str)
 
             response.implementation_used = chosen_impl
 
@@ -228,11 +281,18 @@ class EnhancedA2AClient:
                 implementation_used=chosen_impl,
             )
 
+    async def _get_agent_card_with(
+        self, implementation: A2AImplementation, agent_id: str
+    ) -> A2AResponse:
+        if implementation == A2AImplementation.SDK:
+            return await self._get_agent_card_sdk(agent_id)
+        return await self._get_agent_card_custom(agent_id)
+
     async def _get_agent_card_custom(self, agent_id: str) -> A2AResponse:
         """Get agent card using custom implementation."""
         url = f"{self.config.base_url}/api/v1/a2a/{agent_id}/.well-known/agent.json"
 
-        response = await self.httpx_client.get(url)
+        response = await self._get(url)
         response.raise_for_status()
 
         data = response.json()
@@ -242,7 +302,7 @@ class EnhancedA2AClient:
         """Get agent card using SDK implementation."""
         url = f"{self.config.base_url}/api/v1/a2a-sdk/{agent_id}/.well-known/agent.json"
 
-        response = await self.httpx_client.get(url)
+        response = await self._get(url)
         response.raise_for_status()
 
         data = response.json()
@@ -265,11 +325,17 @@ class EnhancedA2AClient:
         chosen_impl = self._choose_implementation(implementation)
 
         try:
-            if chosen_impl == A2AImplementation.SDK:
-                response = await self._send_message_sdk(agent_id_str, message, session_id, metadata)
-            else:
-                response = await self._send_message_custom(
-                    agent_id_str, message, session_id, metadata
+            try:
+                response = await self._send_message_with(
+                    chosen_impl, agent_id_str, message, session_id, metadata
+                )
+            except Exception as e:
+                if implementation or not await self._redetect_implementation(chosen_impl):
+                    raise
+                logger.warning(f"Message with {chosen_impl.value} failed: {e}")
+                chosen_impl = self._choose_implementation()
+                response = await self._send_message_with(
+                    chosen_impl, agent_id_str, message, session_id, metadata
                 )
 
             response.implementation_used = chosen_impl
@@ -283,6 +349,18 @@ class EnhancedA2AClient:
                 implementation_used=chosen_impl,
             )
 
+    async def _send_message_with(
+        self,
+        implementation: A2AImplementation,
+        agent_id: str,
+        message: str,
+        session_id: str,
+        metadata: dict[str, Any] | None,
+    ) -> A2AResponse:
+        if implementation == A2AImplementation.SDK:
+            return await self._send_message_sdk(agent_id, message, session_id, metadata)
+        return await self._send_message_custom(agent_id, message, session_id, metadata)
+
     async def _send_message_custom(
         self,
         agent_id: str,
@@ -314,7 +392,7 @@ class EnhancedA2AClient:
             },
         }
 
-        response = await self.httpx_client.post(url, json=request_data)
+        response = await self._post(url, request_data)
         response.raise_for_status()
 
         data = response.json()
@@ -356,7 +434,7 @@ class EnhancedA2AClient:
             },
         }
 
-        response = await self.httpx_client.post(url, json=request_data)
+        response = await self._post(url, request_data)
         response.raise_for_status()
 
         data = response.json()
@@ -394,6 +472,8 @@ class EnhancedA2AClient:
 
         except Exception as e:
             logger.error(f"Error in streaming with {chosen_impl.value}: {e}")
+            # Chunks may have been sent already, the next call uses a fresh detection
+            _detected_implementations.pop(self.config.base_url)
             yield A2AResponse(
                 success=False,
                 error=f"Failed to stream message: {str(e)}",
@@ -432,7 +512,10 @@ class EnhancedA2AClient:
         }
 
         async with self.httpx_client.stream(
-            "POST", url, json=request_data, headers={"Accept": "text/event-stream"}
+            "POST",
+            url,
+            json=request_data,
+            **self._request_kwargs({"Accept": "text/event-stream"}),
         ) as response:
             response.raise_for_status()
 
@@ -480,7 +563,10 @@ class EnhancedA2AClient:
         }
 
         async with self.httpx_client.stream(
-            "POST", url, json=request_data, headers={"Accept": "text/event-stream"}
+            "POST",
+            url,
+            json=request_data,
+            **self._request_kwargs({"Accept": "text/event-stream"}),
         ) as response:
             response.raise_for_status()
 
@@ -555,7 +641,7 @@ class EnhancedA2AClient:
         # Test custom implementation
         try:
             custom_health_url = f"{self.config.base_url}/api/v1/a2a/health"
-            response = await self.httpx_client.get(custom_health_url)
+            response = await self._get(custom_health_url)
             health["implementations_health"]["custom"] = {
                 "available": response.status_code == 200,
                 "status": response.status_code,
@@ -570,7 +656,7 @@ class EnhancedA2AClient:
         # Test SDK implementation
         try:
             sdk_health_url = f"{self.config.base_url}/api/v1/a2a-sdk/health"
-            response = await self.httpx_client.get(sdk_health_url)
+            response = await self._get(sdk_health_url)
             health["implementations_health"]["sdk"] = {
                 "available": response.status_code == 200,
                 "status": response.status_code,
@@ -617,7 +703,9 @@ class EnhancedA2AClient:
                 health_url = f"{self.config.base_url}/api/v1/a2a/health"
 
             try:
-                response = await self.httpx_client.get(health_url, timeout=5.0)
+                response = await self.httpx_client.get(
+                    health_url, headers=self._headers, timeout=5.0
+                )
                 if response.status_code == 200:
                     logger.info(f"✓ {impl.value} implementation is available")
                     return impl
@@ -631,6 +719,23 @@ class EnhancedA2AClient:
         return A2AImplementation.CUSTOM
 
 
+def get_a2a_client(config: A2AClientConfig) -> EnhancedA2AClient:
+    """
+    Return a client using the worker's shared connection pool.
+
+    Use it as an async context manager, closing it leaves the pool open.
+    """
+    return EnhancedA2AClient(config, http_client=get_http_client())
+
+
+def clear_detected_implementations(base_url: str | None = None) -> None:
+    """Forget the implementations detected for a server, or for every server."""
+    if base_url is None:
+        _detected_implementations.clear()
+    else:
+        _detected_implementations.pop(base_url)
+
+
 # Utility function to create client easily
 async def create_enhanced_a2a_client(
     base_url: str,
@@ -0,0 +1,85 @@
+"""
+Shared per-worker httpx.AsyncClient for outbound calls made by tools.
+
+Connections are kept alive and reused between tool calls. Each event loop
+gets its own client, since httpx connections cannot cross loops.
+"""
+
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_host_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        http2 = settings.HTTP_CLIENT_HTTP2 and HAS_HTTP2
+        if settings.HTTP_CLIENT_HTTP2 and not HAS_HTTP2:
+            logger.warning("HTTP/2 requested but the h2 package is not installed, using HTTP/1.1")
+
+        client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+@asynccontextmanager
+async def host_slot(url: str, timeout: float | None = None):
+    """
+    Limit the number of concurrent requests to a single host.
+
+    httpx only limits connections for the whole client, so one slow API
+    could otherwise take every connection in the pool.
+    """
+    loop = asyncio.get_running_loop()
+    semaphores = _host_semaphores.setdefault(loop, {})
+    host = urlsplit(url).netloc.lower()
+    semaphore = semaphores.get(host)
+    if semaphore is None:
+        semaphore = semaphores[host] = asyncio.Semaphore(settings.HTTP_CLIENT_MAX_PER_HOST)
+
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout=timeout)
+    except TimeoutError as e:
+        raise httpx.PoolTimeout(f"Timed out waiting for a free connection to {host}") from e
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+async def close_http_client() -> None:
+    """Close the shared client of the running event loop."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
@@ -27,6 +27,7 @@
 """
 
 import asyncio
+import copy
 from typing import Any
 
 from src.config.settings import settings
@@ -41,7 +42,7 @@ async def discover_mcp_tools_async(config_json: dict[str, Any]) -> list[dict[str
         from src.services.adk.mcp_service import MCPService
 
     service = MCPService()
-    tools, exit_stack = await service._connect_to_mcp_server(config_json)
+    tools, exit_stack = await service._connect_to_mcp_server(copy.deepcopy(config_json))
     serialised = [
         (
             t.to_dict()
@@ -54,6 +55,7 @@ async def discover_mcp_tools_async(config_json: dict[str, Any]) -> list[dict[str
                 "examples": getattr(t, "examples", []),
                 "inputModes": getattr(t, "input_modes", ["text"]),
                 "outputModes": getattr(t, "output_modes", ["text"]),
+                "inputSchema": getattr(getattr(t, "mcp_tool", None), "inputSchema", None),
             }
         )
         for t in tools
@@ -0,0 +1,97 @@
+"""
+Small per-worker LRU cache with a time-to-live per entry.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class TTLCache:
+    """LRU cache whose entries expire after ``ttl`` seconds. A ``ttl`` of 0 disables it."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 60.0,
+        on_evict: Callable[[Any], None] | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._on_evict = on_evict
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        # Sync route handlers run in a thread pool
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def _evict(self, value: Any) -> None:
+        if self._on_evict is not None:
+            self._on_evict(value)
+
+    def get(self, key: Hashable, transform: Callable[[Any], Any] | None = None) -> Any | None:
+        """
+        Return the cached value, or None if missing or expired.
+
+        ``transform`` is applied while the entry cannot be evicted, for values
+        that the eviction callback mutates.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._evict(value)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return transform(value) if transform is not None else value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entries."""
+        if not self.enabled:
+            self._evict(value)
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None and previous[0] is not value:
+                self._evict(previous[0])
+
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            while len(self._entries) > self.max_entries:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._evict(evicted)
+
+    def pop(self, key: Hashable) -> None:
+        """Drop a single entry."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._evict(entry[0])
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            entries, self._entries = self._entries, OrderedDict()
+            for value, _ in entries.values():
+                self._evict(value)
+
+    def stats(self) -> dict[str, int]:
+        """Return cache counters."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,51 @@
+import httpx
+import pytest
+
+from src.services.adk import a2a_card_cache
+from src.services.adk.a2a_card_cache import AgentCardCache
+
+CARD_URL = "https://agents.example.com/.well-known/agent.json"
+
+
+@pytest.fixture
+def card_server(monkeypatch, fake_redis):
+    """Serves a card naming the caller's API key, refusing unknown keys."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        api_key = request.headers.get("x-api-key")
+        requests.append(api_key)
+        if api_key not in ("key-a", "key-b"):
+            return httpx.Response(401)
+        return httpx.Response(
+            200, json={"name": f"card for {api_key}"}, headers={"cache-control": "max-age=60"}
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(a2a_card_cache, "get_http_client", lambda: client)
+    return requests
+
+
+@pytest.mark.asyncio
+async def test_cards_are_cached_per_api_key(card_server):
+    cache = AgentCardCache()
+
+    assert (await cache.get(CARD_URL, api_key="key-a"))["name"] == "card for key-a"
+    assert (await cache.get(CARD_URL, api_key="key-b"))["name"] == "card for key-b"
+    assert (await cache.get(CARD_URL, api_key="key-a"))["name"] == "card for key-a"
+
+    # Another worker reads the cards from Redis
+    assert (await AgentCardCache().get(CARD_URL, api_key="key-b"))["name"] == "card for key-b"
+    assert card_server == ["key-a", "key-b"]
+
+
+@pytest.mark.asyncio
+async def test_failed_fetches_are_remembered_per_api_key(card_server):
+    cache = AgentCardCache()
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await cache.get(CARD_URL, api_key="wrong-key")
+
+    assert (await cache.get(CARD_URL, api_key="key-a"))["name"] == "card for key-a"
+    assert card_server == ["wrong-key", "key-a"]
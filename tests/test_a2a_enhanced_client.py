@@ -0,0 +1,70 @@
+import httpx
+import pytest
+
+from src.utils.a2a_enhanced_client import (
+    A2AClientConfig,
+    A2AImplementation,
+    EnhancedA2AClient,
+    clear_detected_implementations,
+)
+
+BASE_URL = "https://agents.example.com"
+
+
+@pytest.fixture
+def server():
+    """Answers the health checks of the implementations listed in ``available``."""
+    probes = []
+    available = {"/api/v1/a2a/health"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        probes.append(request.url.path)
+        return httpx.Response(200 if request.url.path in available else 404)
+
+    clear_detected_implementations()
+    yield httpx.AsyncClient(transport=httpx.MockTransport(handler)), probes, available
+    clear_detected_implementations()
+
+
+async def _client(http_client) -> EnhancedA2AClient:
+    client = EnhancedA2AClient(A2AClientConfig(base_url=BASE_URL, api_key="key"), http_client)
+    await client.initialize()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_detected_implementations_are_reused(server):
+    http_client, probes, _ = server
+
+    first = await _client(http_client)
+    second = await _client(http_client)
+
+    assert first.available_implementations == [A2AImplementation.CUSTOM]
+    assert second.available_implementations == [A2AImplementation.CUSTOM]
+    assert len(probes) == 2
+
+
+@pytest.mark.asyncio
+async def test_unreachable_servers_are_probed_again(server):
+    http_client, probes, available = server
+    available.clear()
+
+    await _client(http_client)
+    available.add("/api/v1/a2a-sdk/health")
+    client = await _client(http_client)
+
+    assert client.available_implementations == [A2AImplementation.SDK]
+    assert len(probes) == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_calls_detect_the_implementations_again(server):
+    http_client, probes, available = server
+    client = await _client(http_client)
+
+    available.clear()
+    available.add("/api/v1/a2a-sdk/health")
+
+    assert await client._redetect_implementation(A2AImplementation.CUSTOM)
+    assert (await _client(http_client)).available_implementations == [A2AImplementation.SDK]
+    assert len(probes) == 4
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.api import a2a_routes
+
+SESSION_ID = "context_agent"
+
+
+class FakeStore:
+    """Sessions and events read by extract_conversation_history."""
+
+    def __init__(self):
+        self.created = datetime(2026, 1, 1)
+        self.deleted = False
+        self.events = []
+        self.reads = []
+
+    def add(self, author: str, text: str):
+        self.events.append(
+            {
+                "id": f"event-{len(self.events)}",
+                "author": author,
+                "invocation_id": "invocation",
+                "timestamp": self.created + timedelta(seconds=len(self.events)),
+                "content": {"parts": [{"text": text}]},
+            }
+        )
+
+    def recreate(self):
+        self.created += timedelta(days=1)
+        self.events = []
+
+    def get_session_record(self, db, session_id):
+        if self.deleted:
+            return None
+        return {"id": session_id, "create_time": self.created, "update_time": self.created}
+
+    def list_session_events(self, db, session_id, after=None, before=None, limit=None):
+        self.reads.append(after)
+        events = [e for e in self.events if after is None or (e["timestamp"], e["id"]) > after]
+        return events[-limit:] if limit else events
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = FakeStore()
+    monkeypatch.setattr(a2a_routes, "get_session_record", store.get_session_record)
+    monkeypatch.setattr(a2a_routes, "list_session_events", store.list_session_events)
+    a2a_routes._history_cursors.clear()
+    yield store
+    a2a_routes._history_cursors.clear()
+
+
+def _history(limit=None) -> list[str]:
+    entries = a2a_routes.extract_conversation_history("agent", "context", None, limit=limit)
+    return [entry["content"] for entry in entries]
+
+
+def test_later_calls_only_read_new_events(store):
+    store.add("user", "hello")
+    assert _history() == ["hello"]
+
+    store.add("agent", "hi")
+    assert _history() == ["hello", "hi"]
+    assert store.reads[0] is None
+    assert store.reads[1] == (store.events[0]["timestamp"], "event-0")
+
+
+def test_deleted_session_forgets_its_history(store):
+    store.add("user", "secret")
+    assert _history() == ["secret"]
+
+    store.deleted = True
+    assert _history() == []
+    assert a2a_routes._history_cursors.get(SESSION_ID) is None
+
+    store.deleted = False
+    store.recreate()
+    store.add("user", "new")
+    assert _history() == ["new"]
+
+
+def test_recreated_session_does_not_reuse_the_cached_history(store):
+    store.add("user", "secret")
+    assert _history() == ["secret"]
+
+    store.recreate()
+    store.add("user", "new")
+    assert _history() == ["new"]
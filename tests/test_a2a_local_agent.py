@@ -0,0 +1,92 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai.types import Content, Part
+
+from src.services import agent_service
+from src.services.adk.agent_builder import AgentBuilder
+from src.services.adk.custom_agents.a2a_agent import A2ACustomAgent
+
+
+class ScriptedAgent(BaseAgent):
+    """Answers with a fixed list of texts, after an optional delay."""
+
+    texts: list[str]
+    delay: float = 0
+
+    async def _run_async_impl(self, ctx):
+        await asyncio.sleep(self.delay)
+        for text in self.texts:
+            yield Event(author=self.name, content=Content(role="model", parts=[Part(text=text)]))
+
+
+def _a2a_agent(target: str, **kwargs) -> A2ACustomAgent:
+    return A2ACustomAgent(
+        name=f"call_{target.replace('-', '_')}",
+        agent_card_url=f"http://localhost/api/v1/a2a/{target}/.well-known/agent.json",
+        api_key="key",
+        local_agent_id=target,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def local_agents(monkeypatch):
+    """Serves the agents of the returned dict, by id, to the in-process A2A calls."""
+    agents: dict[str, BaseAgent] = {}
+
+    async def build_cached_agent(self, agent):
+        return agents[agent.id], None
+
+    monkeypatch.setattr(agent_service, "get_agent", lambda db, agent_id: SimpleNamespace(id=agent_id))
+    monkeypatch.setattr(AgentBuilder, "build_cached_agent", build_cached_agent)
+    return agents
+
+
+async def _run(agent: BaseAgent, app_name: str) -> list[str]:
+    session_service = InMemorySessionService()
+    session = session_service.create_session(app_name=app_name, user_id="user")
+    runner = Runner(app_name=app_name, agent=agent, session_service=session_service)
+    texts = []
+    async for event in runner.run_async(
+        user_id="user",
+        session_id=session.id,
+        new_message=Content(role="user", parts=[Part(text="hi")]),
+    ):
+        if event.content and event.content.parts and event.content.parts[0].text:
+            texts.append(event.content.parts[0].text)
+    return texts
+
+
+@pytest.mark.asyncio
+async def test_only_the_final_response_is_returned(local_agents):
+    local_agents["agent-b"] = ScriptedAgent(name="b", texts=["thinking", "answer"])
+
+    texts = await _run(_a2a_agent("agent-b"), "agent-a")
+
+    assert texts == ["answer"]
+
+
+@pytest.mark.asyncio
+async def test_call_cycles_are_refused(local_agents):
+    local_agents["agent-b"] = _a2a_agent("agent-a")
+    local_agents["agent-a"] = _a2a_agent("agent-b")
+
+    texts = await asyncio.wait_for(_run(_a2a_agent("agent-b"), "agent-a"), timeout=5)
+
+    assert len(texts) == 1
+    assert "cycle" in texts[0]
+
+
+@pytest.mark.asyncio
+async def test_local_calls_time_out(local_agents):
+    local_agents["agent-b"] = ScriptedAgent(name="b", texts=["late"], delay=5)
+
+    texts = await _run(_a2a_agent("agent-b", timeout=1), "agent-a")
+
+    assert texts == ["Local A2A agent agent-b timed out after 1 seconds"]
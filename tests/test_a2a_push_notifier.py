@@ -0,0 +1,106 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.services import a2a_push_notifier
+from src.services.a2a_push_notifier import (
+    DEAD_LETTER_KEY,
+    PushNotificationDispatcher,
+    build_push_request,
+)
+
+CONFIG = {"url": "https://hooks.example.com/a2a", "token": "secret"}
+
+
+def _task(state: str) -> dict:
+    return {"id": "task-1", "status": {"state": state}}
+
+
+@pytest.fixture
+def webhook(monkeypatch):
+    """Records the states received by the webhook, answering with queued status codes."""
+    received = []
+    statuses = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        received.append(json.loads(request.content)["status"]["state"])
+        return httpx.Response(statuses.pop(0) if statuses else 200)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(a2a_push_notifier, "get_http_client", lambda: client)
+    return received, statuses
+
+
+def _dispatcher(**kwargs) -> PushNotificationDispatcher:
+    options = {"workers": 4, "max_attempts": 3, "base_delay": 0.01, "max_delay": 0.02}
+    return PushNotificationDispatcher(**{**options, **kwargs})
+
+
+def test_build_push_request_requires_https():
+    with pytest.raises(ValueError):
+        build_push_request({"url": "http://hooks.example.com/a2a"})
+
+    url, headers = build_push_request(CONFIG)
+    assert url == CONFIG["url"]
+    assert headers["X-A2A-Notification-Token"] == "secret"
+
+
+@pytest.mark.asyncio
+async def test_updates_queued_before_delivery_are_coalesced(webhook):
+    received, _ = webhook
+    dispatcher = _dispatcher()
+    for state in ("submitted", "working", "completed"):
+        dispatcher.enqueue(_task(state), CONFIG)
+    await asyncio.sleep(0.1)
+    await dispatcher.close()
+
+    assert received == ["completed"]
+
+
+@pytest.mark.asyncio
+async def test_failed_update_is_not_retried_after_a_newer_one(webhook, fake_redis):
+    received, statuses = webhook
+    statuses.append(503)
+    dispatcher = _dispatcher()
+    dispatcher.enqueue(_task("working"), CONFIG)
+    await asyncio.sleep(0.005)
+    dispatcher.enqueue(_task("completed"), CONFIG)
+    await asyncio.sleep(0.2)
+    await dispatcher.close()
+
+    assert received == ["working", "completed"]
+
+
+@pytest.mark.asyncio
+async def test_updates_of_a_task_are_sent_in_order(webhook):
+    received, _ = webhook
+    dispatcher = _dispatcher()
+    dispatcher.enqueue(_task("working"), CONFIG)
+    await asyncio.sleep(0.005)
+    dispatcher.enqueue(_task("input-required"), CONFIG)
+    await asyncio.sleep(0.005)
+    dispatcher.enqueue(_task("completed"), CONFIG)
+    await asyncio.sleep(0.2)
+    await dispatcher.close()
+
+    assert received[-1] == "completed"
+    assert received == sorted(received, key=["working", "input-required", "completed"].index)
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_go_to_the_dead_letter_list(webhook, fake_redis):
+    received, statuses = webhook
+    statuses.extend([500, 500, 500])
+    dispatcher = _dispatcher()
+    dispatcher.enqueue(_task("completed"), CONFIG)
+    await asyncio.sleep(0.3)
+    await dispatcher.close()
+
+    assert received == ["completed"] * 3
+    entry = json.loads(await fake_redis.lindex(DEAD_LETTER_KEY, 0))
+    assert entry["task_id"] == "task-1"
+    assert entry["attempts"] == 3
+    assert "headers" not in entry
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+import pytest_asyncio
+
+from src.api import a2a_routes
+from src.services.a2a_task_store import A2ATaskStore, TaskCanceledError
+
+
+@pytest_asyncio.fixture
+async def store(fake_redis, monkeypatch):
+    store = A2ATaskStore(ttl=60, poll_interval=0.05)
+    monkeypatch.setattr(a2a_routes, "a2a_task_store", store)
+    yield store
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_final_states_are_not_overwritten(store):
+    task = await store.create("agent-1", "context-1")
+    assert (await store.update(task["id"], "working"))["status"]["state"] == "working"
+    assert (await store.cancel(task["id"]))["status"]["state"] == "canceled"
+
+    assert await store.update(task["id"], "completed") is None
+    transitions = (await store.get(task["id"]))["metadata"]["transitions"]
+    assert [t["state"] for t in transitions] == ["submitted", "working", "canceled"]
+
+
+@pytest.mark.asyncio
+async def test_run_until_canceled_stops_the_work(store):
+    task = await store.create("agent-1", "context-1")
+    started = asyncio.Event()
+
+    async def work():
+        started.set()
+        await asyncio.sleep(10)
+
+    run = asyncio.create_task(store.run_until_canceled(task["id"], work()))
+    await started.wait()
+    await asyncio.sleep(0.05)
+    await store.cancel(task["id"])
+
+    with pytest.raises(TaskCanceledError):
+        await asyncio.wait_for(run, timeout=2)
+
+
+@pytest.mark.asyncio
+async def test_fail_running_marks_running_tasks_failed(store):
+    task = await store.create("agent-1", "context-1")
+    await store.update(task["id"], "working")
+    run = asyncio.create_task(store.run_until_canceled(task["id"], asyncio.sleep(10)))
+    await asyncio.sleep(0.05)
+
+    await store.fail_running()
+
+    assert (await store.get(task["id"]))["status"]["state"] == "failed"
+    run.cancel()
+
+
+@pytest.mark.asyncio
+async def test_tasks_of_another_agent_are_not_found(store):
+    owner, other = uuid.uuid4(), uuid.uuid4()
+    task = await store.create(str(owner), "context-1")
+    params = {"id": task["id"]}
+
+    response = await a2a_routes.handle_tasks_get(other, params, "1", None)
+    assert json.loads(response.body)["error"]["message"] == "Task not found"
+
+    response = await a2a_routes.handle_tasks_cancel(other, params, "1", None)
+    assert json.loads(response.body)["error"]["message"] == "Task not found"
+    assert (await store.get(task["id"]))["status"]["state"] == "submitted"
+
+    response = await a2a_routes.handle_tasks_get(owner, params, "1", None)
+    assert json.loads(response.body)["result"]["id"] == task["id"]
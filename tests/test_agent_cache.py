@@ -0,0 +1,107 @@
+import asyncio
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.adk.agent_builder import AgentBuilder
+from src.services.adk.agent_cache import BuiltAgentCache
+from src.services.agent_service import AgentGraph
+
+
+@pytest.mark.asyncio
+async def test_concurrent_builds_of_a_key_run_once():
+    cache = BuiltAgentCache()
+    builds = []
+
+    async def build():
+        builds.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    agents = await asyncio.gather(
+        *(cache.get_or_build("root|a@1|", ["a"], build) for _ in range(5))
+    )
+
+    assert len(builds) == 1
+    assert all(agent is agents[0] for agent in agents)
+    assert cache.stats() == {"entries": 1, "hits": 4, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_failed_builds_are_not_cached():
+    cache = BuiltAgentCache()
+
+    async def fail():
+        raise RuntimeError("build failed")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_build("key", ["a"], fail)
+
+    async def build():
+        return "agent"
+
+    assert await cache.get_or_build("key", ["a"], build) == "agent"
+
+
+def test_edits_produce_a_new_key():
+    before = BuiltAgentCache.make_key("root", {"root": 1, "child": 1}, ["search"])
+    after = BuiltAgentCache.make_key("root", {"root": 1, "child": 2}, ["search"])
+
+    assert before != after
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = BuiltAgentCache(max_entries=2)
+    cache.put("a", "agent a", ["a"])
+    cache.put("b", "agent b", ["b"])
+    cache.get("a")
+    cache.put("c", "agent c", ["c"])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "agent a"
+    assert cache.get("c") == "agent c"
+
+
+def test_entries_expire():
+    cache = BuiltAgentCache(ttl=-1)
+    cache.put("a", "agent a", ["a"])
+
+    assert cache.get("a") is None
+
+
+def test_invalidation_drops_trees_containing_the_agent_or_api_key():
+    cache = BuiltAgentCache()
+    cache.put("root", "tree", ["root", "child"], api_key_ids=["key-1"])
+    cache.put("other", "other tree", ["other"], api_key_ids=["key-2"])
+
+    assert cache.invalidate("child") == 1
+    assert cache.get("root") is None
+    assert cache.invalidate_api_key("key-2") == 1
+    assert cache.get("other") is None
+
+
+def test_key_and_server_edits_change_the_tree_versions():
+    created = datetime(2025, 1, 1, tzinfo=UTC)
+    api_key = SimpleNamespace(updated_at=None, created_at=created, is_active=True)
+    server = SimpleNamespace(updated_at=None, created_at=created)
+    agent = SimpleNamespace(id="root", config={"mcp_servers": [{"id": "server-1"}]})
+    graph = AgentGraph(
+        agents={"root": agent},
+        api_keys={"key-1": api_key},
+        mcp_servers={"server-1": server},
+    )
+    builder = AgentBuilder(None, graph)
+
+    def versions():
+        return builder._referenced_row_versions({"root": ""}, {"key-1"})
+
+    original = versions()
+    api_key.is_active = False
+    revoked = versions()
+    server.updated_at = datetime(2025, 1, 2, tzinfo=UTC)
+    edited = versions()
+
+    assert set(original) == {"api_key:key-1", "mcp_server:server-1"}
+    assert original["api_key:key-1"] != revoked["api_key:key-1"]
+    assert revoked["mcp_server:server-1"] != edited["mcp_server:server-1"]
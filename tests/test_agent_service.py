@@ -0,0 +1,64 @@
+import uuid
+
+from src.models.models import Agent, Client
+from src.services import agent_service
+
+
+def _create_agent(db_session) -> Agent:
+    client = Client(name="Client", email=f"{uuid.uuid4()}@example.com")
+    db_session.add(client)
+    db_session.flush()
+    agent = Agent(
+        client_id=client.id,
+        name="assistant",
+        type="llm",
+        model="gpt-4o",
+        instruction="Help",
+        config={"api_key": "key", "tools": []},
+    )
+    db_session.add(agent)
+    db_session.commit()
+    return agent
+
+
+def _update_row(db_session, agent_id, **values):
+    # Simulates a write made by another worker, which does not touch this cache
+    db_session.query(Agent).filter(Agent.id == agent_id).update(values)
+    db_session.commit()
+    db_session.expunge_all()
+
+
+def test_get_agent_is_served_from_the_row_cache(db_session):
+    agent_id = _create_agent(db_session).id
+    agent_service.invalidate_agent_cache(agent_id)
+
+    assert agent_service.get_agent(db_session, agent_id).name == "assistant"
+    _update_row(db_session, agent_id, name="renamed")
+
+    assert agent_service.get_agent(db_session, agent_id).name == "assistant"
+
+    agent_service.invalidate_agent_cache(agent_id)
+    db_session.expunge_all()
+    assert agent_service.get_agent(db_session, agent_id).name == "renamed"
+    agent_service.invalidate_agent_cache(agent_id)
+
+
+def test_get_agent_for_update_bypasses_a_stale_cached_row(db_session):
+    agent_id = _create_agent(db_session).id
+    agent_service.invalidate_agent_cache(agent_id)
+    agent_service.get_agent(db_session, agent_id)
+    _update_row(db_session, agent_id, config={"api_key": "key", "tools": ["new"]})
+
+    # A cached copy merged into the session first must not hide the new row
+    cached = agent_service.get_agent(db_session, agent_id)
+    assert cached.config["tools"] == []
+    agent = agent_service.get_agent_for_update(db_session, agent_id)
+
+    assert agent is cached
+    assert agent.config["tools"] == ["new"]
+    agent_service.invalidate_agent_cache(agent_id)
+
+
+def test_get_agent_returns_none_for_invalid_or_missing_ids(db_session):
+    assert agent_service.get_agent(db_session, "not-a-uuid") is None
+    assert agent_service.get_agent(db_session, uuid.uuid4()) is None
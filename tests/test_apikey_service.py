@@ -0,0 +1,45 @@
+import uuid
+
+from src.models.models import Client
+from src.services import apikey_service
+
+
+def _create_key(db_session, key_value: str = "sk-first"):
+    client = Client(name="Client", email=f"{uuid.uuid4()}@example.com")
+    db_session.add(client)
+    db_session.flush()
+    return apikey_service.create_api_key(db_session, client.id, "OpenAI", "openai", key_value)
+
+
+def test_decrypted_keys_are_served_from_the_cache(db_session, monkeypatch):
+    key = _create_key(db_session)
+    decrypts = []
+    decrypt = apikey_service.decrypt_api_key
+    monkeypatch.setattr(
+        apikey_service, "decrypt_api_key", lambda value: decrypts.append(1) or decrypt(value)
+    )
+
+    assert apikey_service.get_decrypted_api_key(db_session, key.id) == "sk-first"
+    assert apikey_service.get_decrypted_api_key(db_session, key.id) == "sk-first"
+    assert len(decrypts) == 1
+
+
+def test_updated_and_deleted_keys_are_not_served_from_the_cache(db_session):
+    key = _create_key(db_session)
+    assert apikey_service.get_decrypted_api_key(db_session, key.id) == "sk-first"
+
+    apikey_service.update_api_key(db_session, key.id, key_value="sk-second")
+    assert apikey_service.get_decrypted_api_key(db_session, key.id) == "sk-second"
+
+    apikey_service.delete_api_key(db_session, key.id)
+    assert apikey_service.get_decrypted_api_key(db_session, key.id) is None
+
+
+def test_secrets_are_zeroed_when_they_leave_the_cache(db_session):
+    key = _create_key(db_session)
+    apikey_service.get_decrypted_api_key(db_session, key.id)
+    secret = apikey_service._decrypted_key_cache.get(str(key.id))
+
+    apikey_service.invalidate_decrypted_api_key(key.id)
+
+    assert secret == bytearray(len("sk-first"))
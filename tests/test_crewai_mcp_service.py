@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from src.services.crewai.mcp_service import MCPService
+
+
+@pytest.mark.asyncio
+async def test_custom_server_tools_without_an_adapter_are_kept(monkeypatch):
+    service = MCPService()
+    monkeypatch.setattr(
+        service, "_connect_to_mcp_server", lambda config: (["custom tool"], None)
+    )
+
+    tools, adapters = await service.build_tools(
+        {"custom_mcp_servers": [{"url": "https://mcp.example.com/sse"}]}, db=None
+    )
+
+    assert tools == ["custom tool"]
+    assert adapters == []
+
+
+def test_server_env_is_not_written_to_the_process_environment(monkeypatch):
+    captured = {}
+
+    class Adapter:
+        def __init__(self, params):
+            captured["env"] = params.env
+            self.tools = ["tool"]
+
+    monkeypatch.setattr("src.services.crewai.mcp_service.MCPServerAdapter", Adapter)
+    monkeypatch.delenv("MCP_TEST_TOKEN", raising=False)
+
+    tools, _ = MCPService()._connect_to_mcp_server(
+        {"command": "npx", "args": [], "env": {"MCP_TEST_TOKEN": "secret"}}
+    )
+
+    assert tools == ["tool"]
+    assert captured["env"] == {"MCP_TEST_TOKEN": "secret"}
+    assert "MCP_TEST_TOKEN" not in os.environ
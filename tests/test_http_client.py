@@ -0,0 +1,35 @@
+import httpx
+import pytest
+
+from src.config.settings import settings
+from src.utils.http_client import close_http_client, get_http_client, host_slot
+
+
+@pytest.mark.asyncio
+async def test_client_is_shared_until_closed():
+    client = get_http_client()
+    assert get_http_client() is client
+
+    await close_http_client()
+
+    assert client.is_closed
+    replacement = get_http_client()
+    assert replacement is not client
+    await close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_requests_per_host_are_limited(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_CLIENT_MAX_PER_HOST", 1)
+    url = "https://api.example.com/items"
+
+    async with host_slot(url):
+        with pytest.raises(httpx.PoolTimeout):
+            async with host_slot(url, timeout=0.01):
+                pass
+        # Other hosts are not affected
+        async with host_slot("https://other.example.com", timeout=0.01):
+            pass
+
+    async with host_slot(url, timeout=0.01):
+        pass
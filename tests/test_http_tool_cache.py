@@ -0,0 +1,39 @@
+import pytest
+from redis.exceptions import ConnectionError
+
+from src.schemas.agent_config import HTTPToolCache
+from src.services.adk.http_tool_cache import HttpToolResponseCache
+
+POLICY = HTTPToolCache(enabled=True, ttl=60)
+
+
+@pytest.mark.asyncio
+async def test_responses_are_shared_through_redis(fake_redis):
+    key = HttpToolResponseCache.make_key("weather", "get", "https://api.example.com", {}, None)
+
+    assert await HttpToolResponseCache().set(key, '{"temp": 20}', POLICY)
+
+    other_worker = HttpToolResponseCache()
+    assert await other_worker.get("weather", key) == '{"temp": 20}'
+    assert await fake_redis.ttl(key) > 0
+
+
+@pytest.mark.asyncio
+async def test_failing_redis_calls_fall_back_to_the_local_cache(fake_redis, monkeypatch):
+    cache = HttpToolResponseCache(redis_retry_interval=60)
+    calls = []
+
+    async def fail(*args, **kwargs):
+        calls.append(args)
+        raise ConnectionError("connection reset")
+
+    monkeypatch.setattr(fake_redis, "get", fail)
+    monkeypatch.setattr(fake_redis, "setex", fail)
+
+    assert await cache.get("weather", "key") is None
+    assert await cache.set("key", "cached", POLICY)
+    assert await cache.get("weather", "key") == "cached"
+
+    # Redis is not called again until the retry interval has passed
+    assert len(calls) == 1
+    assert cache.stats()["local_entries"] == 1
@@ -0,0 +1,89 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from src.services.adk.mcp_pool import MCPConnectionPool, MCPPoolError
+
+
+class FakeServer:
+    """Opens sessions inside the pool's exit stack, recording opens and closes."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.opened = 0
+        self.closed = 0
+
+    @asynccontextmanager
+    async def _session(self):
+        self.opened += 1
+        try:
+            yield object()
+        finally:
+            self.closed += 1
+
+    async def open(self, exit_stack):
+        if self.fail:
+            raise ConnectionError("refused")
+        session = await exit_stack.enter_async_context(self._session())
+        return session, ["tool"]
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused_until_the_lease_limit():
+    pool = MCPConnectionPool(max_sessions_per_server=2, max_leases_per_session=2)
+    server = FakeServer()
+    try:
+        first = await pool.acquire("server", server.open)
+        second = await pool.acquire("server", server.open)
+        third = await pool.acquire("server", server.open)
+
+        assert first is second
+        assert third is not first
+        assert server.opened == 2
+        assert first.tools == ["tool"]
+
+        # With every session at the limit, the least loaded one is shared
+        fourth = await pool.acquire("server", server.open)
+        assert fourth is third
+        assert pool.stats()["server"]["leases"] == 4
+    finally:
+        await pool.close()
+
+    assert server.closed == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_connections_back_off():
+    pool = MCPConnectionPool(backoff_base=60)
+    server = FakeServer(fail=True)
+    try:
+        with pytest.raises(MCPPoolError):
+            await pool.acquire("server", server.open)
+
+        server.fail = False
+        with pytest.raises(MCPPoolError, match="backoff"):
+            await pool.acquire("server", server.open)
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_and_discarded_connections_are_closed():
+    pool = MCPConnectionPool(idle_timeout=0)
+    server = FakeServer()
+    try:
+        async with pool.lease("server", server.open):
+            pass
+        await asyncio.sleep(0.01)
+        await pool._run_maintenance()
+        assert server.closed == 1
+
+        connection = await pool.acquire("server", server.open)
+        pool.discard(connection)
+        pool.release(connection)
+        assert (await pool.acquire("server", server.open)) is not connection
+    finally:
+        await pool.close()
+
+    assert server.closed == server.opened == 3
@@ -0,0 +1,129 @@
+import asyncio
+from contextlib import AsyncExitStack
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from mcp.shared.exceptions import McpError
+from mcp.types import METHOD_NOT_FOUND, CallToolResult, ErrorData, TextContent
+from mcp.types import Tool as McpBaseTool
+
+from src.config.settings import settings
+from src.services.adk.mcp_pool import mcp_connection_pool, server_config_key
+from src.services.adk.mcp_service import MCPService
+
+SERVER_CONFIG = {"url": "https://mcp.example.com/sse"}
+
+
+class FakeSession:
+    """MCP session serving ``tools``, reporting the first calls as unknown tools."""
+
+    def __init__(self, tools: list[str], unknown_calls: int = 0, failing: bool = False):
+        self.tools = tools
+        self.unknown_calls = unknown_calls
+        self.failing = failing
+        self.list_calls = 0
+        self.tool_calls = 0
+
+    async def list_tools(self, cursor=None):
+        self.list_calls += 1
+        tools = [McpBaseTool(name=name, inputSchema={"type": "object"}) for name in self.tools]
+        return SimpleNamespace(tools=tools, nextCursor=None)
+
+    async def call_tool(self, name, arguments=None):
+        if self.unknown_calls or name not in self.tools:
+            self.unknown_calls = max(self.unknown_calls - 1, 0)
+            raise McpError(ErrorData(code=METHOD_NOT_FOUND, message=f"Unknown tool: {name}"))
+        self.tool_calls += 1
+        if self.failing:
+            return CallToolResult(
+                isError=True, content=[TextContent(type="text", text="Tool not found: no rows")]
+            )
+        return CallToolResult(content=[TextContent(type="text", text=f"{name} ok")])
+
+
+@pytest_asyncio.fixture
+async def catalog_tool(monkeypatch):
+    """Returns a factory of the catalog tool "search", served by the given session."""
+    monkeypatch.setattr(settings, "MCP_POOL_ENABLED", True)
+    monkeypatch.setattr(settings, "MCP_TOOLS_FROM_CATALOG", True)
+
+    def build(session: FakeSession):
+        async def open_session(self, server_config, connection_params, exit_stack):
+            return session
+
+        monkeypatch.setattr(MCPService, "_open_session", open_session)
+        mcp_server = SimpleNamespace(
+            name="server",
+            tools=[{"name": "search", "description": "", "inputSchema": {"type": "object"}}],
+            tools_hash=server_config_key(SERVER_CONFIG),
+            config_json=SERVER_CONFIG,
+        )
+        (tool,) = MCPService()._catalog_tools(mcp_server, dict(SERVER_CONFIG))
+        return tool
+
+    yield build
+    await mcp_connection_pool.close()
+
+
+async def _call(tool) -> CallToolResult:
+    return await tool.run_async(args={}, tool_context=None)
+
+
+@pytest.mark.asyncio
+async def test_catalog_tools_do_not_list_the_server_tools(catalog_tool):
+    session = FakeSession(["search"])
+    tool = catalog_tool(session)
+
+    assert (await _call(tool)).content[0].text == "search ok"
+    assert (await _call(tool)).content[0].text == "search ok"
+    assert session.list_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool_is_listed_again_and_retried(catalog_tool):
+    session = FakeSession(["search"], unknown_calls=1)
+    tool = catalog_tool(session)
+
+    assert (await _call(tool)).content[0].text == "search ok"
+    assert session.list_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_tool_missing_from_the_server_raises_the_error(catalog_tool):
+    session = FakeSession(["find"])
+    tool = catalog_tool(session)
+
+    with pytest.raises(McpError):
+        await _call(tool)
+    assert session.list_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_tool_errors_are_not_retried(catalog_tool):
+    session = FakeSession(["search"], failing=True)
+    tool = catalog_tool(session)
+
+    assert (await _call(tool)).isError
+    assert session.tool_calls == 1
+    assert session.list_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_unpooled_servers_missing_their_deadline_are_skipped(monkeypatch):
+    monkeypatch.setattr(settings, "MCP_SERVER_CONNECT_DEADLINE", 0.05)
+    service = MCPService()
+
+    async def connect_job(job):
+        if job["label"] == "slow":
+            await asyncio.sleep(5)
+        return [job["label"]], AsyncExitStack()
+
+    monkeypatch.setattr(service, "_connect_job", connect_job)
+
+    results = await asyncio.wait_for(
+        service._connect_sequentially([{"label": "slow"}, {"label": "fast"}]), timeout=2
+    )
+
+    assert results[0] is None
+    assert results[1][0] == ["fast"]
@@ -0,0 +1,107 @@
+import base64
+
+import pytest
+from google.adk.events import Event
+from google.adk.sessions import DatabaseSessionService
+from google.genai.types import Blob, Content, Part
+from sqlalchemy.orm import Session
+
+from src.api import session_routes
+from src.services.session_service import get_session_event, list_session_events
+
+SESSION_ID = "user_app"
+
+
+@pytest.fixture
+def stored_events(tmp_path):
+    """Stores five events, the last two with the same timestamp, and opens a db session."""
+    session_service = DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'sessions.db'}")
+    session = session_service.create_session(
+        app_name="app", user_id="user", session_id=SESSION_ID
+    )
+    for event_id, timestamp in (("e1", 1), ("e2", 2), ("e3", 3), ("e5", 4), ("e4", 4)):
+        session_service.append_event(
+            session,
+            Event(
+                id=event_id,
+                invocation_id="run",
+                author="user",
+                timestamp=1_700_000_000 + timestamp,
+                content=Content(role="user", parts=[Part(text=event_id)]),
+            ),
+        )
+
+    with Session(session_service.db_engine) as db:
+        yield session_service, session, db
+
+
+def _ids(events):
+    return [event["id"] for event in events]
+
+
+def test_events_are_read_in_timestamp_and_id_order(stored_events):
+    _, _, db = stored_events
+
+    assert _ids(list_session_events(db, SESSION_ID)) == ["e1", "e2", "e3", "e4", "e5"]
+
+
+def test_limit_returns_the_newest_events_oldest_first(stored_events):
+    _, _, db = stored_events
+
+    assert _ids(list_session_events(db, SESSION_ID, limit=2)) == ["e4", "e5"]
+
+
+def test_before_and_after_page_from_a_cursor(stored_events):
+    _, _, db = stored_events
+    events = list_session_events(db, SESSION_ID)
+    cursor = (events[3]["timestamp"], events[3]["id"])
+
+    assert _ids(list_session_events(db, SESSION_ID, before=cursor, limit=2)) == ["e2", "e3"]
+    assert _ids(list_session_events(db, SESSION_ID, after=cursor)) == ["e5"]
+    assert _ids(list_session_events(db, SESSION_ID, after=cursor, limit=1)) == ["e5"]
+
+
+def test_large_inline_data_and_file_parts_are_sent_by_url(stored_events, monkeypatch):
+    session_service, session, db = stored_events
+    monkeypatch.setattr(session_routes, "INLINE_DATA_MAX_SIZE", 8)
+    parts = [
+        Part(inline_data=Blob(mime_type="image/png", data=b"small")),
+        Part(inline_data=Blob(mime_type="image/png", data=b"a larger image")),
+    ]
+    session_service.append_event(
+        session,
+        Event(id="files", invocation_id="run", author="user", content=Content(parts=parts)),
+    )
+
+    event = get_session_event(db, SESSION_ID, "files")
+    event["content"]["parts"].append({"fileData": {"fileId": "report.pdf"}})
+    small, large, file = session_routes._event_to_message(SESSION_ID, event)["content"]["parts"]
+
+    assert base64.b64decode(small["inline_data"]["data"]) == b"small"
+    assert large["inline_data"]["data"] is None
+    assert large["inline_data"]["url"].endswith(f"/sessions/{SESSION_ID}/events/files/parts/1")
+    assert file["fileData"]["url"].endswith(f"/sessions/{SESSION_ID}/artifacts/report.pdf")
+
+
+@pytest.mark.asyncio
+async def test_parts_sent_by_url_are_downloaded(stored_events, monkeypatch):
+    session_service, session, db = stored_events
+    data = bytes(range(256))
+    session_service.append_event(
+        session,
+        Event(
+            id="file",
+            invocation_id="run",
+            author="user",
+            content=Content(parts=[Part(inline_data=Blob(mime_type="image/png", data=data))]),
+        ),
+    )
+
+    async def authorized_session(session_id, db, payload):
+        return {}
+
+    monkeypatch.setattr(session_routes, "_get_authorized_session", authorized_session)
+    response = await session_routes.download_event_part(SESSION_ID, "file", 0, db, {})
+
+    assert b"".join([chunk async for chunk in response.body_iterator]) == data
+    assert response.media_type == "image/png"
@@ -0,0 +1,80 @@
+import uuid
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai.types import Content, Part
+
+from src.schemas.agent_config import AgentTask
+from src.services.adk.agent_builder import AgentBuilder
+from src.services.adk.custom_agents.task_agent import TaskAgent
+
+
+class RecordingAgent(BaseAgent):
+    """Records the session state and the events of its branch it runs with, by branch."""
+
+    # Typed loosely so pydantic keeps the test's dict instead of copying it
+    seen: Any
+
+    async def _run_async_impl(self, ctx):
+        texts = [
+            event.content.parts[0].text
+            for event in ctx.session.events
+            if event.branch and ctx.branch.startswith(event.branch) and event.content
+        ]
+        self.seen[ctx.branch] = SimpleNamespace(state=dict(ctx.session.state), texts=texts)
+        yield Event(
+            author=self.name, branch=ctx.branch, content=Content(parts=[Part(text="done")])
+        )
+
+
+@pytest.fixture
+def recorded_states(monkeypatch):
+    seen = {}
+
+    async def build_agent(self, agent, enabled_tools=None):
+        return RecordingAgent(name=agent.name, seen=seen), None
+
+    monkeypatch.setattr(AgentBuilder, "build_agent", build_agent)
+    monkeypatch.setattr(
+        TaskAgent, "_get_task_agent", lambda self, agent_id: SimpleNamespace(name="worker")
+    )
+    return seen
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tasks_get_their_own_instructions(recorded_states, db_session):
+    tasks = [
+        AgentTask(
+            id=name,
+            agent_id=uuid.uuid4(),
+            description=f"Describe {name}",
+            expected_output="text",
+            depends_on=depends_on,
+        )
+        for name, depends_on in (("a", []), ("b", []), ("c", ["a"]))
+    ]
+    agent = TaskAgent(name="tasks", tasks=tasks, db=db_session)
+
+    session_service = InMemorySessionService()
+    session = session_service.create_session(app_name="app", user_id="user")
+    runner = Runner(app_name="app", agent=agent, session_service=session_service)
+    async for _ in runner.run_async(
+        user_id="user",
+        session_id=session.id,
+        new_message=Content(role="user", parts=[Part(text="hi")]),
+    ):
+        pass
+
+    for index, name in enumerate(("a", "b", "c")):
+        seen = recorded_states[f"tasks.task_{index}.worker"]
+        (instructions,) = seen.texts
+        assert f"Describe {name}" in instructions
+        assert not any(key.startswith("task_instructions") for key in seen.state)
+
+    (instructions,) = recorded_states["tasks.task_2.worker"].texts
+    assert "<previous_results>" in instructions
@@ -0,0 +1,37 @@
+import time
+
+from src.utils.ttl_cache import TTLCache
+
+
+def test_get_returns_stored_value_until_it_expires(monkeypatch):
+    cache = TTLCache(max_entries=10, ttl=5)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+    assert cache.get("a") is None
+    assert cache.stats() == {"entries": 0, "hits": 1, "misses": 1}
+
+
+def test_least_recently_used_entry_is_evicted():
+    evicted = []
+    cache = TTLCache(max_entries=2, ttl=60, on_evict=evicted.append)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert evicted == [2]
+
+
+def test_zero_ttl_disables_the_cache():
+    cache = TTLCache(ttl=0)
+    cache.set("a", 1)
+
+    assert not cache.enabled
+    assert cache.get("a") is None
@@ -0,0 +1,57 @@
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.services.adk import workflow_checkpointer
+
+
+class FakeSaver:
+    """Checkpointer whose stale threads query returns ``stale``."""
+
+    def __init__(self, stale: list[str]):
+        self.stale = stale
+        self.queries = []
+        self.deleted = []
+        self.conn = self
+
+    @asynccontextmanager
+    async def connection(self):
+        yield self
+
+    async def execute(self, query, params):
+        self.queries.append(params)
+        return self
+
+    async def fetchall(self):
+        return [{"thread_id": thread_id} for thread_id in self.stale]
+
+    async def adelete_thread(self, thread_id):
+        self.deleted.append(thread_id)
+
+
+@pytest.mark.asyncio
+async def test_threads_older_than_the_ttl_are_deleted(monkeypatch):
+    saver = FakeSaver(["agent:session:failed-run"])
+
+    async def get_checkpointer():
+        return saver
+
+    monkeypatch.setattr(workflow_checkpointer, "get_workflow_checkpointer", get_checkpointer)
+
+    assert await workflow_checkpointer.delete_stale_checkpoints(3600) == 1
+
+    assert saver.deleted == ["agent:session:failed-run"]
+    ((cutoff,),) = saver.queries
+    expected = datetime.now(UTC) - timedelta(seconds=3600)
+    assert abs(datetime.fromisoformat(cutoff) - expected) < timedelta(seconds=5)
+
+
+@pytest.mark.asyncio
+async def test_nothing_is_deleted_without_checkpoints(monkeypatch):
+    async def get_checkpointer():
+        return None
+
+    monkeypatch.setattr(workflow_checkpointer, "get_workflow_checkpointer", get_checkpointer)
+
+    assert await workflow_checkpointer.delete_stale_checkpoints(3600) == 0
@@ -0,0 +1,242 @@
+import asyncio
+import time
+
+import pytest
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai.types import Content, Part
+
+from src.config.settings import settings
+from src.services.adk.agent_runner import run_workflow_events
+from src.services.adk.custom_agents.workflow_agent import WorkflowAgent, WorkflowResumeError
+from src.services.adk.workflow_scheduler import (
+    QUEUE_KEY,
+    RECORD_KEY,
+    WorkflowDelayScheduler,
+)
+
+
+def _delay_flow(message: str) -> dict:
+    return {
+        "nodes": [
+            {"id": "start", "type": "start-node", "data": {}},
+            {"id": "wait", "type": "delay-node", "data": {"delay": {"value": 0.01}}},
+            {"id": "done", "type": "message-node", "data": {"message": message}},
+        ],
+        "edges": [
+            {"source": "start", "target": "wait"},
+            {"source": "wait", "target": "done"},
+        ],
+    }
+
+
+async def _run(agent: WorkflowAgent, app_name: str) -> list[str]:
+    session_service = InMemorySessionService()
+    session = session_service.create_session(app_name=app_name, user_id="user")
+    runner = Runner(app_name=app_name, agent=agent, session_service=session_service)
+    texts = []
+    async for event in runner.run_async(
+        user_id="user",
+        session_id=session.id,
+        new_message=Content(role="user", parts=[Part(text="hi")]),
+    ):
+        if event.content and event.content.parts and event.content.parts[0].text:
+            texts.append(event.content.parts[0].text)
+    return texts
+
+
+@pytest.fixture
+def durable_delays(monkeypatch, fake_redis):
+    monkeypatch.setattr(settings, "WORKFLOW_DURABLE_DELAY_MIN_SECONDS", 0)
+    monkeypatch.setattr(settings, "WORKFLOW_CHECKPOINT_ENABLED", False)
+    return fake_redis
+
+
+@pytest.mark.asyncio
+async def test_root_workflow_delay_is_scheduled(durable_delays, db_session):
+    agent = WorkflowAgent(
+        name="root", flow_json=_delay_flow("done"), db=db_session, agent_id="root-id"
+    )
+
+    texts = await _run(agent, "root-id")
+
+    assert "done" not in texts
+    assert await durable_delays.zcard(QUEUE_KEY) == 1
+
+
+@pytest.mark.asyncio
+async def test_nested_workflow_delay_waits_in_process(durable_delays, db_session):
+    child = WorkflowAgent(
+        name="child", flow_json=_delay_flow("child done"), db=db_session, agent_id="child-id"
+    )
+    parent = WorkflowAgent(
+        name="parent",
+        flow_json={"nodes": [{"id": "start", "type": "start-node", "data": {}}], "edges": []},
+        db=db_session,
+        agent_id="parent-id",
+        sub_agents=[child],
+    )
+
+    texts = await _run(parent, "parent-id")
+
+    assert "child done" in texts
+    assert await durable_delays.zcard(QUEUE_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_resume_is_retried(fake_redis, monkeypatch):
+    scheduler = WorkflowDelayScheduler(poll_interval=0.01, max_attempts=2)
+    calls = []
+
+    async def resume(record):
+        calls.append(record["node_id"])
+        if len(calls) == 1:
+            raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(scheduler, "_resume", resume)
+    assert await scheduler.schedule({"agent_id": "a", "node_id": "wait"}, time.time() - 1)
+
+    for _ in range(2):
+        await scheduler._poll()
+        await asyncio.gather(*scheduler._running)
+        await asyncio.sleep(0.02)
+
+    assert calls == ["wait", "wait"]
+    assert await fake_redis.zcard(QUEUE_KEY) == 0
+    assert await fake_redis.keys(RECORD_KEY.format("*")) == []
+
+
+@pytest.mark.asyncio
+async def test_delayed_run_does_not_keep_its_checkpoints(durable_delays, db_session, monkeypatch):
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from src.services.adk.custom_agents import workflow_agent
+
+    saver = MemorySaver()
+
+    async def get_checkpointer():
+        return saver
+
+    monkeypatch.setattr(workflow_agent, "get_workflow_checkpointer", get_checkpointer)
+    agent = WorkflowAgent(
+        name="root", flow_json=_delay_flow("done"), db=db_session, agent_id="root-id"
+    )
+
+    await _run(agent, "root-id")
+
+    assert await durable_delays.zcard(QUEUE_KEY) == 1
+    assert not saver.storage
+
+
+def _failing_once(monkeypatch, node_id: str) -> list[str]:
+    """Makes the message node ``node_id`` fail the first time, returns the nodes run."""
+    create_node_functions = WorkflowAgent._create_node_functions
+    runs = []
+
+    def create_failing_node_functions(self, node_agents):
+        functions = create_node_functions(self, node_agents)
+        message_node = functions["message-node"]
+
+        async def failing_message_node(state, current_id, node_data, ctx):
+            runs.append(current_id)
+            if current_id == node_id and runs.count(node_id) == 1:
+                raise RuntimeError("model unavailable")
+            async for update in message_node(state, current_id, node_data, ctx):
+                yield update
+
+        return {**functions, "message-node": failing_message_node}
+
+    monkeypatch.setattr(WorkflowAgent, "_create_node_functions", create_failing_node_functions)
+    return runs
+
+
+def _two_messages_flow() -> dict:
+    flow = _delay_flow("first")
+    flow["nodes"].append({"id": "second", "type": "message-node", "data": {"message": "second"}})
+    flow["edges"].append({"source": "done", "target": "second"})
+    return flow
+
+
+async def _resume_attempts(agent: WorkflowAgent, attempts: int) -> tuple[list[str], Exception]:
+    """Resumes the run from its delay node like the scheduler, returns the session texts."""
+    session_service = InMemorySessionService()
+    session = session_service.create_session(app_name="root-id", user_id="user")
+    state = {"content": [], "node_outputs": {}, "cycle_count": 0, "session_id": session.id}
+    error = None
+    for _ in range(attempts):
+        try:
+            await run_workflow_events(
+                agent,
+                session,
+                session_service,
+                None,
+                None,
+                lambda ctx: agent.resume(ctx, "wait", state, resume_id="record-1"),
+            )
+        except Exception as e:
+            error = e
+    texts = [event.content.parts[0].text for event in session.events if event.content]
+    return texts, error
+
+
+@pytest.mark.asyncio
+async def test_retried_resume_skips_completed_nodes(durable_delays, db_session, monkeypatch):
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from src.services.adk.custom_agents import workflow_agent
+
+    saver = MemorySaver()
+
+    async def get_checkpointer():
+        return saver
+
+    monkeypatch.setattr(workflow_agent, "get_workflow_checkpointer", get_checkpointer)
+    runs = _failing_once(monkeypatch, "second")
+    agent = WorkflowAgent(
+        name="root", flow_json=_two_messages_flow(), db=db_session, agent_id="root-id"
+    )
+
+    texts, _ = await _resume_attempts(agent, attempts=2)
+
+    assert texts == ["first", "second"]
+    assert runs == ["done", "second", "second"]
+    assert not saver.storage
+
+
+@pytest.mark.asyncio
+async def test_resume_without_checkpoints_is_not_retried_after_events(
+    durable_delays, db_session, monkeypatch
+):
+    _failing_once(monkeypatch, "second")
+    agent = WorkflowAgent(
+        name="root", flow_json=_two_messages_flow(), db=db_session, agent_id="root-id"
+    )
+
+    texts, error = await _resume_attempts(agent, attempts=1)
+
+    assert texts == ["first"]
+    assert isinstance(error, WorkflowResumeError)
+
+
+@pytest.mark.asyncio
+async def test_conversation_history_is_not_checkpointed(durable_delays, db_session, monkeypatch):
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from src.services.adk.custom_agents import workflow_agent
+
+    saver = MemorySaver()
+
+    async def get_checkpointer():
+        return saver
+
+    monkeypatch.setattr(workflow_agent, "get_workflow_checkpointer", get_checkpointer)
+    _failing_once(monkeypatch, "second")
+    agent = WorkflowAgent(
+        name="root", flow_json=_two_messages_flow(), db=db_session, agent_id="root-id"
+    )
+
+    await _resume_attempts(agent, attempts=1)
+
+    values = [checkpoint.checkpoint["channel_values"] for checkpoint in saver.list(None)]
+    assert any("session_id" in channels for channels in values)
+    assert not any("conversation_history" in repr(channels) for channels in values)
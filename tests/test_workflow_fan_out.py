@@ -0,0 +1,99 @@
+import pytest
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai.types import Content, Part
+
+from src.config.settings import settings
+from src.services.adk.custom_agents.workflow_agent import WorkflowAgent
+
+
+def _message(node_id: str) -> dict:
+    return {"id": node_id, "type": "message-node", "data": {"message": node_id}}
+
+
+async def _run(flow: dict, db_session) -> list[str]:
+    agent = WorkflowAgent(name="flow", flow_json=flow, db=db_session, agent_id="flow-id")
+    session_service = InMemorySessionService()
+    session = session_service.create_session(app_name="flow-id", user_id="user")
+    runner = Runner(app_name="flow-id", agent=agent, session_service=session_service)
+    texts = []
+    async for event in runner.run_async(
+        user_id="user",
+        session_id=session.id,
+        new_message=Content(role="user", parts=[Part(text="hi")]),
+    ):
+        if event.content and event.content.parts and event.content.parts[0].text:
+            texts.append(event.content.parts[0].text)
+    return texts
+
+
+@pytest.fixture(autouse=True)
+def no_checkpoints(monkeypatch):
+    monkeypatch.setattr(settings, "WORKFLOW_CHECKPOINT_ENABLED", False)
+
+
+@pytest.mark.asyncio
+async def test_join_waits_for_every_incoming_branch(db_session):
+    # The second branch takes one more step than the first to reach the join
+    flow = {
+        "nodes": [
+            {"id": "start", "type": "start-node", "data": {}},
+            _message("short"),
+            _message("long-1"),
+            _message("long-2"),
+            {"id": "join", "type": "join-node", "data": {}},
+            _message("done"),
+        ],
+        "edges": [
+            {"source": "start", "target": "short"},
+            {"source": "start", "target": "long-1"},
+            {"source": "long-1", "target": "long-2"},
+            {"source": "short", "target": "join"},
+            {"source": "long-2", "target": "join"},
+            {"source": "join", "target": "done"},
+        ],
+    }
+
+    texts = await _run(flow, db_session)
+
+    assert texts.count("done") == 1
+    assert texts[-1] == "done"
+    assert {"short", "long-1", "long-2"} <= set(texts)
+
+
+@pytest.mark.asyncio
+async def test_condition_with_several_targets_fans_out_to_all(db_session):
+    flow = {
+        "nodes": [
+            {"id": "start", "type": "start-node", "data": {}},
+            _message("go"),
+            {
+                "id": "check",
+                "type": "condition-node",
+                "data": {
+                    "conditions": [
+                        {
+                            "id": "says-go",
+                            "type": "previous-output",
+                            "data": {"field": "content", "operator": "contains", "value": "go"},
+                        }
+                    ]
+                },
+            },
+            _message("first"),
+            _message("second"),
+            _message("otherwise"),
+        ],
+        "edges": [
+            {"source": "start", "target": "go"},
+            {"source": "go", "target": "check"},
+            {"source": "check", "target": "first", "sourceHandle": "says-go"},
+            {"source": "check", "target": "second", "sourceHandle": "says-go"},
+            {"source": "check", "target": "otherwise", "sourceHandle": "bottom-handle"},
+        ],
+    }
+
+    texts = await _run(flow, db_session)
+
+    assert "first" in texts and "second" in texts
+    assert "otherwise" not in texts
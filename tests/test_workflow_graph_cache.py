@@ -0,0 +1,73 @@
+import pytest
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai.types import Content, Part
+
+from src.config.settings import settings
+from src.services.adk.custom_agents import workflow_agent
+from src.services.adk.custom_agents.workflow_agent import WorkflowAgent, flow_hash
+
+
+def _message_flow(message: str) -> dict:
+    return {
+        "nodes": [
+            {"id": "start", "type": "start-node", "data": {}},
+            {"id": "reply", "type": "message-node", "data": {"message": message}},
+        ],
+        "edges": [{"source": "start", "target": "reply"}],
+    }
+
+
+async def _run(agent: WorkflowAgent) -> list[str]:
+    session_service = InMemorySessionService()
+    session = session_service.create_session(app_name=agent.agent_id, user_id="user")
+    runner = Runner(app_name=agent.agent_id, agent=agent, session_service=session_service)
+    texts = []
+    async for event in runner.run_async(
+        user_id="user",
+        session_id=session.id,
+        new_message=Content(role="user", parts=[Part(text="hi")]),
+    ):
+        if event.content and event.content.parts and event.content.parts[0].text:
+            texts.append(event.content.parts[0].text)
+    return texts
+
+
+@pytest.fixture
+def compiled_graphs(monkeypatch):
+    monkeypatch.setattr(settings, "WORKFLOW_CHECKPOINT_ENABLED", False)
+    workflow_agent._compiled_graphs.clear()
+    yield workflow_agent._compiled_graphs
+    workflow_agent._compiled_graphs.clear()
+
+
+@pytest.mark.asyncio
+async def test_agents_with_the_same_flow_share_the_compiled_graph(compiled_graphs, db_session):
+    flow = _message_flow("hello")
+    first = WorkflowAgent(name="first", flow_json=flow, db=db_session, agent_id="first-id")
+    second = WorkflowAgent(name="second", flow_json=flow, db=db_session, agent_id="second-id")
+
+    assert "hello" in await _run(first)
+    graph = compiled_graphs.get(flow_hash(flow))
+    assert graph is not None
+
+    # The cached graph runs with the state of the agent running it
+    assert "hello" in await _run(second)
+    assert compiled_graphs.get(flow_hash(flow)) is graph
+    assert compiled_graphs.stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_edited_flows_are_compiled_again(compiled_graphs, db_session):
+    agent = WorkflowAgent(
+        name="agent", flow_json=_message_flow("before"), db=db_session, agent_id="agent-id"
+    )
+    assert "before" in await _run(agent)
+
+    edited = WorkflowAgent(
+        name="agent", flow_json=_message_flow("after"), db=db_session, agent_id="agent-id"
+    )
+    texts = await _run(edited)
+
+    assert "after" in texts and "before" not in texts
+    assert compiled_graphs.stats()["entries"] == 2